@@ -0,0 +1,104 @@
+"""Time one coordinator update fanned out to the per-slot price sensors.
+
+Every slot sensor evaluates its value once, as it does when the coordinator
+notifies its listeners. Each round starts from a freshly built series, so
+the series column includes building the shared day slot arrays. The legacy
+column reproduces the previous per-entity scan that parsed ``dtime`` of
+each record until it found its own slot.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slot_fanout
+"""
+from __future__ import annotations
+
+import timeit
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from custom_components.rce_prices.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.sensors import (
+    RCETodayHourPriceSensor,
+    RCETodayQuarterPriceSensor,
+    RCETomorrowHourPriceSensor,
+    RCETomorrowQuarterPriceSensor,
+)
+
+from .bench_window_engine import make_records
+
+NOW = datetime(2024, 1, 15, 12, 0)
+
+
+def legacy_slot_price(day_data, hour, minute=None):
+    if not day_data:
+        return None
+    prices = []
+    for record in day_data:
+        try:
+            period_start = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S") - timedelta(minutes=15)
+            if period_start.hour == hour and (minute is None or period_start.minute == minute):
+                if minute is not None:
+                    return round(float(record["rce_pln"]), 2)
+                prices.append(float(record["rce_pln"]))
+        except (ValueError, KeyError):
+            continue
+    if not prices:
+        return None
+    return round(sum(prices) / len(prices), 2)
+
+
+def make_sensors(coordinator, quarter: bool) -> list:
+    if quarter:
+        return [
+            sensor_class(coordinator, hour, minute)
+            for sensor_class in (RCETodayQuarterPriceSensor, RCETomorrowQuarterPriceSensor)
+            for hour in range(24)
+            for minute in (0, 15, 30, 45)
+        ]
+    return [
+        sensor_class(coordinator, hour)
+        for sensor_class in (RCETodayHourPriceSensor, RCETomorrowHourPriceSensor)
+        for hour in range(24)
+    ]
+
+
+def fan_out(sensors: list) -> list:
+    return [sensor.native_value for sensor in sensors]
+
+
+def legacy_fan_out(sensors: list) -> list:
+    values = []
+    for sensor in sensors:
+        day_data = sensor.get_tomorrow_data() if "Tomorrow" in type(sensor).__name__ else sensor.get_today_data()
+        values.append(legacy_slot_price(day_data, sensor._hour, getattr(sensor, "_minute", None)))
+    return values
+
+
+def main() -> None:
+    coordinator = Mock(spec=RCEPSEDataUpdateCoordinator)
+    records = make_records(2)
+
+    print(f"{'mode':>8} {'sensors':>8} {'legacy ms':>10} {'series ms':>10}")
+    with patch("homeassistant.util.dt.now", return_value=NOW):
+        for mode, quarter in (("hourly", False), ("quarter", True)):
+            sensors = make_sensors(coordinator, quarter)
+
+            def new_data():
+                coordinator.data = {"raw_data": records, "series": PriceSeries.from_records(records)}
+
+            new_data()
+            assert fan_out(sensors) == legacy_fan_out(sensors)
+
+            number = 20
+            legacy_ms = min(
+                timeit.repeat(lambda: legacy_fan_out(sensors), setup=new_data, number=1, repeat=number)
+            ) * 1000
+            series_ms = min(
+                timeit.repeat(lambda: fan_out(sensors), setup=new_data, number=1, repeat=number)
+            ) * 1000
+            print(f"{mode:>8} {len(sensors):>8} {legacy_ms:>10.3f} {series_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
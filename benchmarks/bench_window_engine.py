@@ -0,0 +1,166 @@
+"""Compare the prefix-sum window engine with the previous slicing implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_window_engine
+"""
+from __future__ import annotations
+
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from custom_components.rce_prices.const import WINDOW_OVERLAP_NON_OVERLAPPING
+from custom_components.rce_prices.price_calculator import PriceCalculator
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.window_engine import WindowEngine
+
+
+def legacy_find_optimal_window(data, window_start_hour, window_end_hour, duration_hours, is_max=False):
+    if not data or duration_hours <= 0:
+        return []
+    duration_periods = int(duration_hours) * 4
+    filtered_data = []
+    for record in data:
+        try:
+            start_time = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S") - timedelta(minutes=15)
+            if window_start_hour <= start_time.hour < window_end_hour:
+                filtered_data.append(record)
+        except (ValueError, KeyError):
+            continue
+    if len(filtered_data) < duration_periods:
+        return []
+    filtered_data.sort(key=lambda x: x["dtime"])
+    best_window = []
+    best_avg_price = None
+    for i in range(len(filtered_data) - duration_periods + 1):
+        window = filtered_data[i:i + duration_periods]
+        is_continuous = True
+        for j in range(len(window) - 1):
+            curr_time = datetime.strptime(window[j]["dtime"], "%Y-%m-%d %H:%M:%S")
+            next_time = datetime.strptime(window[j + 1]["dtime"], "%Y-%m-%d %H:%M:%S")
+            if next_time != curr_time + timedelta(minutes=15):
+                is_continuous = False
+                break
+        if not is_continuous:
+            continue
+        window_prices = [float(record["rce_pln"]) for record in window]
+        avg_price = sum(window_prices) / len(window_prices)
+        if best_avg_price is None or (is_max and avg_price > best_avg_price) or (
+            not is_max and avg_price < best_avg_price
+        ):
+            best_window = window
+            best_avg_price = avg_price
+    return best_window
+
+
+def legacy_find_top_windows(data, window_start_hour, window_end_hour, duration_hours, top_n=2,
+                            is_max=True, distinct_start_hour=True):
+    if not data or duration_hours <= 0 or top_n <= 0:
+        return []
+    duration_periods = int(duration_hours) * 4
+    filtered_data = []
+    for record in data:
+        start_time = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S") - timedelta(minutes=15)
+        if window_start_hour <= start_time.hour < window_end_hour:
+            filtered_data.append(record)
+    if len(filtered_data) < duration_periods:
+        return []
+    filtered_data.sort(key=lambda x: x["dtime"])
+    candidates = []
+    for i in range(len(filtered_data) - duration_periods + 1):
+        window = filtered_data[i:i + duration_periods]
+        is_continuous = True
+        for j in range(len(window) - 1):
+            curr_time = datetime.strptime(window[j]["dtime"], "%Y-%m-%d %H:%M:%S")
+            next_time = datetime.strptime(window[j + 1]["dtime"], "%Y-%m-%d %H:%M:%S")
+            if next_time != curr_time + timedelta(minutes=15):
+                is_continuous = False
+                break
+        if not is_continuous:
+            continue
+        window_start = datetime.strptime(window[0]["dtime"], "%Y-%m-%d %H:%M:%S") - timedelta(minutes=15)
+        if window_start.minute != 0:
+            continue
+        window_prices = [float(record["rce_pln"]) for record in window]
+        candidates.append((sum(window_prices) / len(window_prices), window_start, window))
+    candidates.sort(key=lambda item: item[0], reverse=is_max)
+    results = []
+    used_hours = set()
+    for _, window_start, window in candidates:
+        if distinct_start_hour and window_start.hour in used_hours:
+            continue
+        results.append(window)
+        used_hours.add(window_start.hour)
+        if len(results) >= top_n:
+            break
+    return results
+
+
+def make_records(days: int, seed: int = 1, coarse: bool = False) -> list[dict]:
+    rng = random.Random(seed)
+    first = datetime(2024, 1, 15)
+    records = []
+    for slot in range(days * 96):
+        start = first + timedelta(minutes=15 * slot)
+        end = start + timedelta(minutes=15)
+        price = rng.choice([250.0, 300.0, 310.5]) if coarse else round(rng.uniform(-50, 900), 2)
+        records.append({
+            "dtime": end.strftime("%Y-%m-%d %H:%M:%S"),
+            "period": f"{start.strftime('%H:%M')} - {end.strftime('%H:%M')}",
+            "rce_pln": f"{price:.2f}",
+            "business_date": start.strftime("%Y-%m-%d"),
+        })
+    return records
+
+
+def verify(records: list[dict]) -> None:
+    series = PriceSeries.from_records(records)
+    views = [records] + [series.day(date) for date in sorted(series.date_offsets)]
+    for data in views:
+        for window_start, window_end in ((0, 24), (6, 22), (17, 21)):
+            for duration in (1, 2, 3, 4):
+                for is_max in (False, True):
+                    assert PriceCalculator.find_optimal_window(
+                        data, window_start, window_end, duration, is_max
+                    ) == legacy_find_optimal_window(data, window_start, window_end, duration, is_max)
+                    assert PriceCalculator.find_top_windows(
+                        data, window_start, window_end, duration, 3, is_max
+                    ) == legacy_find_top_windows(data, window_start, window_end, duration, 3, is_max)
+
+
+def main() -> None:
+    for seed in range(5):
+        verify(make_records(2, seed))
+        verify(make_records(2, seed, coarse=True))
+    print("results identical to the legacy implementation\n")
+
+    print(f"{'series':>10} {'call':>14} {'legacy ms':>10} {'engine ms':>10} {'series ms':>10}")
+    for days in (1, 2, 7):
+        records = make_records(days)
+        day = PriceSeries.from_records(records).day("2024-01-15") if days == 1 else None
+        for name, legacy, current, args in (
+            ("optimal 3h", legacy_find_optimal_window, PriceCalculator.find_optimal_window, (0, 24, 3)),
+            ("top 2 x 1h", legacy_find_top_windows, PriceCalculator.find_top_windows, (0, 24, 1)),
+        ):
+            number = 20
+            legacy_ms = timeit.timeit(lambda: legacy(records, *args), number=number) / number * 1000
+            engine_ms = timeit.timeit(lambda: current(records, *args), number=number) / number * 1000
+            series_ms = (
+                timeit.timeit(lambda: current(day, *args), number=number) / number * 1000
+                if day is not None else float("nan")
+            )
+            print(f"{days * 96:>10} {name:>14} {legacy_ms:>10.3f} {engine_ms:>10.3f} {series_ms:>10.3f}")
+
+    series = PriceSeries.from_records(make_records(2))
+    engine = WindowEngine(series.starts, series.prices)
+    positions = list(engine.window_starts(4))
+    number = 200
+    top_ms = timeit.timeit(
+        lambda: engine.top(4, False, positions, 10, WINDOW_OVERLAP_NON_OVERLAPPING), number=number
+    ) / number * 1000
+    print(f"\ntop 10 non-overlapping 1h windows over 48h series: {top_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,66 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DOMAIN,
+    BACKFILL_DEFAULT_CHUNK_DAYS,
+    BACKFILL_MAX_CHUNK_DAYS,
+    BACKFILL_MAX_DAYS,
+    BEST_WINDOWS_DAY_BOTH,
+    BEST_WINDOWS_DAY_TODAY,
+    BEST_WINDOWS_DAY_TOMORROW,
+    BEST_WINDOWS_MAX_DURATION_SLOTS,
     CONF_GOODWE_DEVICE_ID,
     CONF_GOODWE_SELL_THRESHOLD,
     CONF_GOODWE_BUY_THRESHOLD,
     CONF_GOODWE_BUY_SWITCH,
     CONF_GOODWE_FLIP_SELL,
     CONF_GOODWE_FLIP_BUY,
+    CONF_USE_HOURLY_PRICES,
     DEFAULT_GOODWE_SELL_THRESHOLD,
     DEFAULT_GOODWE_BUY_THRESHOLD,
     DEFAULT_GOODWE_BUY_SWITCH,
     DEFAULT_GOODWE_FLIP_SELL,
     DEFAULT_GOODWE_FLIP_BUY,
+    EVENT_BACKFILL_PROGRESS,
+    GET_PRICES_DEFAULT_FIELDS,
+    GET_PRICES_FIELDS,
+    GET_PRICES_MAX_DAYS,
+    GET_PRICES_RESOLUTIONS,
+    HISTORY_COMPACT_INTERVAL,
+    SIGNAL_ENTRY_UNLOADED,
+    SIGNAL_OPTIONS_UPDATED,
+    STORAGE_VERSION,
 )
 from .coordinator import RCEPSEDataUpdateCoordinator
+from .history import async_backfill, plan_chunks
+from .price_calculator import PriceCalculator
 from .price_plan import build_mask
+from .price_series import PriceSeries, hourly_means
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "binary_sensor"]
 
+# Options that change how fetched records are processed; every other option
+# is read when entities evaluate, so it is applied without a reload.
+RELOAD_OPTIONS = {CONF_USE_HOURLY_PRICES}
+
 PUSH_GOODWE_SERVICE = "push_goodwe_plan"
 
 PUSH_GOODWE_SCHEMA = vol.Schema({
@@ -41,12 +69,45 @@ PUSH_GOODWE_SCHEMA = vol.Schema({
     vol.Optional("buy_switch"): vol.In([0, 1, 2]),
 })
 
+BEST_WINDOWS_SERVICE = "best_windows"
+
+BEST_WINDOWS_SCHEMA = vol.Schema({
+    vol.Optional("day", default=BEST_WINDOWS_DAY_TODAY): vol.In(
+        [BEST_WINDOWS_DAY_TODAY, BEST_WINDOWS_DAY_TOMORROW, BEST_WINDOWS_DAY_BOTH]
+    ),
+})
+
+BACKFILL_HISTORY_SERVICE = "backfill_history"
+
+BACKFILL_HISTORY_SCHEMA = vol.Schema({
+    vol.Required("start_date"): cv.date,
+    vol.Optional("end_date"): cv.date,
+    vol.Optional("chunk_days", default=BACKFILL_DEFAULT_CHUNK_DAYS): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=BACKFILL_MAX_CHUNK_DAYS)
+    ),
+    vol.Optional("skip_complete", default=True): cv.boolean,
+})
+
+GET_PRICES_SERVICE = "get_prices"
+
+GET_PRICES_SCHEMA = vol.Schema({
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    vol.Optional("resolution", default=GET_PRICES_RESOLUTIONS[0]): vol.All(
+        vol.Coerce(int), vol.In(GET_PRICES_RESOLUTIONS)
+    ),
+    vol.Optional("fields", default=list(GET_PRICES_DEFAULT_FIELDS)): vol.All(
+        cv.ensure_list, [vol.In(GET_PRICES_FIELDS)]
+    ),
+})
+
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     _LOGGER.debug("Setting up RCE Prices integration")
     hass.data.setdefault(DOMAIN, {})
+    async_setup_websocket(hass)
     _LOGGER.debug("RCE Prices integration setup completed")
     return True
 
@@ -61,9 +122,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await coordinator.async_config_entry_first_refresh()
     _LOGGER.debug("Completed first data refresh for RCE Prices")
 
+    coordinator.applied_options = _reload_option_values(coordinator)
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     entry.async_on_unload(entry.add_update_listener(async_update_options))
+    entry.async_on_unload(
+        async_track_time_interval(hass, coordinator.async_compact_history, HISTORY_COMPACT_INTERVAL)
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     _LOGGER.debug("RCE Prices config entry setup completed successfully")
@@ -81,11 +146,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             raise ServiceValidationError("RCE Prices coordinator has no data - wait for first refresh")
 
         now = dt_util.now()
-        if now.hour < 14:
-            raise ServiceValidationError(
-                f"Tomorrow's prices not available yet (current hour: {now.hour}, available after 14:00)"
-            )
-
         tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
         tomorrow_data = [
             r for r in coordinator.data["raw_data"]
@@ -144,12 +204,170 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     _LOGGER.debug("Registered service %s.%s", DOMAIN, PUSH_GOODWE_SERVICE)
 
+    async def async_best_windows(call: ServiceCall) -> ServiceResponse:
+        if not coordinator.data or not coordinator.data.get("raw_data"):
+            raise ServiceValidationError("RCE Prices coordinator has no data - wait for first refresh")
+
+        series = coordinator.data.get("series") or PriceSeries.from_records(coordinator.data["raw_data"])
+
+        now = dt_util.now()
+        today = now.strftime("%Y-%m-%d")
+        tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+        requested = {
+            BEST_WINDOWS_DAY_TODAY: [today],
+            BEST_WINDOWS_DAY_TOMORROW: [tomorrow],
+            BEST_WINDOWS_DAY_BOTH: [today, tomorrow],
+        }[call.data["day"]]
+        dates = [business_date for business_date in requested if series.day(business_date)]
+
+        if not dates:
+            raise ServiceValidationError(f"No prices available for {call.data['day']}")
+
+        key = ("best_windows", tuple(dates))
+        windows = series.cache.get(key)
+        if windows is None:
+            windows = PriceCalculator.find_best_windows_by_duration(
+                [series.day(business_date) for business_date in dates], BEST_WINDOWS_MAX_DURATION_SLOTS
+            )
+            series.cache[key] = windows
+
+        def serialize(window: dict | None) -> dict | None:
+            if window is None:
+                return None
+            return {
+                "start": dt_util.as_local(window["start"]).isoformat(),
+                "end": dt_util.as_local(window["end"]).isoformat(),
+                "average_price": window["average_price"],
+            }
+
+        return {
+            "dates": dates,
+            "windows": [
+                {
+                    "duration_minutes": window["duration_minutes"],
+                    "cheapest": serialize(window["cheapest"]),
+                    "most_expensive": serialize(window["most_expensive"]),
+                }
+                for window in windows
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        BEST_WINDOWS_SERVICE,
+        async_best_windows,
+        schema=BEST_WINDOWS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    _LOGGER.debug("Registered service %s.%s", DOMAIN, BEST_WINDOWS_SERVICE)
+
+    async def async_backfill_history(call: ServiceCall) -> ServiceResponse:
+        first = call.data["start_date"]
+        last = call.data.get("end_date") or dt_util.now().date() - timedelta(days=1)
+        if first > last:
+            raise ServiceValidationError("start_date must not be after end_date")
+        if (last - first).days + 1 > BACKFILL_MAX_DAYS:
+            raise ServiceValidationError(f"Backfill is limited to {BACKFILL_MAX_DAYS} days per call")
+
+        complete_dates: set[str] = set()
+        if call.data["skip_complete"]:
+            counts = await hass.async_add_executor_job(
+                coordinator.history.date_counts, first.isoformat(), last.isoformat()
+            )
+            complete_dates = {
+                business_date for business_date, count in counts.items()
+                if count >= coordinator.expected_slots(date.fromisoformat(business_date))
+            }
+        chunks = plan_chunks(first, last, call.data["chunk_days"], complete_dates)
+        _LOGGER.info("Backfilling PSE prices %s..%s in %d chunks", first, last, len(chunks))
+
+        def report(done: int, total: int, records: int) -> None:
+            _LOGGER.debug("Backfill progress: %d/%d chunks, %d records", done, total, records)
+            hass.bus.async_fire(EVENT_BACKFILL_PROGRESS, {
+                "entry_id": entry.entry_id,
+                "done": done,
+                "total": total,
+                "records": records,
+            })
+
+        result = await async_backfill(coordinator.async_fetch_history, chunks, report)
+        _LOGGER.info("Backfill finished: %d records, %d failed chunks", result["records"], len(result["failed"]))
+        return {
+            "start_date": first.isoformat(),
+            "end_date": last.isoformat(),
+            **result,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        BACKFILL_HISTORY_SERVICE,
+        async_backfill_history,
+        schema=BACKFILL_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    _LOGGER.debug("Registered service %s.%s", DOMAIN, BACKFILL_HISTORY_SERVICE)
+
+    def to_local_naive(moment: datetime) -> datetime:
+        return moment if moment.tzinfo is None else dt_util.as_local(moment).replace(tzinfo=None)
+
+    def to_local_iso(timestamp: int) -> str:
+        return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+    async def async_get_prices(call: ServiceCall) -> ServiceResponse:
+        today = dt_util.now().date()
+        begin = to_local_naive(call.data.get("start") or datetime.combine(today, time()))
+        end = to_local_naive(call.data.get("end") or datetime.combine(today + timedelta(days=2), time()))
+        if begin >= end:
+            raise ServiceValidationError("start must be before end")
+        if (end - begin).days > GET_PRICES_MAX_DAYS:
+            raise ServiceValidationError(f"get_prices is limited to {GET_PRICES_MAX_DAYS} days per call")
+
+        starts, prices, prices_neg_to_zero = await coordinator.async_get_price_slots(begin, end)
+        resolution = call.data["resolution"]
+        if resolution == 60:
+            starts, prices, prices_neg_to_zero = hourly_means(starts, prices, prices_neg_to_zero)
+        length = resolution * 60
+
+        columns = {
+            "start": lambda: [to_local_iso(start) for start in starts],
+            "end": lambda: [to_local_iso(start + length) for start in starts],
+            "price": lambda: [round(price, 2) for price in prices],
+            "price_neg_to_zero": lambda: [round(price, 2) for price in prices_neg_to_zero],
+        }
+        return {
+            "start": begin.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE).isoformat(),
+            "end": end.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE).isoformat(),
+            "resolution": resolution,
+            "count": len(starts),
+            "prices": {field: columns[field]() for field in dict.fromkeys(call.data["fields"])},
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        GET_PRICES_SERVICE,
+        async_get_prices,
+        schema=GET_PRICES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    _LOGGER.debug("Registered service %s.%s", DOMAIN, GET_PRICES_SERVICE)
+
     return True
 
 
+def _reload_option_values(coordinator: RCEPSEDataUpdateCoordinator) -> dict:
+    return {key: coordinator.get_config_value(key, None) for key in RELOAD_OPTIONS}
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    _LOGGER.debug("Options updated for RCE Prices, reloading entry: %s", entry.entry_id)
-    await hass.config_entries.async_reload(entry.entry_id)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if _reload_option_values(coordinator) != coordinator.applied_options:
+        _LOGGER.debug("Options updated for RCE Prices, reloading entry: %s", entry.entry_id)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Options updated for RCE Prices, applying without reload: %s", entry.entry_id)
+    async_dispatcher_send(hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id))
+    coordinator.async_update_listeners()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -158,10 +376,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
         await coordinator.async_close()
         hass.services.async_remove(DOMAIN, PUSH_GOODWE_SERVICE)
+        hass.services.async_remove(DOMAIN, BEST_WINDOWS_SERVICE)
+        hass.services.async_remove(DOMAIN, BACKFILL_HISTORY_SERVICE)
+        hass.services.async_remove(DOMAIN, GET_PRICES_SERVICE)
         _LOGGER.debug("RCE Prices config entry unloaded successfully")
     else:
         _LOGGER.warning("Failed to unload RCE Prices config entry: %s", entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    _LOGGER.debug("Removing stored PSE data for config entry: %s", entry.entry_id)
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from ..const import DOMAIN, MANUFACTURER
+from ..const import DOMAIN, MANUFACTURER, STATE_REFRESH_SLOT
 from ..price_calculator import PriceCalculator
 from ..shared_base import RCEBaseCommonEntity
 
@@ -16,6 +15,8 @@ if TYPE_CHECKING:
 
 
 class RCEBaseBinarySensor(RCEBaseCommonEntity, BinarySensorEntity):
+    state_refresh = STATE_REFRESH_SLOT
+
     def __init__(self, coordinator, unique_id):
         super().__init__(coordinator, unique_id)
 
@@ -23,13 +24,14 @@ class RCEBaseBinarySensor(RCEBaseCommonEntity, BinarySensorEntity):
         if not start_time_str or not end_time_str:
             return False
         try:
+            now = dt_util.now()
             if target_date is None:
-                target_date = dt_util.now().strftime("%Y-%m-%d")
-            start_datetime_str = f"{target_date} {start_time_str}:00"
-            end_datetime_str = f"{target_date} {end_time_str}:00"
-            start_datetime = datetime.strptime(start_datetime_str, "%Y-%m-%d %H:%M:%S")
-            end_datetime = datetime.strptime(end_datetime_str, "%Y-%m-%d %H:%M:%S")
-            current_time = dt_util.now().replace(tzinfo=None)
-            return start_datetime <= current_time <= end_datetime
-        except (ValueError, KeyError):
-            return False 
\ No newline at end of file
+                target_date = now.strftime("%Y-%m-%d")
+            elif target_date != now.strftime("%Y-%m-%d"):
+                return False
+            start_seconds = int(start_time_str[:2]) * 3600 + int(start_time_str[3:5]) * 60
+            end_seconds = int(end_time_str[:2]) * 3600 + int(end_time_str[3:5]) * 60
+            current_seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+            return start_seconds <= current_seconds <= end_seconds
+        except (ValueError, KeyError, IndexError):
+            return False
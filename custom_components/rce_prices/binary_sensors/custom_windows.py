@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.util import dt as dt_util
 
@@ -26,21 +25,12 @@ class RCECustomWindowBinarySensor(RCEBaseBinarySensor):
         super().__init__(coordinator, unique_id)
         self.config_entry = config_entry
 
-    def get_config_value(self, key: str, default: any) -> any:
-        value = None
-        if self.config_entry.options and key in self.config_entry.options:
-            value = self.config_entry.options[key]
-        else:
-            value = self.config_entry.data.get(key, default)
-        
-        if key in [
-            CONF_CHEAPEST_TIME_WINDOW_START, CONF_CHEAPEST_TIME_WINDOW_END,
-            CONF_CHEAPEST_WINDOW_DURATION_HOURS, CONF_EXPENSIVE_TIME_WINDOW_START,
-            CONF_EXPENSIVE_TIME_WINDOW_END, CONF_EXPENSIVE_WINDOW_DURATION_HOURS
-        ]:
-            return int(value)
-        
-        return value
+    def is_window_active(self, window: list[dict]) -> bool:
+        window_start, _ = self.get_record_bounds(window[0])
+        _, window_end = self.get_record_bounds(window[-1])
+        if self.is_horizon_mode():
+            return window_start <= dt_util.now().replace(tzinfo=None) < window_end
+        return self.is_current_time_in_window(window_start.strftime("%H:%M"), window_end.strftime("%H:%M"))
 
 
 class RCETodayCheapestWindowBinarySensor(RCECustomWindowBinarySensor):
@@ -51,7 +41,7 @@ class RCETodayCheapestWindowBinarySensor(RCECustomWindowBinarySensor):
 
     @property
     def is_on(self) -> bool:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return False
         
@@ -59,7 +49,7 @@ class RCETodayCheapestWindowBinarySensor(RCECustomWindowBinarySensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -67,14 +57,7 @@ class RCETodayCheapestWindowBinarySensor(RCECustomWindowBinarySensor):
             return False
         
         try:
-            first_period_end = datetime.strptime(optimal_window[0]["dtime"], "%Y-%m-%d %H:%M:%S")
-            window_start = first_period_end - timedelta(minutes=15)
-            window_start_str = window_start.strftime("%H:%M")
-            
-            last_period_end = datetime.strptime(optimal_window[-1]["dtime"], "%Y-%m-%d %H:%M:%S")
-            window_end_str = last_period_end.strftime("%H:%M")
-            
-            return self.is_current_time_in_window(window_start_str, window_end_str)
+            return self.is_window_active(optimal_window)
         except (ValueError, KeyError):
             return False
 
@@ -87,7 +70,7 @@ class RCETodayExpensiveWindowBinarySensor(RCECustomWindowBinarySensor):
 
     @property
     def is_on(self) -> bool:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return False
         
@@ -95,7 +78,7 @@ class RCETodayExpensiveWindowBinarySensor(RCECustomWindowBinarySensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -103,13 +86,29 @@ class RCETodayExpensiveWindowBinarySensor(RCECustomWindowBinarySensor):
             return False
         
         try:
-            first_period_end = datetime.strptime(optimal_window[0]["dtime"], "%Y-%m-%d %H:%M:%S")
-            window_start = first_period_end - timedelta(minutes=15)
-            window_start_str = window_start.strftime("%H:%M")
-            
-            last_period_end = datetime.strptime(optimal_window[-1]["dtime"], "%Y-%m-%d %H:%M:%S")
-            window_end_str = last_period_end.strftime("%H:%M")
-            
-            return self.is_current_time_in_window(window_start_str, window_end_str)
+            return self.is_window_active(optimal_window)
         except (ValueError, KeyError):
-            return False
\ No newline at end of file
+            return False
+
+
+class RCETodayCheapestSlotsBinarySensor(RCECustomWindowBinarySensor):
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_cheapest_slots_active")
+        self._attr_icon = "mdi:format-list-checks"
+
+    @property
+    def is_on(self) -> bool:
+        slots = self.get_cheapest_slots()
+        if not slots:
+            return False
+        
+        now = dt_util.now().replace(tzinfo=None)
+        try:
+            for record in slots:
+                slot_start, slot_end = self.get_record_bounds(record)
+                if slot_start <= now < slot_end:
+                    return True
+        except (ValueError, KeyError):
+            return False
+        return False
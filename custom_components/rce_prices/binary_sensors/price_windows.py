@@ -22,14 +22,11 @@ class RCETodayMinPriceWindowBinarySensor(RCEBaseBinarySensor):
         if not today_data:
             return False
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
-        if not min_price_records:
+        analytics = self.get_day_analytics(today_data)
+        if analytics.min_start is None or analytics.min_end is None:
             return False
         
-        start_time = min_price_records[0]["period"].split(" - ")[0]
-        end_time = min_price_records[-1]["period"].split(" - ")[1]
-        
-        return self.is_current_time_in_window(start_time, end_time)
+        return self.is_current_time_in_window(analytics.min_start, analytics.min_end)
 
 
 class RCETodayMaxPriceWindowBinarySensor(RCEBaseBinarySensor):
@@ -44,11 +41,8 @@ class RCETodayMaxPriceWindowBinarySensor(RCEBaseBinarySensor):
         if not today_data:
             return False
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
-        if not max_price_records:
+        analytics = self.get_day_analytics(today_data)
+        if analytics.max_start is None or analytics.max_end is None:
             return False
         
-        start_time = max_price_records[0]["period"].split(" - ")[0]
-        end_time = max_price_records[-1]["period"].split(" - ")[1]
-        
-        return self.is_current_time_in_window(start_time, end_time)
\ No newline at end of file
+        return self.is_current_time_in_window(analytics.max_start, analytics.max_end)
\ No newline at end of file
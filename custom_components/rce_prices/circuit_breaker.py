@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from .const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CIRCUIT_OPEN_DURATION,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+
+
+def parse_retry_after(value: str | None, now: datetime) -> timedelta | None:
+    """``Retry-After`` as a delay; the header holds either seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return timedelta(seconds=int(value))
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - now, timedelta(0))
+
+
+class CircuitBreaker:
+    """Backoff and circuit state for requests to the PSE API.
+
+    Every consecutive failure doubles the wait before the next attempt,
+    with jitter, and never retries sooner than a server's ``Retry-After``.
+    After ``threshold`` consecutive failures the circuit opens and no
+    request is made for ``open_duration``; the next request is a probe
+    (half-open) that either closes the circuit or opens it again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        base_delay: timedelta = RETRY_BASE_DELAY,
+        max_delay: timedelta = RETRY_MAX_DELAY,
+        open_duration: timedelta = CIRCUIT_OPEN_DURATION,
+    ) -> None:
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.open_duration = open_duration
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.retry_at: datetime | None = None
+        self.last_error: str | None = None
+        self.last_success: datetime | None = None
+
+    def allow(self, now: datetime) -> bool:
+        if self.retry_at is not None and now < self.retry_at:
+            return False
+        if self.state == CIRCUIT_OPEN:
+            self.state = CIRCUIT_HALF_OPEN
+        return True
+
+    def record_success(self, now: datetime) -> None:
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.retry_at = None
+        self.last_error = None
+        self.last_success = now
+
+    def record_failure(self, now: datetime, error: Exception, retryable: bool = True,
+                       retry_after: timedelta | None = None) -> datetime:
+        """Count a failed request and return when the next one may be made."""
+        self.failures += 1
+        self.last_error = str(error) or type(error).__name__
+        if self.failures >= self.threshold:
+            self.state = CIRCUIT_OPEN
+            delay = self.open_duration
+        elif retryable:
+            backoff = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+            delay = backoff / 2 + backoff / 2 * random.random()
+        else:
+            delay = self.max_delay
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.retry_at = now + delay
+        return self.retry_at
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "last_error": self.last_error,
+            "next_retry": self.retry_at.isoformat() if self.retry_at else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
@@ -16,7 +16,13 @@ from .const import (
     CONF_EXPENSIVE_TIME_WINDOW_END,
     CONF_EXPENSIVE_WINDOW_DURATION_HOURS,
     CONF_USE_HOURLY_PRICES,
+    CONF_PRICE_ATTRIBUTE_FORMAT,
     CONF_PRICE_SLOT_SENSORS,
+    CONF_WINDOW_HORIZON_MODE,
+    CONF_CHEAPEST_SLOTS_COUNT,
+    CONF_HISTORY_RETENTION_DAYS,
+    PRICE_ATTRIBUTE_FORMAT_COMPACT,
+    PRICE_ATTRIBUTE_FORMAT_RECORDS,
     PRICE_SLOT_SENSORS_NONE,
     PRICE_SLOT_SENSORS_HOURLY,
     PRICE_SLOT_SENSORS_QUARTER,
@@ -37,7 +43,11 @@ from .const import (
     DEFAULT_TIME_WINDOW_END,
     DEFAULT_WINDOW_DURATION_HOURS,
     DEFAULT_USE_HOURLY_PRICES,
+    DEFAULT_PRICE_ATTRIBUTE_FORMAT,
     DEFAULT_PRICE_SLOT_SENSORS,
+    DEFAULT_WINDOW_HORIZON_MODE,
+    DEFAULT_CHEAPEST_SLOTS_COUNT,
+    DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_GOODWE_SELL_THRESHOLD,
     DEFAULT_GOODWE_BUY_THRESHOLD,
     DEFAULT_GOODWE_BUY_SWITCH,
@@ -51,6 +61,12 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def is_valid_time_window(start_hour: int, end_hour: int, horizon_mode: bool) -> bool:
+    if horizon_mode:
+        return start_hour != end_hour
+    return start_hour < end_hour
+
 CONFIG_SCHEMA = vol.Schema({
     vol.Required(CONF_CHEAPEST_TIME_WINDOW_START, default=DEFAULT_TIME_WINDOW_START): selector.NumberSelector(
         selector.NumberSelectorConfig(
@@ -100,9 +116,37 @@ CONFIG_SCHEMA = vol.Schema({
             mode=selector.NumberSelectorMode.BOX,
         )
     ),
+    vol.Optional(CONF_CHEAPEST_SLOTS_COUNT, default=DEFAULT_CHEAPEST_SLOTS_COUNT): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=96,
+            step=1,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Optional(CONF_WINDOW_HORIZON_MODE, default=DEFAULT_WINDOW_HORIZON_MODE): selector.BooleanSelector(
+        selector.BooleanSelectorConfig()
+    ),
     vol.Optional(CONF_USE_HOURLY_PRICES, default=DEFAULT_USE_HOURLY_PRICES): selector.BooleanSelector(
         selector.BooleanSelectorConfig()
     ),
+    vol.Optional(CONF_HISTORY_RETENTION_DAYS, default=DEFAULT_HISTORY_RETENTION_DAYS): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=3650,
+            step=1,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Optional(CONF_PRICE_ATTRIBUTE_FORMAT, default=DEFAULT_PRICE_ATTRIBUTE_FORMAT): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"value": PRICE_ATTRIBUTE_FORMAT_RECORDS, "label": "Records (one object per slot)"},
+                {"value": PRICE_ATTRIBUTE_FORMAT_COMPACT, "label": "Compact (start and price arrays)"},
+            ],
+            mode=selector.SelectSelectorMode.LIST,
+        )
+    ),
     vol.Optional(CONF_PRICE_SLOT_SENSORS, default=DEFAULT_PRICE_SLOT_SENSORS): selector.SelectSelector(
         selector.SelectSelectorConfig(
             options=[
@@ -219,9 +263,11 @@ class RCEConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             expensive_start = user_input.get(CONF_EXPENSIVE_TIME_WINDOW_START, DEFAULT_TIME_WINDOW_START)
             expensive_end = user_input.get(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
             
-            if cheapest_start >= cheapest_end:
+            horizon_mode = user_input.get(CONF_WINDOW_HORIZON_MODE, DEFAULT_WINDOW_HORIZON_MODE)
+            
+            if not is_valid_time_window(cheapest_start, cheapest_end, horizon_mode):
                 errors["base"] = "invalid_time_window"
-            elif expensive_start >= expensive_end:
+            elif not is_valid_time_window(expensive_start, expensive_end, horizon_mode):
                 errors["base"] = "invalid_time_window"
             else:
                 _LOGGER.debug("Creating RCE Prices config entry with options: %s", user_input)
@@ -250,9 +296,11 @@ class RCEOptionsFlow(config_entries.OptionsFlow):
             expensive_start = user_input.get(CONF_EXPENSIVE_TIME_WINDOW_START, DEFAULT_TIME_WINDOW_START)
             expensive_end = user_input.get(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
             
-            if cheapest_start >= cheapest_end:
+            horizon_mode = user_input.get(CONF_WINDOW_HORIZON_MODE, DEFAULT_WINDOW_HORIZON_MODE)
+            
+            if not is_valid_time_window(cheapest_start, cheapest_end, horizon_mode):
                 errors["base"] = "invalid_time_window"
-            elif expensive_start >= expensive_end:
+            elif not is_valid_time_window(expensive_start, expensive_end, horizon_mode):
                 errors["base"] = "invalid_time_window"
             else:
                 _LOGGER.debug("Updating RCE Prices options: %s", user_input)
@@ -326,12 +374,52 @@ class RCEOptionsFlow(config_entries.OptionsFlow):
                     mode=selector.NumberSelectorMode.BOX,
                 )
             ),
+            vol.Optional(
+                CONF_CHEAPEST_SLOTS_COUNT,
+                default=current_data.get(CONF_CHEAPEST_SLOTS_COUNT, DEFAULT_CHEAPEST_SLOTS_COUNT)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=96,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_WINDOW_HORIZON_MODE,
+                default=current_data.get(CONF_WINDOW_HORIZON_MODE, DEFAULT_WINDOW_HORIZON_MODE)
+            ): selector.BooleanSelector(
+                selector.BooleanSelectorConfig()
+            ),
             vol.Optional(
                 CONF_USE_HOURLY_PRICES,
                 default=current_data.get(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES)
             ): selector.BooleanSelector(
                 selector.BooleanSelectorConfig()
             ),
+            vol.Optional(
+                CONF_HISTORY_RETENTION_DAYS,
+                default=current_data.get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=3650,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_PRICE_ATTRIBUTE_FORMAT,
+                default=current_data.get(CONF_PRICE_ATTRIBUTE_FORMAT, DEFAULT_PRICE_ATTRIBUTE_FORMAT)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        {"value": PRICE_ATTRIBUTE_FORMAT_RECORDS, "label": "Records (one object per slot)"},
+                        {"value": PRICE_ATTRIBUTE_FORMAT_COMPACT, "label": "Compact (start and price arrays)"},
+                    ],
+                    mode=selector.SelectSelectorMode.LIST,
+                )
+            ),
             vol.Optional(
                 CONF_PRICE_SLOT_SENSORS,
                 default=current_data.get(CONF_PRICE_SLOT_SENSORS, DEFAULT_PRICE_SLOT_SENSORS)
@@ -10,6 +10,64 @@ PSE_API_URL: Final[str] = "https://api.raporty.pse.pl/api/rce-pln"
 API_UPDATE_INTERVAL: Final[timedelta] = timedelta(minutes=30)
 API_SELECT: Final[str] = "dtime,period,rce_pln,business_date,publication_ts"
 API_FIRST: Final[int] = 200
+API_MAX_PAGES: Final[int] = 500
+API_MAX_PARALLEL: Final[int] = 2
+# One business date may hang without costing the others; the update as a
+# whole is bounded by API_UPDATE_TIMEOUT, above the per-date limit.
+API_DATE_TIMEOUT: Final[int] = 20
+API_UPDATE_TIMEOUT: Final[int] = 45
+WINDOW_CACHE_SIZE: Final[int] = 64
+STORAGE_VERSION: Final[int] = 1
+STORAGE_SAVE_DELAY: Final[int] = 10
+HISTORY_DB_FILE: Final[str] = "rce_prices_history.db"
+HISTORY_CHUNK_TIMEOUT: Final[int] = 120
+HISTORY_COMPACT_INTERVAL: Final[timedelta] = timedelta(days=1)
+HELD_DATE_REVALIDATE_INTERVAL: Final[timedelta] = timedelta(hours=6)
+PUBLICATION_WINDOW_START_HOUR: Final[int] = 13
+PUBLICATION_WINDOW_END_HOUR: Final[int] = 17
+PUBLICATION_POLL_INTERVALS: Final[tuple[tuple[timedelta, timedelta], ...]] = (
+    (timedelta(0), timedelta(minutes=15)),
+    (timedelta(hours=1), timedelta(minutes=5)),
+    (timedelta(hours=1, minutes=30), timedelta(minutes=2)),
+)
+MIN_REFRESH_INTERVAL: Final[timedelta] = timedelta(minutes=1)
+RETRY_BASE_DELAY: Final[timedelta] = timedelta(seconds=30)
+RETRY_MAX_DELAY: Final[timedelta] = timedelta(minutes=10)
+CIRCUIT_FAILURE_THRESHOLD: Final[int] = 5
+CIRCUIT_OPEN_DURATION: Final[timedelta] = timedelta(minutes=30)
+CIRCUIT_CLOSED: Final[str] = "closed"
+CIRCUIT_OPEN: Final[str] = "open"
+CIRCUIT_HALF_OPEN: Final[str] = "half_open"
+
+STATE_REFRESH_SLOT: Final[str] = "slot"
+STATE_REFRESH_DAY: Final[str] = "day"
+
+WINDOW_OVERLAP_ANY: Final[str] = "any"
+WINDOW_OVERLAP_DISTINCT_START_HOUR: Final[str] = "distinct_start_hour"
+WINDOW_OVERLAP_NON_OVERLAPPING: Final[str] = "non_overlapping"
+WINDOW_OVERLAP_MIN_GAP: Final[str] = "min_gap"
+
+BACKFILL_MAX_PARALLEL: Final[int] = 4
+BACKFILL_RETRIES: Final[int] = 3
+BACKFILL_RETRY_DELAY: Final[int] = 2
+BACKFILL_DEFAULT_CHUNK_DAYS: Final[int] = 7
+BACKFILL_MAX_CHUNK_DAYS: Final[int] = 31
+BACKFILL_MAX_DAYS: Final[int] = 3 * 366
+EVENT_BACKFILL_PROGRESS: Final[str] = f"{DOMAIN}_backfill_progress"
+
+GET_PRICES_RESOLUTIONS: Final[tuple[int, ...]] = (15, 60)
+GET_PRICES_FIELDS: Final[tuple[str, ...]] = ("start", "end", "price", "price_neg_to_zero")
+GET_PRICES_DEFAULT_FIELDS: Final[tuple[str, ...]] = ("start", "price")
+GET_PRICES_MAX_DAYS: Final[int] = 366
+
+WEBSOCKET_SUBSCRIBE: Final[str] = f"{DOMAIN}/subscribe"
+SIGNAL_OPTIONS_UPDATED: Final[str] = f"{DOMAIN}_options_updated_{{}}"
+SIGNAL_ENTRY_UNLOADED: Final[str] = f"{DOMAIN}_entry_unloaded_{{}}"
+
+BEST_WINDOWS_MAX_DURATION_SLOTS: Final[int] = 96
+BEST_WINDOWS_DAY_TODAY: Final[str] = "today"
+BEST_WINDOWS_DAY_TOMORROW: Final[str] = "tomorrow"
+BEST_WINDOWS_DAY_BOTH: Final[str] = "both"
 
 TAX_RATE: Final[float] = 0.23
 
@@ -24,16 +82,28 @@ CONF_EXPENSIVE_WINDOW_DURATION_HOURS: Final[str] = "expensive_window_duration_ho
 CONF_WINDOW_DURATION_HOURS: Final[str] = "window_duration_hours"
 CONF_USE_HOURLY_PRICES: Final[str] = "use_hourly_prices"
 CONF_PRICE_SLOT_SENSORS: Final[str] = "price_slot_sensors"
+CONF_WINDOW_HORIZON_MODE: Final[str] = "window_horizon_mode"
+CONF_CHEAPEST_SLOTS_COUNT: Final[str] = "cheapest_slots_count"
+CONF_HISTORY_RETENTION_DAYS: Final[str] = "history_retention_days"
+CONF_PRICE_ATTRIBUTE_FORMAT: Final[str] = "price_attribute_format"
 
 PRICE_SLOT_SENSORS_NONE: Final[str] = "none"
 PRICE_SLOT_SENSORS_HOURLY: Final[str] = "hourly"
 PRICE_SLOT_SENSORS_QUARTER: Final[str] = "quarter_hourly"
 
+PRICE_ATTRIBUTE_FORMAT_RECORDS: Final[str] = "records"
+PRICE_ATTRIBUTE_FORMAT_COMPACT: Final[str] = "compact"
+
 DEFAULT_TIME_WINDOW_START: Final[int] = 0
 DEFAULT_TIME_WINDOW_END: Final[int] = 24
 DEFAULT_WINDOW_DURATION_HOURS: Final[int] = 2
 DEFAULT_USE_HOURLY_PRICES: Final[bool] = False
 DEFAULT_PRICE_SLOT_SENSORS: Final[str] = PRICE_SLOT_SENSORS_NONE
+DEFAULT_WINDOW_HORIZON_MODE: Final[bool] = False
+DEFAULT_CHEAPEST_SLOTS_COUNT: Final[int] = 8
+DEFAULT_HISTORY_RETENTION_DAYS: Final[int] = 730
+DEFAULT_PRICE_ATTRIBUTE_FORMAT: Final[str] = PRICE_ATTRIBUTE_FORMAT_RECORDS
+WINDOW_HORIZON_HOURS: Final[int] = 36
 
 MORNING_BEST_WINDOW_START_HOUR: Final[int] = 7
 MORNING_BEST_WINDOW_END_HOUR: Final[int] = 9
@@ -2,21 +2,72 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import sqlite3
+from array import array
+from bisect import bisect_left
 from collections import defaultdict
-from datetime import datetime, timedelta
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import aiohttp
 import async_timeout
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .const import API_FIRST, API_SELECT, API_UPDATE_INTERVAL, DOMAIN, PSE_API_URL, CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES
+from .const import (
+    API_DATE_TIMEOUT,
+    API_FIRST,
+    API_MAX_PAGES,
+    API_MAX_PARALLEL,
+    API_SELECT,
+    API_UPDATE_INTERVAL,
+    API_UPDATE_TIMEOUT,
+    DOMAIN,
+    PSE_API_URL,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_USE_HOURLY_PRICES,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    DEFAULT_USE_HOURLY_PRICES,
+    HELD_DATE_REVALIDATE_INTERVAL,
+    HISTORY_CHUNK_TIMEOUT,
+    HISTORY_DB_FILE,
+    MIN_REFRESH_INTERVAL,
+    PUBLICATION_POLL_INTERVALS,
+    PUBLICATION_WINDOW_END_HOUR,
+    PUBLICATION_WINDOW_START_HOUR,
+    STATE_REFRESH_DAY,
+    STATE_REFRESH_SLOT,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    WINDOW_CACHE_SIZE,
+)
+
+from .circuit_breaker import CircuitBreaker, parse_retry_after
+from .history import PriceHistoryStore
+from .price_series import SLOT_SECONDS, PriceSeries, next_slot_boundary, to_timestamp
+from .window_cache import WindowCache
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class PSEApiError(UpdateFailed):
+    """Failed PSE API request; ``status`` is None when no response arrived."""
+
+    def __init__(self, message: str, status: int | None = None, retry_after: str | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
 class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
 
     def __init__(self, hass: HomeAssistant, config_entry=None) -> None:
@@ -25,10 +76,88 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=DOMAIN,
             update_interval=API_UPDATE_INTERVAL,
+            always_update=False,
         )
         self.session = None
         self._last_api_fetch = None
+        self._validators: dict[str, dict[str, str]] = {}
+        self._dates_checked: dict[str, datetime] = {}
         self.config_entry = config_entry
+        self.window_cache = WindowCache(WINDOW_CACHE_SIZE)
+        self._store: Store | None = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}") if config_entry else None
+        )
+        self.history: PriceHistoryStore | None = (
+            PriceHistoryStore(hass.config.path(HISTORY_DB_FILE)) if config_entry else None
+        )
+        self._history_writes: set[asyncio.Future] = set()
+        self._boundary_listeners: dict[str, list[CALLBACK_TYPE]] = {
+            STATE_REFRESH_SLOT: [],
+            STATE_REFRESH_DAY: [],
+        }
+        self._unsub_boundary: CALLBACK_TYPE | None = None
+        self.breaker = CircuitBreaker()
+        # Values of the options that require a reload, as set up.
+        self.applied_options: dict[str, Any] = {}
+        self._health_listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_boundary_listener(self, update_callback: CALLBACK_TYPE,
+                                    refresh: str = STATE_REFRESH_SLOT) -> CALLBACK_TYPE:
+        """Call ``update_callback`` at every quarter-hour boundary, or only when the day changes."""
+        listeners = self._boundary_listeners[refresh]
+        listeners.append(update_callback)
+        if self._unsub_boundary is None:
+            self._schedule_boundary()
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if not any(self._boundary_listeners.values()):
+                self._cancel_boundary()
+
+        return remove_listener
+
+    @callback
+    def async_add_health_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call ``update_callback`` whenever a request to the PSE API succeeds or fails."""
+        self._health_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._health_listeners:
+                self._health_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _notify_health(self) -> None:
+        for update_callback in list(self._health_listeners):
+            update_callback()
+
+    @callback
+    def _schedule_boundary(self) -> None:
+        self._unsub_boundary = async_track_point_in_time(
+            self.hass, self._handle_boundary, next_slot_boundary(dt_util.now())
+        )
+
+    @callback
+    def _cancel_boundary(self) -> None:
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+    @callback
+    def _handle_boundary(self, fired_at: datetime) -> None:
+        self._schedule_boundary()
+        boundary = dt_util.as_local(fired_at)
+        refresh = [STATE_REFRESH_SLOT]
+        if boundary.minute == 0 and boundary.hour == 0:
+            refresh.append(STATE_REFRESH_DAY)
+        for kind in refresh:
+            for update_callback in list(self._boundary_listeners[kind]):
+                update_callback()
 
     def _get_config_value(self, key: str, default: any) -> any:
         if not self.config_entry:
@@ -41,101 +170,505 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
         
         return default
 
+    def get_config_value(self, key: str, default: Any) -> Any:
+        """Value of ``key`` from the entry options, then its data, else ``default``."""
+        return self._get_config_value(key, default)
+
+    async def async_config_entry_first_refresh(self) -> None:
+        """Serve the stored payload at startup and refresh it in the background."""
+        cached = await self._async_load_stored_data()
+        if cached is None:
+            await super().async_config_entry_first_refresh()
+            return
+        
+        self.async_set_updated_data(cached)
+        now = dt_util.now()
+        if self._last_api_fetch is None or now >= self._next_fetch_time(cached, self._last_api_fetch):
+            _LOGGER.debug("Stored PSE data is stale, refreshing in the background")
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_refresh(), f"{DOMAIN} background refresh"
+            )
+
+    async def _async_load_stored_data(self) -> dict[str, Any] | None:
+        if self._store is None:
+            return None
+        try:
+            stored = await self._store.async_load()
+        except Exception as exception:
+            _LOGGER.warning("Could not read stored PSE data: %s", exception)
+            return None
+        
+        use_hourly_prices = self._get_config_value(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES)
+        if not stored or stored.get("use_hourly_prices") != bool(use_hourly_prices):
+            return None
+        
+        today = dt_util.now().strftime("%Y-%m-%d")
+        raw_data = [record for record in stored.get("raw_data", []) if record.get("business_date", "") >= today]
+        if not any(record.get("business_date") == today for record in raw_data):
+            _LOGGER.debug("Stored PSE data has no prices for %s, ignoring it", today)
+            return None
+        
+        last_api_fetch = stored.get("last_api_fetch")
+        self._last_api_fetch = dt_util.parse_datetime(last_api_fetch) if last_api_fetch else None
+        _LOGGER.debug("Restored %d stored PSE records, last API fetch: %s", len(raw_data), self._last_api_fetch)
+        return {
+            "raw_data": raw_data,
+            "series": PriceSeries.from_records(raw_data),
+            "fingerprint": self._fingerprint(raw_data),
+            "last_update": stored.get("last_update"),
+        }
+
+    @callback
+    def _async_store_data(self, data: dict[str, Any]) -> None:
+        if self._store is None:
+            return
+        use_hourly_prices = bool(self._get_config_value(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES))
+        last_api_fetch = self._last_api_fetch.isoformat() if self._last_api_fetch else None
+        self._store.async_delay_save(
+            lambda: {
+                "raw_data": data["raw_data"],
+                "last_update": data.get("last_update"),
+                "last_api_fetch": last_api_fetch,
+                "use_hourly_prices": use_hourly_prices,
+            },
+            STORAGE_SAVE_DELAY,
+        )
+
+    @staticmethod
+    def is_date_complete(data: dict[str, Any] | None, business_date: date) -> bool:
+        """Whether ``data`` holds every quarter-hour of ``business_date``, DST days included."""
+        if not data:
+            return False
+        series = data.get("series") or PriceSeries.from_records(data.get("raw_data"))
+        day = series.day(business_date.strftime("%Y-%m-%d"))
+        return day is not None and len(day) >= RCEPSEDataUpdateCoordinator.expected_slots(business_date)
+
+    @staticmethod
+    def expected_slots(business_date: date) -> int:
+        """Quarter-hours in the local ``business_date``: 92 or 100 on DST change days."""
+        day_start = dt_util.start_of_local_day(business_date)
+        day_end = dt_util.start_of_local_day(business_date + timedelta(days=1))
+        return int((dt_util.as_utc(day_end) - dt_util.as_utc(day_start)).total_seconds()) // SLOT_SECONDS
+
+    def _next_fetch_time(self, data: dict[str, Any] | None, last_fetch: datetime) -> datetime:
+        """When PSE is next worth asking, given what ``data`` already holds.
+
+        Once today and tomorrow are complete nothing changes until the next
+        publication window; inside the window polling tightens the longer
+        tomorrow's prices are late.
+        """
+        local = dt_util.as_local(last_fetch)
+        window_start = local.replace(hour=PUBLICATION_WINDOW_START_HOUR, minute=0, second=0, microsecond=0)
+        window_end = local.replace(hour=PUBLICATION_WINDOW_END_HOUR, minute=0, second=0, microsecond=0)
+        today = local.date()
+
+        if not self.is_date_complete(data, today):
+            return last_fetch + API_UPDATE_INTERVAL
+        if self.is_date_complete(data, today + timedelta(days=1)):
+            return window_start + timedelta(days=1)
+        if local < window_start:
+            return window_start
+        if local >= window_end:
+            return last_fetch + API_UPDATE_INTERVAL
+        elapsed = local - window_start
+        interval = next(poll for offset, poll in reversed(PUBLICATION_POLL_INTERVALS) if elapsed >= offset)
+        return last_fetch + interval
+
+    def _schedule_next_fetch(self, data: dict[str, Any] | None, now: datetime) -> None:
+        next_fetch = self._next_fetch_time(data, self._last_api_fetch or now)
+        self.update_interval = max(next_fetch - now, MIN_REFRESH_INTERVAL)
+        _LOGGER.debug("Next PSE API fetch planned at %s", next_fetch)
+
     async def _async_update_data(self) -> dict[str, Any]:
         now = dt_util.now()
         
-        if (self._last_api_fetch and 
-            self.data and 
-            now - self._last_api_fetch < API_UPDATE_INTERVAL):
-            time_since_fetch = now - self._last_api_fetch
-            _LOGGER.debug("Using cached data - last API fetch was %s ago (max interval: %s)", 
-                         time_since_fetch, API_UPDATE_INTERVAL)
+        if self.breaker.failures == 0 and (
+            self._last_api_fetch and
+            self.data and
+            now < self._next_fetch_time(self.data, self._last_api_fetch)
+        ):
+            _LOGGER.debug("Using cached data - last API fetch was %s ago", now - self._last_api_fetch)
+            self._schedule_next_fetch(self.data, now)
             return self.data
         
+        if not self.breaker.allow(now):
+            _LOGGER.debug("PSE API %s, next attempt at %s", self.breaker.state, self.breaker.retry_at)
+            self.update_interval = max(self.breaker.retry_at - now, MIN_REFRESH_INTERVAL)
+            if self.data:
+                return self.data
+            raise UpdateFailed(f"PSE API unavailable, retrying at {self.breaker.retry_at}")
+        
         _LOGGER.debug("Fetching fresh data from PSE API - last fetch: %s", self._last_api_fetch)
         
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-            
         try:
-            async with async_timeout.timeout(30):
+            async with async_timeout.timeout(API_UPDATE_TIMEOUT):
                 data = await self._fetch_data()
                 self._last_api_fetch = now
+                self.breaker.record_success(now)
+                self._notify_health()
+                self._async_store_data(data)
+                self._schedule_next_fetch(data, now)
                 _LOGGER.debug("Successfully fetched fresh data from PSE API, records count: %d", 
                             len(data.get("raw_data", [])))
                 return data
         except asyncio.TimeoutError as exception:
-            self._last_api_fetch = now
+            self._record_failure(now, exception, True, None)
             _LOGGER.error("Timeout communicating with PSE API: %s", exception)
             if self.data:
                 _LOGGER.warning("Using existing data due to API timeout")
                 return self.data
             raise UpdateFailed(f"Timeout communicating with API: {exception}") from exception
         except Exception as exception:
-            self._last_api_fetch = now
+            retryable = isinstance(exception, PSEApiError) and exception.retryable
+            retry_after = exception.retry_after if isinstance(exception, PSEApiError) else None
+            self._record_failure(now, exception, retryable, parse_retry_after(retry_after, now))
             _LOGGER.error("Error communicating with PSE API: %s", exception)
             if self.data:
                 _LOGGER.warning("Using existing data due to API error")
                 return self.data
             raise UpdateFailed(f"Error communicating with API: {exception}") from exception
 
+    @callback
+    def _record_failure(self, now: datetime, exception: Exception, retryable: bool,
+                        retry_after: timedelta | None) -> None:
+        retry_at = self.breaker.record_failure(now, exception, retryable, retry_after)
+        self.update_interval = max(retry_at - now, MIN_REFRESH_INTERVAL)
+        _LOGGER.debug("PSE API failure %d (%s), next attempt at %s",
+                      self.breaker.failures, self.breaker.state, retry_at)
+        self._notify_health()
+
+    @staticmethod
+    def _fingerprint(records: list[dict]) -> int:
+        """Hash of what entities read from ``records``: dates, slots, prices and publications.
+
+        Returning the held data object when it is unchanged lets the
+        coordinator (``always_update=False``) skip notifying listeners.
+        """
+        return hash(tuple(
+            (record.get("business_date"), record.get("dtime"), record.get("rce_pln"),
+             record.get("rce_pln_neg_to_zero"), record.get("publication_ts"))
+            for record in records
+        ))
+
+    @staticmethod
+    def _publications(records: list[dict]) -> dict[str, str]:
+        """Latest ``publication_ts`` seen for each business date."""
+        publications: dict[str, str] = {}
+        for record in records:
+            business_date = record.get("business_date")
+            published = record.get("publication_ts")
+            if business_date and published and published > publications.get(business_date, ""):
+                publications[business_date] = published
+        return publications
+
+    def _dates_to_fetch(self, now: datetime) -> list[str]:
+        """Business dates the next request must cover.
+
+        Missing, incomplete or unpublished dates are always requested. A
+        complete held date is revalidated only when its validators make that
+        a cheap 304, or once HELD_DATE_REVALIDATE_INTERVAL has passed since
+        it was last checked, so PSE revisions are still picked up.
+        """
+        held = self._publications(self.data.get("raw_data", [])) if self.data else {}
+        dates = []
+        for business_date in (now.date(), now.date() + timedelta(days=1)):
+            key = business_date.strftime("%Y-%m-%d")
+            checked = self._dates_checked.get(key)
+            if (
+                key not in held
+                or not self.is_date_complete(self.data, business_date)
+                or f"business_date eq '{key}'" in self._validators
+                or checked is None
+                or now - checked >= HELD_DATE_REVALIDATE_INTERVAL
+            ):
+                dates.append(key)
+        return dates
+
+    def _merge_records(self, fetched: list[dict], today: str) -> list[dict]:
+        """Replace held dates with fetched ones unless the held publication is newer."""
+        by_date: dict[str, list[dict]] = defaultdict(list)
+        for record in (self.data or {}).get("raw_data", []):
+            if record.get("business_date", "") >= today:
+                by_date[record["business_date"]].append(record)
+        held = self._publications([record for records in by_date.values() for record in records])
+
+        fetched_by_date: dict[str, list[dict]] = defaultdict(list)
+        for record in fetched:
+            fetched_by_date[record.get("business_date", "")].append(record)
+        fetched_publications = self._publications(fetched)
+
+        for business_date, records in fetched_by_date.items():
+            if fetched_publications.get(business_date, "") < held.get(business_date, ""):
+                _LOGGER.debug("Keeping newer held publication for %s", business_date)
+                continue
+            by_date[business_date] = records
+
+        return [record for business_date in sorted(by_date) for record in by_date[business_date]]
+
+    def _remember_validators(self, date_filter: str, response_headers) -> None:
+        validators = {}
+        if etag := response_headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := response_headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+        if validators:
+            self._validators[date_filter] = validators
+        else:
+            self._validators.pop(date_filter, None)
+
     async def _fetch_data(self) -> dict[str, Any]:
-        today = dt_util.now().strftime("%Y-%m-%d")
-        _LOGGER.debug("Fetching PSE data for business_date >= %s", today)
+        now = dt_util.now()
+        today = now.strftime("%Y-%m-%d")
+        dates = self._dates_to_fetch(now)
+        if not dates:
+            _LOGGER.debug("Held PSE data is complete and recently checked")
+            return self.data
+        _LOGGER.debug("Fetching PSE data for business dates %s", dates)
+
+        if self.session is None:
+            self.session = async_get_clientsession(self.hass)
+
+        semaphore = asyncio.Semaphore(API_MAX_PARALLEL)
+
+        async def fetch(business_date: str) -> list[dict] | None:
+            async with semaphore, async_timeout.timeout(API_DATE_TIMEOUT):
+                return await self._async_fetch_date(business_date)
+
+        results = await asyncio.gather(*(fetch(business_date) for business_date in dates), return_exceptions=True)
+
+        by_date: dict[str, list[dict]] = {}
+        modified = False
+        errors = []
+        for business_date, result in zip(dates, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Fetching PSE data for %s failed: %s", business_date, result)
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                self._dates_checked[business_date] = now
+                if result is None:
+                    continue
+                modified = True
+                received: dict[str, list[dict]] = defaultdict(list)
+                for record in result:
+                    received[record.get("business_date", "")].append(record)
+                for received_date, records in received.items():
+                    by_date.setdefault(received_date, records)
+
+        if len(errors) == len(dates):
+            raise errors[0]
+        if not modified:
+            _LOGGER.debug("PSE data not modified for %s", dates)
+            return self.data
+
+        raw_data = [record for records in by_date.values() for record in records]
+        record_count = len(raw_data)
+        _LOGGER.debug("PSE API returned %d records", record_count)
+        
+        if record_count == 0:
+            _LOGGER.warning("PSE API returned no data records")
         
+        use_hourly_prices = self._get_config_value(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES)
+        
+        if use_hourly_prices:
+            _LOGGER.debug("Hourly prices option enabled, calculating hourly averages")
+            processed_data = self._calculate_hourly_averages(raw_data)
+        else:
+            _LOGGER.debug("Hourly prices option disabled, using original 15-minute data")
+            processed_data = self._add_neg_to_zero_key(raw_data)
+        
+        processed_data = self._merge_records(processed_data, today)
+        fingerprint = self._fingerprint(processed_data)
+        if self.data and self.data.get("fingerprint") == fingerprint:
+            _LOGGER.debug("PSE prices unchanged, keeping current data")
+            return self.data
+        
+        return {
+            "raw_data": processed_data,
+            "series": PriceSeries.from_records(processed_data),
+            "fingerprint": fingerprint,
+            "last_update": dt_util.now().isoformat(),
+        }
+
+    async def _async_fetch_date(self, business_date: str) -> list[dict] | None:
+        """Records of one business date, or ``None`` when the held copy is still current."""
+        date_filter = f"business_date eq '{business_date}'"
         params = {
             "$select": API_SELECT,
-            "$filter": f"business_date ge '{today}'",
+            "$filter": date_filter,
             "$first": API_FIRST,
         }
         
         headers = {
             "Accept": "application/json",
+            "Accept-Encoding": "gzip",
         }
+        if self.data:
+            headers.update(self._validators.get(date_filter, {}))
 
         _LOGGER.debug("PSE API request URL: %s, params: %s", PSE_API_URL, params)
 
         try:
-            async with self.session.get(
-                PSE_API_URL, params=params, headers=headers
-            ) as response:
-                _LOGGER.debug("PSE API response status: %d", response.status)
-                
-                if response.status != 200:
-                    _LOGGER.error("PSE API returned error status: %d", response.status)
-                    raise UpdateFailed(f"API returned status {response.status}")
-                
-                data = await response.json()
-                
-                if "value" not in data:
-                    _LOGGER.error("PSE API response missing 'value' field")
-                    raise UpdateFailed("Invalid API response format")
-                
-                record_count = len(data["value"])
-                _LOGGER.debug("PSE API returned %d records", record_count)
-                
-                if record_count == 0:
-                    _LOGGER.warning("PSE API returned no data records")
-                
-                raw_data = data["value"]
-                
-                use_hourly_prices = self._get_config_value(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES)
-                
-                if use_hourly_prices:
-                    _LOGGER.debug("Hourly prices option enabled, calculating hourly averages")
-                    processed_data = self._calculate_hourly_averages(raw_data)
-                else:
-                    _LOGGER.debug("Hourly prices option disabled, using original 15-minute data")
-                    processed_data = self._add_neg_to_zero_key(raw_data)
-                
-                return {
-                    "raw_data": processed_data,
-                    "last_update": dt_util.now().isoformat(),
-                }
-                
+            page, response_headers = await self._async_get_page(PSE_API_URL, params, headers)
+            if page is None:
+                _LOGGER.debug("PSE data not modified for %s", date_filter)
+                return None
+            self._remember_validators(date_filter, response_headers)
+            
+            records = []
+            async for page_records in self._async_iter_pages(page):
+                records.extend(page_records)
         except aiohttp.ClientError as exception:
             _LOGGER.error("HTTP client error fetching PSE data: %s", exception)
-            raise UpdateFailed(f"Error fetching data: {exception}") from exception
+            raise PSEApiError(f"Error fetching data: {exception}") from exception
+
+        self._async_record_history(records)
+        return records
+
+    async def _async_get_page(self, url: str, params: dict[str, Any] | None,
+                              headers: dict[str, str]) -> tuple[dict[str, Any] | None, Any]:
+        """One decoded API page, or ``None`` when the server answers 304 for held data."""
+        async with self.session.get(url, params=params, headers=headers) as response:
+            _LOGGER.debug("PSE API response status: %d", response.status)
+            
+            if response.status == 304 and self.data:
+                return None, response.headers
+            
+            if response.status != 200:
+                _LOGGER.error("PSE API returned error status: %d", response.status)
+                retry_after = response.headers.get("Retry-After") if response.status in (429, 503) else None
+                raise PSEApiError(f"API returned status {response.status}", response.status, retry_after)
+            
+            data = await response.json()
+        
+        if "value" not in data:
+            _LOGGER.error("PSE API response missing 'value' field")
+            raise UpdateFailed("Invalid API response format")
+        return data, response.headers
+
+    async def _async_iter_pages(self, page: dict[str, Any]) -> AsyncIterator[list[dict]]:
+        """Yield the records of ``page`` and of every page its ``@odata.nextLink`` chain leads to.
+
+        Pages are requested one at a time as the consumer asks for them, so
+        only a single decoded page is held besides what the consumer keeps.
+        """
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+        pages = 1
+        while True:
+            yield page["value"]
+            next_link = page.get("@odata.nextLink")
+            if not next_link:
+                return
+            if pages >= API_MAX_PAGES:
+                _LOGGER.warning("Stopping after %d PSE API pages, more data is available", pages)
+                return
+            page, _ = await self._async_get_page(next_link, None, headers)
+            if page is None:
+                return
+            pages += 1
+
+    @callback
+    def _async_record_history(self, records: list[dict]) -> None:
+        if self.history is None or not records:
+            return
+        write = self.hass.async_add_executor_job(self._write_history, records)
+        self._history_writes.add(write)
+        write.add_done_callback(self._history_writes.discard)
+
+    def _write_history(self, records: list[dict]) -> None:
+        try:
+            self.history.write(records)
+        except sqlite3.Error as exception:
+            _LOGGER.warning("Could not write PSE prices to the history store: %s", exception)
+
+    async def async_compact_history(self, now: datetime | None = None) -> None:
+        """Apply the configured retention to the history store and compact it."""
+        if self.history is None:
+            return
+        retention_days = int(self._get_config_value(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS))
+        before = None
+        if retention_days > 0:
+            before = (dt_util.now().date() - timedelta(days=retention_days)).isoformat()
+        try:
+            removed = await self.hass.async_add_executor_job(self.history.compact, before)
+        except sqlite3.Error as exception:
+            _LOGGER.warning("Could not compact the PSE history store: %s", exception)
+            return
+        _LOGGER.debug("Compacted PSE history store, removed %d slots before %s", removed, before)
+
+    async def async_query_history(self, first: date, last: date) -> tuple[Any, Any]:
+        """Slot starts and prices stored for ``first``..``last``, read in the executor."""
+        return await self.hass.async_add_executor_job(self.history.columns, first, last)
+
+    async def async_get_price_slots(self, begin: datetime, end: datetime) -> tuple[array, array, array]:
+        """UTC starts, prices and non-negative prices of the slots starting from ``begin`` up to ``end``.
+
+        ``begin`` and ``end`` are naive local wall-clock. Dates held in memory
+        come from the current series; the rest are read from the history
+        store. Starts are UTC epochs so both passes of the repeated DST
+        fall-back hour stay apart.
+        """
+        zone = dt_util.DEFAULT_TIME_ZONE
+        first = to_timestamp(dt_util.as_utc(begin.replace(tzinfo=zone)))
+        last = to_timestamp(dt_util.as_utc(end.replace(tzinfo=zone)))
+        slots: dict[int, tuple[float, float]] = {}
+        series = self.data.get("series") if self.data else None
+        held_dates = set(series.date_offsets) if series is not None else set()
+
+        dates = {
+            (begin.date() + timedelta(days=offset)).isoformat()
+            for offset in range((end.date() - begin.date()).days + 1)
+        }
+        missing = sorted(dates - held_dates)
+        if missing and self.history is not None:
+            try:
+                starts, prices = await self.async_query_history(date.fromisoformat(missing[0]),
+                                                                date.fromisoformat(missing[-1]))
+            except sqlite3.Error as exception:
+                _LOGGER.warning("Could not read the PSE history store: %s", exception)
+            else:
+                for start, price in zip(starts, prices):
+                    slots[start] = (price, max(0.0, price))
+
+        if series is not None:
+            utc_starts = series.utc_starts(zone)
+            for index in range(bisect_left(utc_starts, first), bisect_left(utc_starts, last)):
+                slots[utc_starts[index]] = (series.prices[index], series.prices_neg_to_zero[index])
+
+        starts = array("q")
+        prices = array("d")
+        prices_neg_to_zero = array("d")
+        for start in sorted(slots):
+            if first <= start < last:
+                starts.append(start)
+                prices.append(slots[start][0])
+                prices_neg_to_zero.append(slots[start][1])
+        return starts, prices, prices_neg_to_zero
+
+    async def async_fetch_history(self, first: date, last: date) -> int:
+        """Write every record of ``first``..``last`` to the history store, one page at a time."""
+        params = {
+            "$select": API_SELECT,
+            "$filter": f"business_date ge '{first.isoformat()}' and business_date le '{last.isoformat()}'",
+            "$first": API_FIRST,
+        }
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+        if self.session is None:
+            self.session = async_get_clientsession(self.hass)
+
+        count = 0
+        seen: dict[int, int] = {}
+        async with async_timeout.timeout(HISTORY_CHUNK_TIMEOUT):
+            page, _ = await self._async_get_page(PSE_API_URL, params, headers)
+            if page is not None:
+                pages = self._async_iter_pages(page)
+                # Leave the first page to the iterator so it is freed with the others.
+                del page
+                async for records in pages:
+                    count += await self.hass.async_add_executor_job(self.history.write, records, seen)
+        _LOGGER.debug("Stored %d history records for %s..%s", count, first, last)
+        return count
 
     def _calculate_hourly_averages(self, raw_data: list[dict]) -> list[dict]:
         if not raw_data:
@@ -218,6 +751,9 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
         return processed_data
 
     async def async_close(self) -> None:
-        _LOGGER.debug("Closing PSE API session")
-        if self.session:
-            await self.session.close() 
\ No newline at end of file
+        self._cancel_boundary()
+        self.session = None
+        if self.history is not None:
+            if self._history_writes:
+                await asyncio.gather(*self._history_writes, return_exceptions=True)
+            await self.hass.async_add_executor_job(self.history.close)
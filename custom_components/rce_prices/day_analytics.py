@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from .price_calculator import PriceCalculator
+
+
+def _period_part(records: list[dict], position: int, part: int) -> str | None:
+    try:
+        return records[position]["period"].split(" - ")[part]
+    except (KeyError, IndexError, AttributeError):
+        return None
+
+
+class DayAnalytics:
+    """Statistics of one business date, computed once and read by every sensor."""
+
+    __slots__ = (
+        "count",
+        "average",
+        "median",
+        "minimum",
+        "maximum",
+        "min_records",
+        "max_records",
+        "argmin",
+        "argmax",
+        "min_start",
+        "min_end",
+        "max_start",
+        "max_end",
+    )
+
+    def __init__(self, data: list[dict], calculator: PriceCalculator = PriceCalculator) -> None:
+        prices = calculator.get_prices_from_data(data)
+        self.count = len(prices)
+        self.average = calculator.calculate_average(prices)
+        self.median = calculator.calculate_median(prices)
+        self.minimum = min(prices) if prices else None
+        self.maximum = max(prices) if prices else None
+
+        self.min_records = self._extreme_records(calculator, data, is_max=False)
+        self.max_records = self._extreme_records(calculator, data, is_max=True)
+        self.argmin = self._position(data, self.min_records)
+        self.argmax = self._position(data, self.max_records)
+
+        self.min_start = _period_part(self.min_records, 0, 0)
+        self.min_end = _period_part(self.min_records, -1, 1)
+        self.max_start = _period_part(self.max_records, 0, 0)
+        self.max_end = _period_part(self.max_records, -1, 1)
+
+    @staticmethod
+    def _extreme_records(calculator: PriceCalculator, data: list[dict], is_max: bool) -> list[dict]:
+        if not data:
+            return []
+        try:
+            return calculator.find_extreme_price_records(data, is_max=is_max)
+        except (KeyError, ValueError):
+            return []
+
+    @staticmethod
+    def _position(data: list[dict], records: list[dict]) -> int | None:
+        if not records:
+            return None
+        first = records[0]
+        return next((index for index, record in enumerate(data) if record is first), None)
+
+    @property
+    def min_range(self) -> str | None:
+        if self.min_start is None or self.min_end is None:
+            return None
+        return f"{self.min_start} - {self.min_end}"
+
+    @property
+    def max_range(self) -> str | None:
+        if self.max_start is None or self.max_end is None:
+            return None
+        return f"{self.max_start} - {self.max_end}"
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Expose the runtime counters of the coordinator for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "options": dict(entry.options),
+        "api": coordinator.breaker.as_dict(),
+        "window_cache": coordinator.window_cache.as_dict(),
+    }
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from array import array
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime, time, timedelta
+
+import aiohttp
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import BACKFILL_MAX_PARALLEL, BACKFILL_RETRIES, BACKFILL_RETRY_DELAY
+from .price_series import parse_dtime, to_timestamp, utc_offset
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS prices (
+        slot_start INTEGER NOT NULL,
+        utc_offset INTEGER NOT NULL,
+        business_date TEXT NOT NULL,
+        period TEXT,
+        price REAL NOT NULL,
+        publication_ts TEXT,
+        PRIMARY KEY (slot_start, utc_offset)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS prices_business_date ON prices (business_date)",
+)
+
+_UPSERT = """
+    INSERT INTO prices (slot_start, utc_offset, business_date, period, price, publication_ts)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (slot_start, utc_offset) DO UPDATE SET
+        business_date = excluded.business_date,
+        period = excluded.period,
+        price = excluded.price,
+        publication_ts = excluded.publication_ts
+    WHERE excluded.publication_ts IS NULL
+        OR prices.publication_ts IS NULL
+        OR excluded.publication_ts >= prices.publication_ts
+"""
+
+
+class PriceHistoryStore:
+    """Quarter-hour PSE prices in SQLite, keyed by the naive slot start epoch and its UTC offset.
+
+    The offset keeps both passes of the repeated hour on the DST fall-back
+    day. The table is clustered on the slot epoch, so date ranges are a
+    single primary-key range scan. Writes are upserts in WAL mode and never touch
+    the recorder database. Every method blocks; call them through
+    ``hass.async_add_executor_job``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                self._migrate(connection)
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Move rows of the table keyed on the slot start alone to the current schema."""
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(prices)")]
+        if not columns or "utc_offset" in columns:
+            return
+        _LOGGER.debug("Migrating the PSE history store to UTC offset keys")
+        connection.execute("DROP INDEX IF EXISTS prices_business_date")
+        connection.execute("ALTER TABLE prices RENAME TO prices_old")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        rows = connection.execute(
+            "SELECT slot_start, business_date, period, price, publication_ts FROM prices_old"
+        ).fetchall()
+        zone = dt_util.DEFAULT_TIME_ZONE
+        connection.executemany(_UPSERT, [(row[0], utc_offset(row[0], 0, zone), *row[1:]) for row in rows])
+        connection.execute("DROP TABLE prices_old")
+
+    def write(self, records: Iterable[dict], seen: dict[int, int] | None = None) -> int:
+        """Upsert API records, keeping the newer publication of a slot. Returns rows written.
+
+        The second record of a local slot start is the repeated fall-back
+        quarter-hour. Pass the same ``seen`` dict for every page of one
+        response so a pair split across pages is still told apart.
+        """
+        seen = {} if seen is None else seen
+        rows = []
+        for record in records:
+            try:
+                slot_start = parse_dtime(record["dtime"])
+                rows.append((
+                    slot_start,
+                    utc_offset(slot_start, min(seen.get(slot_start, 0), 1), dt_util.DEFAULT_TIME_ZONE),
+                    record["business_date"],
+                    record.get("period"),
+                    float(record["rce_pln"]),
+                    record.get("publication_ts"),
+                ))
+            except (ValueError, KeyError, TypeError) as e:
+                _LOGGER.debug("Skipping history record without usable dtime/price: %s, error: %s", record, e)
+                continue
+            seen[slot_start] = seen.get(slot_start, 0) + 1
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def date_counts(self, first: str, last: str) -> dict[str, int]:
+        """Stored slot count of every business date between ``first`` and ``last`` inclusive."""
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT business_date, COUNT(*) FROM prices WHERE business_date BETWEEN ? AND ? "
+                "GROUP BY business_date",
+                (first, last),
+            )
+            return dict(cursor.fetchall())
+
+    def columns(self, first: date, last: date) -> tuple[array, array]:
+        """UTC slot starts and prices of every stored slot from ``first`` to ``last`` inclusive."""
+        begin = to_timestamp(datetime.combine(first, time()))
+        end = to_timestamp(datetime.combine(last + timedelta(days=1), time()))
+        starts = array("q")
+        prices = array("d")
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT slot_start - utc_offset, price FROM prices WHERE slot_start >= ? AND slot_start < ? "
+                "ORDER BY slot_start, utc_offset DESC",
+                (begin, end),
+            )
+            for slot_start, price in cursor:
+                starts.append(slot_start)
+                prices.append(price)
+        return starts, prices
+
+    def compact(self, before: str | None) -> int:
+        """Drop business dates older than ``before``, reclaim their space and refresh index statistics."""
+        with self._lock:
+            connection = self._connect()
+            removed = 0
+            if before is not None:
+                with connection:
+                    removed = connection.execute("DELETE FROM prices WHERE business_date < ?", (before,)).rowcount
+            if removed:
+                connection.execute("VACUUM")
+            connection.execute("PRAGMA optimize")
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def plan_chunks(first: date, last: date, chunk_days: int,
+                complete_dates: set[str] | None = None) -> list[tuple[date, date]]:
+    """Split ``first``..``last`` into chunks, dropping chunks whose every date is complete."""
+    complete_dates = complete_dates or set()
+    chunks = []
+    start = first
+    while start <= last:
+        end = min(start + timedelta(days=chunk_days - 1), last)
+        days = (end - start).days + 1
+        if any(
+            (start + timedelta(days=offset)).strftime("%Y-%m-%d") not in complete_dates
+            for offset in range(days)
+        ):
+            chunks.append((start, end))
+        start = end + timedelta(days=1)
+    return chunks
+
+
+async def async_backfill(
+    fetch_chunk: Callable[[date, date], Awaitable[int]],
+    chunks: list[tuple[date, date]],
+    progress: Callable[[int, int, int], None] | None = None,
+    parallel: int = BACKFILL_MAX_PARALLEL,
+    retries: int = BACKFILL_RETRIES,
+) -> dict:
+    """Run ``fetch_chunk`` for every chunk, at most ``parallel`` at a time, retrying failures.
+
+    ``progress`` is called with (finished chunks, total chunks, records written)
+    after each chunk settles.
+    """
+    semaphore = asyncio.Semaphore(parallel)
+    total = len(chunks)
+    state = {"done": 0, "records": 0}
+    failed = []
+
+    async def run(first: date, last: date) -> None:
+        for attempt in range(retries):
+            try:
+                async with semaphore:
+                    count = await fetch_chunk(first, last)
+            except (UpdateFailed, aiohttp.ClientError, asyncio.TimeoutError) as exception:
+                if attempt + 1 < retries:
+                    _LOGGER.debug("Backfill of %s..%s failed (%s), retrying", first, last, exception)
+                    await asyncio.sleep(BACKFILL_RETRY_DELAY * 2 ** attempt)
+                    continue
+                _LOGGER.warning("Backfill of %s..%s failed after %d attempts: %s", first, last, retries, exception)
+                failed.append({"start": first.isoformat(), "end": last.isoformat(), "error": str(exception)})
+            else:
+                state["records"] += count
+            break
+        state["done"] += 1
+        if progress is not None:
+            progress(state["done"], total, state["records"])
+
+    await asyncio.gather(*(run(first, last) for first, last in chunks))
+    return {
+        "chunks": total,
+        "records": state["records"],
+        "failed": sorted(failed, key=lambda chunk: chunk["start"]),
+    }
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import heapq
 import statistics
-from datetime import datetime, timedelta
+
+from .const import WINDOW_OVERLAP_ANY, WINDOW_OVERLAP_DISTINCT_START_HOUR
+from .price_series import SLOT_SECONDS, PriceDay, from_timestamp, parse_dtime
+from .window_engine import WindowEngine
 
 class PriceCalculator:
     
     @staticmethod
     def get_prices_from_data(data: list[dict]) -> list[float]:
+        if isinstance(data, PriceDay):
+            return data.prices.tolist()
         return [float(record["rce_pln"]) for record in data]
     
     @staticmethod
@@ -50,6 +56,11 @@ class PriceCalculator:
         if not data:
             return []
         
+        if isinstance(data, PriceDay):
+            prices = data.prices
+            extreme_price = max(prices) if is_max else min(prices)
+            return [data[index] for index, price in enumerate(prices) if price == extreme_price]
+        
         prices = PriceCalculator.get_prices_from_data(data)
         extreme_price = max(prices) if is_max else min(prices)
         
@@ -60,6 +71,80 @@ class PriceCalculator:
         
         return sorted(extreme_records, key=lambda x: x["dtime"])
 
+    @staticmethod
+    def get_slot_starts(data: list[dict]) -> list[int | None]:
+        if isinstance(data, PriceDay):
+            return list(data.starts)
+        starts = []
+        for record in data:
+            try:
+                starts.append(parse_dtime(record["dtime"]))
+            except (ValueError, KeyError, TypeError):
+                starts.append(None)
+        return starts
+
+    @staticmethod
+    def get_slot_prices(data: list[dict]) -> list[float | None]:
+        if isinstance(data, PriceDay):
+            return list(data.prices)
+        prices = []
+        for record in data:
+            try:
+                prices.append(float(record["rce_pln"]))
+            except (ValueError, KeyError, TypeError):
+                prices.append(None)
+        return prices
+
+    @staticmethod
+    def is_hour_in_window(hour: int, window_start_hour: int, window_end_hour: int) -> bool:
+        if window_start_hour > window_end_hour:
+            return hour >= window_start_hour or hour < window_end_hour
+        return window_start_hour <= hour < window_end_hour
+
+    @staticmethod
+    def build_window_engine(data: list[dict], window_start_hour: int,
+                            window_end_hour: int) -> tuple[WindowEngine, list[int]]:
+        starts = PriceCalculator.get_slot_starts(data)
+        prices = PriceCalculator.get_slot_prices(data)
+
+        filtered = [
+            (start, index) for index, start in enumerate(starts)
+            if start is not None and PriceCalculator.is_hour_in_window(
+                (start % 86400) // 3600, window_start_hour, window_end_hour
+            )
+        ]
+        filtered.sort(key=lambda item: item[0])
+
+        engine = WindowEngine([start for start, _ in filtered], [prices[index] for _, index in filtered])
+        return engine, [index for _, index in filtered]
+
+    @staticmethod
+    def find_best_windows_by_duration(days: list[PriceDay], max_duration: int) -> list[dict]:
+        starts = [start for day in days for start in day.starts]
+        prices = [price for day in days for price in day.prices]
+        if not starts:
+            return []
+
+        engine = WindowEngine(starts, prices)
+
+        def describe(position: int | None, duration: int) -> dict | None:
+            if position is None:
+                return None
+            return {
+                "start": from_timestamp(starts[position]),
+                "end": from_timestamp(starts[position + duration - 1] + SLOT_SECONDS),
+                "average_price": round(engine.exact_average(position, duration), 2),
+            }
+
+        return [
+            {
+                "duration_minutes": duration * SLOT_SECONDS // 60,
+                "cheapest": describe(cheapest, duration),
+                "most_expensive": describe(most_expensive, duration),
+            }
+            for duration, cheapest, most_expensive in engine.best_by_duration(min(max_duration, len(engine)))
+        ]
+
     @staticmethod
     def find_optimal_window(data: list[dict], window_start_hour: int, window_end_hour: int, 
                           duration_hours: int, is_max: bool = False) -> list[dict]:
@@ -68,60 +153,45 @@ class PriceCalculator:
         
         duration_periods = int(duration_hours) * 4
         
-        filtered_data = []
-        for record in data:
-            try:
-                end_time = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                
-                start_time = end_time - timedelta(minutes=15)
-                
-                if start_time.hour >= window_start_hour and start_time.hour < window_end_hour:
-                    filtered_data.append(record)
-                    
-            except (ValueError, KeyError):
-                continue
-        
-        if len(filtered_data) < duration_periods:
+        engine, indices = PriceCalculator.build_window_engine(data, window_start_hour, window_end_hour)
+        if len(engine) < duration_periods:
             return []
         
-        filtered_data.sort(key=lambda x: x["dtime"])
-        
-        best_window = []
-        best_avg_price = None
-        
-        for i in range(len(filtered_data) - duration_periods + 1):
-            window = filtered_data[i:i + duration_periods]
-            
-            is_continuous = True
-            for j in range(len(window) - 1):
-                try:
-                    curr_time = datetime.strptime(window[j]["dtime"], "%Y-%m-%d %H:%M:%S")
-                    next_time = datetime.strptime(window[j + 1]["dtime"], "%Y-%m-%d %H:%M:%S")
-                    
-                    if next_time != curr_time + timedelta(minutes=15):
-                        is_continuous = False
-                        break
-                except (ValueError, KeyError):
-                    is_continuous = False
-                    break
-            
-            if not is_continuous:
-                continue
-            
-            try:
-                window_prices = [float(record["rce_pln"]) for record in window]
-                avg_price = sum(window_prices) / len(window_prices)
-                
-                if best_avg_price is None:
-                    best_window = window
-                    best_avg_price = avg_price
-                elif (is_max and avg_price > best_avg_price) or (not is_max and avg_price < best_avg_price):
-                    best_window = window
-                    best_avg_price = avg_price
-            except (ValueError, KeyError):
-                continue
+        position = engine.best(duration_periods, is_max)
+        if position is None:
+            return []
         
-        return best_window 
+        return [data[index] for index in indices[position:position + duration_periods]]
+
+    @staticmethod
+    def find_cheapest_slots(
+        data: list[dict],
+        window_start_hour: int,
+        window_end_hour: int,
+        slot_count: int,
+        is_max: bool = False,
+    ) -> list[dict]:
+        """Cheapest (or most expensive) ``slot_count`` slots, not necessarily contiguous, in time order.
+
+        Selection keeps a bounded heap, O(n log k); equal prices prefer the earlier slot.
+        """
+        if not data or slot_count <= 0:
+            return []
+
+        starts = PriceCalculator.get_slot_starts(data)
+        prices = PriceCalculator.get_slot_prices(data)
+        sign = -1.0 if is_max else 1.0
+
+        candidates = (
+            (sign * price, start, index)
+            for index, (start, price) in enumerate(zip(starts, prices))
+            if start is not None and price is not None and PriceCalculator.is_hour_in_window(
+                (start % 86400) // 3600, window_start_hour, window_end_hour
+            )
+        )
+        selected = heapq.nsmallest(int(slot_count), candidates)
+        selected.sort(key=lambda item: item[1])
+        return [data[index] for _, _, index in selected]
 
     @staticmethod
     def find_top_windows(
@@ -132,79 +202,30 @@ class PriceCalculator:
         top_n: int = 2,
         is_max: bool = True,
         distinct_start_hour: bool = True,
+        overlap: str | None = None,
+        min_gap_minutes: int = 0,
     ) -> list[list[dict]]:
         if not data or duration_hours <= 0 or top_n <= 0:
             return []
 
         duration_periods = int(duration_hours) * 4
-        filtered_data = []
-
-        for record in data:
-            try:
-                end_time = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                start_time = end_time - timedelta(minutes=15)
-
-                if start_time.hour >= window_start_hour and start_time.hour < window_end_hour:
-                    filtered_data.append(record)
-            except (ValueError, KeyError):
-                continue
 
-        if len(filtered_data) < duration_periods:
+        engine, indices = PriceCalculator.build_window_engine(data, window_start_hour, window_end_hour)
+        if len(engine) < duration_periods:
             return []
 
-        filtered_data.sort(key=lambda x: x["dtime"])
-
-        candidates: list[tuple[float, datetime, list[dict]]] = []
-
-        for i in range(len(filtered_data) - duration_periods + 1):
-            window = filtered_data[i:i + duration_periods]
-
-            is_continuous = True
-            for j in range(len(window) - 1):
-                try:
-                    curr_time = datetime.strptime(window[j]["dtime"], "%Y-%m-%d %H:%M:%S")
-                    next_time = datetime.strptime(window[j + 1]["dtime"], "%Y-%m-%d %H:%M:%S")
-
-                    if next_time != curr_time + timedelta(minutes=15):
-                        is_continuous = False
-                        break
-                except (ValueError, KeyError):
-                    is_continuous = False
-                    break
-
-            if not is_continuous:
-                continue
-
-            try:
-                window_start = datetime.strptime(window[0]["dtime"], "%Y-%m-%d %H:%M:%S") - timedelta(minutes=15)
-                if window_start.minute != 0:
-                    continue
-
-                window_prices = [float(record["rce_pln"]) for record in window]
-                avg_price = sum(window_prices) / len(window_prices)
-            except (ValueError, KeyError):
-                continue
-
-            candidates.append((avg_price, window_start, window))
+        candidates = [
+            position for position in engine.window_starts(duration_periods)
+            if engine.starts[position] % 3600 == 0
+        ]
 
         if not candidates:
             return []
 
-        candidates.sort(key=lambda item: item[0], reverse=is_max)
+        if overlap is None:
+            overlap = WINDOW_OVERLAP_DISTINCT_START_HOUR if distinct_start_hour else WINDOW_OVERLAP_ANY
 
-        results = []
-        used_hours = set()
-
-        for _, window_start, window in candidates:
-            start_hour = window_start.hour
-
-            if distinct_start_hour and start_hour in used_hours:
-                continue
-
-            results.append(window)
-            used_hours.add(start_hour)
-
-            if len(results) >= top_n:
-                break
-
-        return results
\ No newline at end of file
+        return [
+            [data[index] for index in indices[position:position + duration_periods]]
+            for position in engine.top(duration_periods, is_max, candidates, top_n, overlap, min_gap_minutes)
+        ]
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import logging
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, tzinfo
+
+_LOGGER = logging.getLogger(__name__)
+
+SLOT_SECONDS = 900
+SLOTS_PER_DAY = 96
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+def parse_dtime(value: str) -> int:
+    """Return the slot start of a PSE ``dtime`` (period end) as naive epoch seconds."""
+    return (datetime.fromisoformat(value) - _EPOCH) // _SECOND - SLOT_SECONDS
+
+
+def to_timestamp(moment: datetime) -> int:
+    return (moment.replace(tzinfo=None) - _EPOCH) // _SECOND
+
+
+def from_timestamp(timestamp: int) -> datetime:
+    return _EPOCH + timedelta(seconds=timestamp)
+
+
+def utc_offset(timestamp: int, fold: int, zone: tzinfo) -> int:
+    """UTC offset in seconds of a naive local epoch in ``zone``; ``fold`` 1 picks the repeated fall-back hour."""
+    return int(from_timestamp(timestamp).replace(tzinfo=zone, fold=fold).utcoffset().total_seconds())
+
+
+def next_slot_boundary(moment: datetime) -> datetime:
+    """First quarter-hour boundary strictly after ``moment``, keeping its tzinfo."""
+    floored = moment.replace(minute=moment.minute - moment.minute % 15, second=0, microsecond=0)
+    return floored + timedelta(seconds=SLOT_SECONDS)
+
+
+def hourly_means(starts: array, *columns: array) -> tuple[array, ...]:
+    """Hour starts of ``starts`` and the mean of every column over each hour."""
+    hours = array("q")
+    means = tuple(array("d") for _ in columns)
+    first = 0
+    while first < len(starts):
+        hour = starts[first] - starts[first] % 3600
+        end = first
+        while end < len(starts) and starts[end] - starts[end] % 3600 == hour:
+            end += 1
+        hours.append(hour)
+        for column, mean in zip(columns, means):
+            mean.append(sum(column[first:end]) / (end - first))
+        first = end
+    return (hours, *means)
+
+
+class PriceDay(list):
+    """Records of one business date, carrying the matching columnar slices.
+
+    Horizon views spanning several dates use ``business_date=None``.
+    """
+
+    __slots__ = ("series", "business_date", "offset", "starts", "prices", "prices_neg_to_zero")
+
+    def __init__(self, series: PriceSeries, business_date: str | None, offset: int, end: int) -> None:
+        super().__init__(series.records[offset:end])
+        self.series = series
+        self.business_date = business_date
+        self.offset = offset
+        self.starts = series.starts[offset:end]
+        self.prices = series.prices[offset:end]
+        self.prices_neg_to_zero = series.prices_neg_to_zero[offset:end]
+
+
+class PriceSeries:
+    """Immutable columnar view of the processed PSE records, built once per fetch."""
+
+    __slots__ = (
+        "source",
+        "records",
+        "starts",
+        "prices",
+        "prices_neg_to_zero",
+        "date_offsets",
+        "fingerprint",
+        "_positions",
+        "_slots",
+        "_days",
+        "cache",
+    )
+
+    def __init__(self, source: list[dict], records: list[dict], starts: array,
+                 prices: array, prices_neg_to_zero: array,
+                 date_offsets: dict[str, tuple[int, int]]) -> None:
+        self.source = source
+        self.records = records
+        self.starts = starts
+        self.prices = prices
+        self.prices_neg_to_zero = prices_neg_to_zero
+        self.date_offsets = date_offsets
+        self.fingerprint = hash((starts.tobytes(), prices.tobytes()))
+        self._positions = {id(record): index for index, record in enumerate(records)}
+        # Slot number = days since epoch * 96 + quarter-hour of the local day.
+        self._slots: dict[int, int] = {}
+        for index, start in enumerate(starts):
+            self._slots.setdefault(start // SLOT_SECONDS, index)
+        self._days: dict[str, PriceDay] = {}
+        # Values derived from this series; dropped together with it on the next update.
+        self.cache: dict = {}
+
+    @classmethod
+    def from_records(cls, records: list[dict] | None) -> PriceSeries:
+        rows = []
+        for record in records or []:
+            try:
+                start = parse_dtime(record["dtime"])
+                price = float(record["rce_pln"])
+                business_date = record["business_date"]
+            except (ValueError, KeyError, TypeError) as e:
+                _LOGGER.debug("Skipping record without usable dtime/price: %s, error: %s", record, e)
+                continue
+            neg_to_zero = record.get("rce_pln_neg_to_zero")
+            try:
+                neg_to_zero = float(neg_to_zero) if neg_to_zero is not None else max(0.0, price)
+            except (ValueError, TypeError):
+                neg_to_zero = max(0.0, price)
+            rows.append((business_date, start, price, neg_to_zero, record))
+
+        rows.sort(key=lambda row: (row[0], row[1]))
+
+        starts = array("q")
+        prices = array("d")
+        prices_neg_to_zero = array("d")
+        ordered = []
+        date_offsets: dict[str, tuple[int, int]] = {}
+
+        for index, (business_date, start, price, neg_to_zero, record) in enumerate(rows):
+            starts.append(start)
+            prices.append(price)
+            prices_neg_to_zero.append(neg_to_zero)
+            ordered.append(record)
+            first, _ = date_offsets.get(business_date, (index, index))
+            date_offsets[business_date] = (first, index + 1)
+
+        return cls(records, ordered, starts, prices, prices_neg_to_zero, date_offsets)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def day(self, business_date: str) -> PriceDay | None:
+        day = self._days.get(business_date)
+        if day is None:
+            bounds = self.date_offsets.get(business_date)
+            if bounds is None:
+                return None
+            day = PriceDay(self, business_date, *bounds)
+            self._days[business_date] = day
+        return day
+
+    def day_slots(self, business_date: str) -> tuple[array, array] | None:
+        """Prices of a date by quarter-hour (96) and mean prices by hour (24); NaN where missing.
+
+        Built once per series so that slot sensors read their value by index.
+        """
+        key = ("day_slots", business_date)
+        slots = self.cache.get(key)
+        if slots is not None:
+            return slots
+        day = self.day(business_date)
+        if day is None:
+            return None
+        quarters = array("d", [math.nan]) * SLOTS_PER_DAY
+        sums = [0.0] * 24
+        counts = [0] * 24
+        midnight = to_timestamp(datetime.fromisoformat(business_date))
+        for start, price in zip(day.starts, day.prices):
+            quarter = (start - midnight) // SLOT_SECONDS
+            if not 0 <= quarter < SLOTS_PER_DAY:
+                continue
+            if math.isnan(quarters[quarter]):
+                quarters[quarter] = price
+            sums[quarter // 4] += price
+            counts[quarter // 4] += 1
+        hours = array("d", (total / count if count else math.nan for total, count in zip(sums, counts)))
+        slots = self.cache[key] = (quarters, hours)
+        return slots
+
+    def utc_starts(self, zone: tzinfo) -> array:
+        """Slot starts as UTC epochs; the second pass of a repeated local start is the later fold."""
+        key = ("utc_starts", zone)
+        starts = self.cache.get(key)
+        if starts is not None:
+            return starts
+        starts = array("q")
+        seen: set[int] = set()
+        for start in self.starts:
+            starts.append(start - utc_offset(start, 1 if start in seen else 0, zone))
+            seen.add(start)
+        self.cache[key] = starts
+        return starts
+
+    def horizon(self, moment: datetime, hours: int) -> PriceDay:
+        """Slots from the one running at ``moment`` up to ``hours`` ahead, across dates."""
+        timestamp = to_timestamp(moment)
+        first = bisect_right(self.starts, timestamp - SLOT_SECONDS)
+        end = max(first, bisect_left(self.starts, timestamp + hours * 3600))
+        key = ("horizon", first, end)
+        view = self.cache.get(key)
+        if view is None:
+            view = self.cache[key] = PriceDay(self, None, first, end)
+        return view
+
+    def position(self, record: dict) -> int | None:
+        return self._positions.get(id(record))
+
+    def index_for_slot(self, slot_date: date, quarter: int) -> int | None:
+        if not 0 <= quarter < SLOTS_PER_DAY:
+            return None
+        return self._slots.get((slot_date.toordinal() - _EPOCH_ORDINAL) * SLOTS_PER_DAY + quarter)
+
+    def index_at(self, moment: datetime) -> int | None:
+        return self._slots.get(to_timestamp(moment) // SLOT_SECONDS)
+
+    def index_ended_before(self, moment: datetime) -> int | None:
+        """Latest slot that ended at or before ``moment``; used to bridge gaps."""
+        index = bisect_right(self.starts, to_timestamp(moment) - SLOT_SECONDS) - 1
+        return index if index >= 0 else None
+
+    def slot_start(self, index: int) -> datetime:
+        return from_timestamp(self.starts[index])
+
+    def slot_end(self, index: int) -> datetime:
+        return from_timestamp(self.starts[index] + SLOT_SECONDS)
@@ -4,6 +4,8 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
@@ -12,13 +14,16 @@ from .const import (
     DEFAULT_PRICE_SLOT_SENSORS,
     PRICE_SLOT_SENSORS_HOURLY,
     PRICE_SLOT_SENSORS_QUARTER,
+    SIGNAL_OPTIONS_UPDATED,
 )
+from .coordinator import RCEPSEDataUpdateCoordinator
 from .sensors import (
     RCETodayHourPriceSensor,
     RCETomorrowHourPriceSensor,
     RCETodayQuarterPriceSensor,
     RCETomorrowQuarterPriceSensor,
     RCEOptimalBuyThresholdSensor,
+    RCEApiStatusSensor,
     RCETodayMainSensor,
     RCETodayKwhPriceSensor,
     RCENextHourPriceSensor,
@@ -78,6 +83,7 @@ from .sensors.custom_windows import (
     RCETomorrowExpensiveWindowStartSensor,
     RCETomorrowExpensiveWindowEndSensor,
     RCETomorrowExpensiveWindowRangeSensor,
+    RCETodayCheapestSlotsSensor,
     RCETodayCheapestWindowStartTimestampSensor,
     RCETodayCheapestWindowEndTimestampSensor,
     RCETodayExpensiveWindowStartTimestampSensor,
@@ -157,6 +163,7 @@ async def async_setup_entry(
         RCETomorrowExpensiveWindowStartSensor(coordinator, config_entry),
         RCETomorrowExpensiveWindowEndSensor(coordinator, config_entry),
         RCETomorrowExpensiveWindowRangeSensor(coordinator, config_entry),
+        RCETodayCheapestSlotsSensor(coordinator, config_entry),
         RCETodayCheapestWindowStartTimestampSensor(coordinator, config_entry),
         RCETodayCheapestWindowEndTimestampSensor(coordinator, config_entry),
         RCETodayExpensiveWindowStartTimestampSensor(coordinator, config_entry),
@@ -168,24 +175,56 @@ async def async_setup_entry(
     ]
 
     sensors.append(RCEOptimalBuyThresholdSensor(coordinator, config_entry))
+    sensors.append(RCEApiStatusSensor(coordinator))
 
     options = config_entry.options if config_entry.options else config_entry.data
     slot_mode = options.get(CONF_PRICE_SLOT_SENSORS, DEFAULT_PRICE_SLOT_SENSORS)
+    slot_sensors = {"mode": slot_mode, "entities": _build_slot_sensors(coordinator, slot_mode)}
+    sensors.extend(slot_sensors["entities"])
 
-    if slot_mode == PRICE_SLOT_SENSORS_HOURLY:
-        _LOGGER.debug("Price slot sensors mode: hourly - adding 48 sensors (24 today + 24 tomorrow)")
-        for hour in range(24):
-            sensors.append(RCETodayHourPriceSensor(coordinator, hour))
-            sensors.append(RCETomorrowHourPriceSensor(coordinator, hour))
-    elif slot_mode == PRICE_SLOT_SENSORS_QUARTER:
-        _LOGGER.debug("Price slot sensors mode: quarter_hourly - adding 192 sensors (96 today + 96 tomorrow)")
-        for hour in range(24):
-            for minute in (0, 15, 30, 45):
-                sensors.append(RCETodayQuarterPriceSensor(coordinator, hour, minute))
-                sensors.append(RCETomorrowQuarterPriceSensor(coordinator, hour, minute))
-    else:
-        _LOGGER.debug("Price slot sensors mode: none - skipping slot sensors")
+    async def async_apply_options() -> None:
+        options = config_entry.options if config_entry.options else config_entry.data
+        slot_mode = options.get(CONF_PRICE_SLOT_SENSORS, DEFAULT_PRICE_SLOT_SENSORS)
+        if slot_mode == slot_sensors["mode"]:
+            return
+        _LOGGER.debug("Price slot sensors mode changed from %s to %s", slot_sensors["mode"], slot_mode)
+        registry = er.async_get(hass)
+        for entity in slot_sensors["entities"]:
+            await entity.async_remove(force_remove=True)
+            # Dropped slot sensors would otherwise linger as orphaned registry entries.
+            if entity_id := registry.async_get_entity_id("sensor", DOMAIN, entity.unique_id):
+                registry.async_remove(entity_id)
+        slot_sensors["mode"] = slot_mode
+        slot_sensors["entities"] = _build_slot_sensors(coordinator, slot_mode)
+        async_add_entities(slot_sensors["entities"])
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id), async_apply_options)
+    )
 
     _LOGGER.debug("Adding %d RCE Prices sensors to Home Assistant", len(sensors))
     async_add_entities(sensors)
-    _LOGGER.debug("RCE Prices sensors setup completed successfully") 
\ No newline at end of file
+    _LOGGER.debug("RCE Prices sensors setup completed successfully")
+
+
+def _build_slot_sensors(coordinator: RCEPSEDataUpdateCoordinator, slot_mode: str) -> list:
+    if slot_mode == PRICE_SLOT_SENSORS_HOURLY:
+        _LOGGER.debug("Price slot sensors mode: hourly - adding 48 sensors (24 today + 24 tomorrow)")
+        return [
+            sensor
+            for hour in range(24)
+            for sensor in (RCETodayHourPriceSensor(coordinator, hour), RCETomorrowHourPriceSensor(coordinator, hour))
+        ]
+    if slot_mode == PRICE_SLOT_SENSORS_QUARTER:
+        _LOGGER.debug("Price slot sensors mode: quarter_hourly - adding 192 sensors (96 today + 96 tomorrow)")
+        return [
+            sensor
+            for hour in range(24)
+            for minute in (0, 15, 30, 45)
+            for sensor in (
+                RCETodayQuarterPriceSensor(coordinator, hour, minute),
+                RCETomorrowQuarterPriceSensor(coordinator, hour, minute),
+            )
+        ]
+    _LOGGER.debug("Price slot sensors mode: none - skipping slot sensors")
+    return []
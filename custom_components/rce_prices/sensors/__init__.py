@@ -60,6 +60,7 @@ from .tomorrow_hourly import RCETomorrowHourPriceSensor
 from .today_quarter import RCETodayQuarterPriceSensor
 from .tomorrow_quarter import RCETomorrowQuarterPriceSensor
 from .energy_optimizer_sensor import RCEOptimalBuyThresholdSensor
+from .api_status import RCEApiStatusSensor
 
 __all__ = [
     "RCEBaseSensor",
@@ -113,4 +114,5 @@ __all__ = [
     "RCETodayQuarterPriceSensor",
     "RCETomorrowQuarterPriceSensor",
     "RCEOptimalBuyThresholdSensor",
+    "RCEApiStatusSensor",
 ] 
\ No newline at end of file
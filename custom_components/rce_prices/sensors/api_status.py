@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import EntityCategory
+
+from .base import RCEBaseSensor
+from ..const import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+
+if TYPE_CHECKING:
+    from ..coordinator import RCEPSEDataUpdateCoordinator
+
+
+class RCEApiStatusSensor(RCEBaseSensor):
+    """Diagnostic view of the PSE API retry backoff and circuit breaker."""
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
+        super().__init__(coordinator, "api_status")
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = [CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN]
+        self._attr_icon = "mdi:api"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_health_listener(self._async_write_state_if_changed))
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> str:
+        return self.coordinator.breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        attributes = self.coordinator.breaker.as_dict()
+        attributes.pop("state")
+        return attributes
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import math
+from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.util import dt as dt_util
 
+from ..const import CONF_PRICE_ATTRIBUTE_FORMAT, DEFAULT_PRICE_ATTRIBUTE_FORMAT, PRICE_ATTRIBUTE_FORMAT_COMPACT
 from ..shared_base import RCEBaseCommonEntity
 from ..price_calculator import PriceCalculator
+from ..price_series import PriceDay, from_timestamp
 
 if TYPE_CHECKING:
     from ..coordinator import RCEPSEDataUpdateCoordinator
@@ -18,6 +21,67 @@ class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
         super().__init__(coordinator, unique_id)
 
+    def get_price_attributes(self, day_data: list[dict]) -> list[dict] | dict[str, list]:
+        """The ``prices`` attribute of a day, built once per data version and format.
+
+        ``records`` lists the API records; ``compact`` holds parallel
+        ``start``/``price`` arrays.
+        """
+        attribute_format = self.coordinator.get_config_value(
+            CONF_PRICE_ATTRIBUTE_FORMAT, DEFAULT_PRICE_ATTRIBUTE_FORMAT
+        )
+        compact = attribute_format == PRICE_ATTRIBUTE_FORMAT_COMPACT
+        if not isinstance(day_data, PriceDay) or day_data.business_date is None:
+            return self._build_price_attributes(day_data, compact)
+        key = ("price_attributes", day_data.business_date, compact)
+        attributes = day_data.series.cache.get(key)
+        if attributes is None:
+            attributes = day_data.series.cache[key] = self._build_price_attributes(day_data, compact)
+        return attributes
+
+    def _build_price_attributes(self, day_data: list[dict], compact: bool) -> list[dict] | dict[str, list]:
+        if not compact:
+            excluded_keys = {"rce_pln_neg_to_zero", "publication_ts"}
+            return [
+                {k: v for k, v in record.items() if k not in excluded_keys}
+                for record in day_data
+            ]
+        if isinstance(day_data, PriceDay):
+            starts = [from_timestamp(start) for start in day_data.starts]
+            prices = day_data.prices
+        else:
+            starts = [self.get_record_bounds(record)[0] for record in day_data]
+            prices = [float(record["rce_pln"]) for record in day_data]
+        return {
+            "start": [start.strftime("%H:%M") for start in starts],
+            "price": [round(price, 2) for price in prices],
+        }
+
+    def get_slot_price(self, day_data: list[dict], hour: int, minute: int | None = None) -> float | None:
+        """Price of a quarter-hour of ``day_data``, or the mean of its hour when ``minute`` is None."""
+        if not day_data:
+            return None
+
+        if isinstance(day_data, PriceDay) and day_data.business_date is not None:
+            quarters, hours = day_data.series.day_slots(day_data.business_date)
+            price = hours[hour] if minute is None else quarters[hour * 4 + minute // 15]
+            return None if math.isnan(price) else round(price, 2)
+
+        prices = []
+        for record in day_data:
+            try:
+                period_start = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S") - timedelta(minutes=15)
+                if period_start.hour == hour and (minute is None or period_start.minute == minute):
+                    prices.append(float(record["rce_pln"]))
+            except (ValueError, KeyError):
+                continue
+
+        if not prices:
+            return None
+        if minute is not None:
+            return round(prices[0], 2)
+        return round(sum(prices) / len(prices), 2)
+
     def get_tomorrow_price_at_time(self, target_time: datetime) -> dict | None:
         tomorrow_data = self.get_tomorrow_data()
         if not tomorrow_data:
@@ -26,6 +90,14 @@ class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
         target_hour = target_time.hour
         target_minute = (target_time.minute // 15) * 15
         
+        if isinstance(tomorrow_data, PriceDay):
+            index = tomorrow_data.series.index_for_slot(
+                date.fromisoformat(tomorrow_data.business_date), target_hour * 4 + target_minute // 15
+            )
+            if index is None or not 0 <= index - tomorrow_data.offset < len(tomorrow_data):
+                return None
+            return tomorrow_data[index - tomorrow_data.offset]
+        
         for record in tomorrow_data:
             try:
                 period_start = record["period"].split(" - ")[0]
@@ -39,80 +111,42 @@ class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
         return None
 
     def get_current_price_data(self) -> dict | None:
-        if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
+        series = self.get_price_series()
+        if series is None:
             return None
         
-        now = dt_util.now()
-        
-        for record in self.coordinator.data["raw_data"]:
-            try:
-                period_end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                period_start = period_end - timedelta(minutes=15)
-                
-                if period_start <= now.replace(tzinfo=None) <= period_end:
-                    return record
-                    
-            except (ValueError, KeyError):
-                continue
-        
-        return None
+        index = series.index_at(dt_util.now())
+        return series.records[index] if index is not None else None
 
     def get_price_at_future_hour(self, hours_ahead: int) -> float | None:
-        if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
+        series = self.get_price_series()
+        if series is None:
             return None
         
-        target_time = dt_util.now() + timedelta(hours=hours_ahead)
-        
-        for record in self.coordinator.data["raw_data"]:
-            try:
-                period_end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                period_start = period_end - timedelta(minutes=15)
-                
-                if period_start <= target_time.replace(tzinfo=None) <= period_end:
-                    return float(record["rce_pln"])
-                    
-            except (ValueError, KeyError):
-                continue
-        
-        return None
+        index = series.index_at(dt_util.now() + timedelta(hours=hours_ahead))
+        return series.prices[index] if index is not None else None
 
     def get_price_at_past_hour(self, hours_back: int) -> float | None:
-        if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
+        series = self.get_price_series()
+        if series is None:
             return None
         
         target_time = dt_util.now() - timedelta(hours=hours_back)
-        closest_record = None
-        closest_diff = None
-        
-        for record in self.coordinator.data["raw_data"]:
-            try:
-                period_end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                period_start = period_end - timedelta(minutes=15)
-                
-                if period_start <= target_time.replace(tzinfo=None) <= period_end:
-                    return float(record["rce_pln"])
-                elif period_end <= target_time.replace(tzinfo=None):
-                    diff = abs((target_time.replace(tzinfo=None) - period_end).total_seconds())
-                    if closest_diff is None or diff < closest_diff:
-                        closest_diff = diff
-                        closest_record = record
-            except (ValueError, KeyError):
-                continue
-        
-        return float(closest_record["rce_pln"]) if closest_record else None
+        index = series.index_at(target_time)
+        if index is None:
+            index = series.index_ended_before(target_time)
+        return series.prices[index] if index is not None else None
 
     def get_data_summary(self, data: list[dict]) -> dict[str, any]:
         if not data:
             return {}
         
-        prices = self.calculator.get_prices_from_data(data)
+        analytics = self.get_day_analytics(data)
         return {
-            "count": len(prices),
-            "average": round(self.calculator.calculate_average(prices), 2),
-            "median": round(self.calculator.calculate_median(prices), 2),
-            "min": min(prices),
-            "max": max(prices),
-            "range": max(prices) - min(prices),
+            "count": analytics.count,
+            "average": round(analytics.average, 2),
+            "median": round(analytics.median, 2),
+            "min": analytics.minimum,
+            "max": analytics.maximum,
+            "range": analytics.maximum - analytics.minimum,
         }
-
- 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.util import dt as dt_util
@@ -27,22 +28,6 @@ class RCECustomWindowSensor(RCEBaseSensor):
         super().__init__(coordinator, sensor_type)
         self.config_entry = config_entry
 
-    def get_config_value(self, key: str, default: any) -> any:
-        value = None
-        if self.config_entry.options and key in self.config_entry.options:
-            value = self.config_entry.options[key]
-        else:
-            value = self.config_entry.data.get(key, default)
-        
-        if key in [
-            CONF_CHEAPEST_TIME_WINDOW_START, CONF_CHEAPEST_TIME_WINDOW_END,
-            CONF_CHEAPEST_WINDOW_DURATION_HOURS, CONF_EXPENSIVE_TIME_WINDOW_START,
-            CONF_EXPENSIVE_TIME_WINDOW_END, CONF_EXPENSIVE_WINDOW_DURATION_HOURS
-        ]:
-            return int(value)
-        
-        return value
-
 
 class RCETodayCheapestWindowStartSensor(RCECustomWindowSensor):
 
@@ -51,7 +36,7 @@ class RCETodayCheapestWindowStartSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> str | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -59,7 +44,7 @@ class RCETodayCheapestWindowStartSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -81,7 +66,7 @@ class RCETodayCheapestWindowEndSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> str | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -89,7 +74,7 @@ class RCETodayCheapestWindowEndSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -111,7 +96,7 @@ class RCETodayCheapestWindowRangeSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> str | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -119,7 +104,7 @@ class RCETodayCheapestWindowRangeSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -144,7 +129,7 @@ class RCETodayExpensiveWindowStartSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> str | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
 
@@ -152,7 +137,7 @@ class RCETodayExpensiveWindowStartSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -174,7 +159,7 @@ class RCETodayExpensiveWindowEndSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> str | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -182,7 +167,7 @@ class RCETodayExpensiveWindowEndSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -204,7 +189,7 @@ class RCETodayExpensiveWindowRangeSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> str | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -212,7 +197,7 @@ class RCETodayExpensiveWindowRangeSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -245,7 +230,7 @@ class RCETomorrowCheapestWindowStartSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -275,7 +260,7 @@ class RCETomorrowCheapestWindowEndSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -305,7 +290,7 @@ class RCETomorrowCheapestWindowRangeSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
             
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -338,7 +323,7 @@ class RCETomorrowExpensiveWindowStartSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -368,7 +353,7 @@ class RCETomorrowExpensiveWindowEndSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -398,7 +383,7 @@ class RCETomorrowExpensiveWindowRangeSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -416,6 +401,43 @@ class RCETomorrowExpensiveWindowRangeSensor(RCECustomWindowSensor):
             return None
 
 
+class RCETodayCheapestSlotsSensor(RCECustomWindowSensor):
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_cheapest_slots")
+        self._attr_native_unit_of_measurement = "PLN/MWh"
+        self._attr_icon = "mdi:format-list-checks"
+
+    @property
+    def native_value(self) -> float | None:
+        slots = self.get_cheapest_slots()
+        if not slots:
+            return None
+        
+        prices = self.calculator.get_prices_from_data(slots)
+        return round(self.calculator.calculate_average(prices), 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        slots = self.get_cheapest_slots()
+        if not slots:
+            return None
+        
+        selected = []
+        for record in slots:
+            try:
+                start, end = self.get_record_bounds(record)
+                selected.append({
+                    "start": dt_util.as_local(start).isoformat(),
+                    "end": dt_util.as_local(end).isoformat(),
+                    "price": float(record["rce_pln"]),
+                })
+            except (ValueError, KeyError, TypeError):
+                continue
+        
+        return {"slot_count": len(selected), "slots": selected}
+
+
 class RCETodayCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
@@ -425,7 +447,7 @@ class RCETodayCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> datetime | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -433,13 +455,17 @@ class RCETodayCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=False
         )
         
         if not optimal_window:
             return None
         
+        if self.is_horizon_mode():
+            window_start, _ = self.get_record_bounds(optimal_window[0])
+            return dt_util.as_local(window_start)
+        
         try:
             start_time_str = optimal_window[0]["period"].split(" - ")[0]
             today_str = dt_util.now().strftime("%Y-%m-%d")
@@ -459,7 +485,7 @@ class RCETodayCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> datetime | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -467,13 +493,17 @@ class RCETodayCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=False
         )
         
         if not optimal_window:
             return None
         
+        if self.is_horizon_mode():
+            _, window_end = self.get_record_bounds(optimal_window[-1])
+            return dt_util.as_local(window_end)
+        
         try:
             end_time_str = optimal_window[-1]["period"].split(" - ")[1]
             today_str = dt_util.now().strftime("%Y-%m-%d")
@@ -493,7 +523,7 @@ class RCETodayExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> datetime | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
 
@@ -501,13 +531,17 @@ class RCETodayExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=True
         )
         
         if not optimal_window:
             return None
         
+        if self.is_horizon_mode():
+            window_start, _ = self.get_record_bounds(optimal_window[0])
+            return dt_util.as_local(window_start)
+        
         try:
             start_time_str = optimal_window[0]["period"].split(" - ")[0]
             today_str = dt_util.now().strftime("%Y-%m-%d")
@@ -528,7 +562,7 @@ class RCETodayExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
 
     @property
     def native_value(self) -> datetime | None:
-        today_data = self.get_today_data()
+        today_data = self.get_window_data()
         if not today_data:
             return None
         
@@ -536,13 +570,17 @@ class RCETodayExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             today_data, start_hour, end_hour, duration, is_max=True
         )
         
         if not optimal_window:
             return None
         
+        if self.is_horizon_mode():
+            _, window_end = self.get_record_bounds(optimal_window[-1])
+            return dt_util.as_local(window_end)
+        
         try:
             end_time_str = optimal_window[-1]["period"].split(" - ")[1]
             today_str = dt_util.now().strftime("%Y-%m-%d")
@@ -570,7 +608,7 @@ class RCETomorrowCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -605,7 +643,7 @@ class RCETomorrowCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=False
         )
         
@@ -639,7 +677,7 @@ class RCETomorrowExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=True
         )
         
@@ -674,7 +712,7 @@ class RCETomorrowExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
         end_hour = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
         
-        optimal_window = self.calculator.find_optimal_window(
+        optimal_window = self.find_optimal_window(
             tomorrow_data, start_hour, end_hour, duration, is_max=True
         )
         
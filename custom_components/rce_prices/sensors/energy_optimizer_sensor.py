@@ -22,6 +22,7 @@ from ..const import (
     DEFAULT_BATTERY_CAPACITY_KWH,
     PV_START_HOUR,
     PV_END_HOUR,
+    STATE_REFRESH_SLOT,
 )
 from ..energy_optimizer import calculate_optimal_buy_threshold
 
@@ -34,6 +35,8 @@ _LOGGER = logging.getLogger(__name__)
 class RCEOptimalBuyThresholdSensor(RCEBaseSensor):
     """Sensor exposing the optimal buy price threshold for battery charging."""
 
+    state_refresh = STATE_REFRESH_SLOT
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, "optimal_buy_threshold")
         self._config_entry = config_entry
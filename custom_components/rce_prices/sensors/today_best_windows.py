@@ -13,6 +13,7 @@ from ..const import (
     EVENING_BEST_WINDOW_START_HOUR,
     MORNING_BEST_WINDOW_END_HOUR,
     MORNING_BEST_WINDOW_START_HOUR,
+    WINDOW_OVERLAP_DISTINCT_START_HOUR,
 )
 
 if TYPE_CHECKING:
@@ -41,14 +42,14 @@ class RCETodayBestWindowSensor(RCEBaseSensor):
         if not today_data:
             return None
 
-        windows = self.calculator.find_top_windows(
+        windows = self.find_top_windows(
             today_data,
             self._window_start_hour,
             self._window_end_hour,
             BEST_WINDOW_DURATION_HOURS,
             top_n=self._window_rank + 1,
             is_max=True,
-            distinct_start_hour=True,
+            overlap=WINDOW_OVERLAP_DISTINCT_START_HOUR,
         )
 
         if len(windows) <= self._window_rank:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
 from .base import RCEBaseSensor
@@ -22,21 +21,4 @@ class RCETodayHourPriceSensor(RCEBaseSensor):
 
     @property
     def native_value(self) -> float | None:
-        today_data = self.get_today_data()
-        if not today_data:
-            return None
-
-        prices = []
-        for record in today_data:
-            try:
-                period_end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                period_start = period_end - timedelta(minutes=15)
-                if period_start.hour == self._hour:
-                    prices.append(float(record["rce_pln"]))
-            except (ValueError, KeyError):
-                continue
-
-        if not prices:
-            return None
-
-        return round(sum(prices) / len(prices), 2)
+        return self.get_slot_price(self.get_today_data(), self._hour)
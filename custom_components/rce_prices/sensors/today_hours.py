@@ -30,8 +30,7 @@ class RCETodayMaxPriceHourStartSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
-        return max_price_records[0]["period"].split(" - ")[0] if max_price_records else None
+        return self.get_day_analytics(today_data).max_start
 
 
 class RCETodayMaxPriceHourEndSensor(RCETodayHoursSensor):
@@ -45,8 +44,7 @@ class RCETodayMaxPriceHourEndSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
-        return max_price_records[-1]["period"].split(" - ")[1] if max_price_records else None
+        return self.get_day_analytics(today_data).max_end
 
 
 class RCETodayMinPriceHourStartSensor(RCETodayHoursSensor):
@@ -60,8 +58,7 @@ class RCETodayMinPriceHourStartSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
-        return min_price_records[0]["period"].split(" - ")[0] if min_price_records else None
+        return self.get_day_analytics(today_data).min_start
 
 
 class RCETodayMinPriceHourEndSensor(RCETodayHoursSensor):
@@ -75,8 +72,7 @@ class RCETodayMinPriceHourEndSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
-        return min_price_records[-1]["period"].split(" - ")[1] if min_price_records else None
+        return self.get_day_analytics(today_data).min_end
 
 
 class RCETodayMaxPriceHourStartTimestampSensor(RCETodayHoursSensor):
@@ -92,12 +88,11 @@ class RCETodayMaxPriceHourStartTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
-        if not max_price_records:
+        start_time_str = self.get_day_analytics(today_data).max_start
+        if start_time_str is None:
             return None
         
         try:
-            start_time_str = max_price_records[0]["period"].split(" - ")[0]
             today_str = dt_util.now().strftime("%Y-%m-%d")
             datetime_str = f"{today_str} {start_time_str}:00"
             start_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -119,12 +114,11 @@ class RCETodayMaxPriceHourEndTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
-        if not max_price_records:
+        end_time_str = self.get_day_analytics(today_data).max_end
+        if end_time_str is None:
             return None
         
         try:
-            end_time_str = max_price_records[-1]["period"].split(" - ")[1]
             today_str = dt_util.now().strftime("%Y-%m-%d")
             datetime_str = f"{today_str} {end_time_str}:00"
             end_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -146,12 +140,11 @@ class RCETodayMinPriceHourStartTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
-        if not min_price_records:
+        start_time_str = self.get_day_analytics(today_data).min_start
+        if start_time_str is None:
             return None
         
         try:
-            start_time_str = min_price_records[0]["period"].split(" - ")[0]
             today_str = dt_util.now().strftime("%Y-%m-%d")
             datetime_str = f"{today_str} {start_time_str}:00"
             start_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -173,12 +166,11 @@ class RCETodayMinPriceHourEndTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
-        if not min_price_records:
+        end_time_str = self.get_day_analytics(today_data).min_end
+        if end_time_str is None:
             return None
         
         try:
-            end_time_str = min_price_records[-1]["period"].split(" - ")[1]
             today_str = dt_util.now().strftime("%Y-%m-%d")
             datetime_str = f"{today_str} {end_time_str}:00"
             end_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -199,13 +191,7 @@ class RCETodayMinPriceRangeSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
-        if not min_price_records:
-            return None
-            
-        start_time = min_price_records[0]["period"].split(" - ")[0]
-        end_time = min_price_records[-1]["period"].split(" - ")[1]
-        return f"{start_time} - {end_time}"
+        return self.get_day_analytics(today_data).min_range
 
 
 class RCETodayMaxPriceRangeSensor(RCETodayHoursSensor):
@@ -220,10 +206,4 @@ class RCETodayMaxPriceRangeSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
-        if not max_price_records:
-            return None
-            
-        start_time = max_price_records[0]["period"].split(" - ")[0]
-        end_time = max_price_records[-1]["period"].split(" - ")[1]
-        return f"{start_time} - {end_time}" 
\ No newline at end of file
+        return self.get_day_analytics(today_data).max_range
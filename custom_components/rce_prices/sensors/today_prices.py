@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from .base import RCEBaseSensor
+from ..const import STATE_REFRESH_SLOT
 
 if TYPE_CHECKING:
     from ..coordinator import RCEPSEDataUpdateCoordinator
@@ -10,6 +11,8 @@ if TYPE_CHECKING:
 
 class RCEFuturePriceSensor(RCEBaseSensor):
 
+    state_refresh = STATE_REFRESH_SLOT
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str, hours_ahead: int) -> None:
         super().__init__(coordinator, unique_id)
         self._hours_ahead = hours_ahead
@@ -41,6 +44,8 @@ class RCENext3HoursPriceSensor(RCEFuturePriceSensor):
 
 class RCEPreviousHourPriceSensor(RCEBaseSensor):
 
+    state_refresh = STATE_REFRESH_SLOT
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "previous_hour_price")
         self._attr_native_unit_of_measurement = "PLN/MWh"
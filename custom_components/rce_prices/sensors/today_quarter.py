@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
 from .base import RCEBaseSensor
@@ -23,17 +22,4 @@ class RCETodayQuarterPriceSensor(RCEBaseSensor):
 
     @property
     def native_value(self) -> float | None:
-        today_data = self.get_today_data()
-        if not today_data:
-            return None
-
-        for record in today_data:
-            try:
-                period_end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                period_start = period_end - timedelta(minutes=15)
-                if period_start.hour == self._hour and period_start.minute == self._minute:
-                    return round(float(record["rce_pln"]), 2)
-            except (ValueError, KeyError):
-                continue
-
-        return None
+        return self.get_slot_price(self.get_today_data(), self._hour, self._minute)
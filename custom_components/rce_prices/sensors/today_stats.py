@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from .base import RCEBaseSensor
+from ..const import STATE_REFRESH_SLOT
 
 if TYPE_CHECKING:
     from ..coordinator import RCEPSEDataUpdateCoordinator
@@ -27,8 +28,7 @@ class RCETodayAvgPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return round(self.calculator.calculate_average(prices), 2)
+        return round(self.get_day_analytics(today_data).average, 2)
 
 
 class RCETodayMaxPriceSensor(RCETodayStatsSensor):
@@ -42,8 +42,7 @@ class RCETodayMaxPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return max(prices) if prices else None
+        return self.get_day_analytics(today_data).maximum
 
 
 class RCETodayMinPriceSensor(RCETodayStatsSensor):
@@ -57,8 +56,7 @@ class RCETodayMinPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return min(prices) if prices else None
+        return self.get_day_analytics(today_data).minimum
 
 
 class RCETodayMedianPriceSensor(RCETodayStatsSensor):
@@ -72,12 +70,13 @@ class RCETodayMedianPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return round(self.calculator.calculate_median(prices), 2)
+        return round(self.get_day_analytics(today_data).median, 2)
 
 
 class RCETodayCurrentVsAverageSensor(RCETodayStatsSensor):
 
+    state_refresh = STATE_REFRESH_SLOT
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "today_current_vs_average", "%", "mdi:percent")
 
@@ -90,8 +89,7 @@ class RCETodayCurrentVsAverageSensor(RCETodayStatsSensor):
             return None
         
         current_price = float(current_data["rce_pln"])
-        prices = self.calculator.get_prices_from_data(today_data)
-        avg_price = self.calculator.calculate_average(prices)
+        avg_price = self.get_day_analytics(today_data).average
         
         percentage = self.calculator.calculate_percentage_difference(current_price, avg_price)
         return round(percentage, 1) 
\ No newline at end of file
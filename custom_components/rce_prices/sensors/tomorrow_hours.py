@@ -34,8 +34,7 @@ class RCETomorrowMaxPriceHourStartSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
-        return max_price_records[0]["period"].split(" - ")[0] if max_price_records else None
+        return self.get_day_analytics(tomorrow_data).max_start
 
 
 class RCETomorrowMaxPriceHourEndSensor(RCETomorrowHoursSensor):
@@ -49,8 +48,7 @@ class RCETomorrowMaxPriceHourEndSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
-        return max_price_records[-1]["period"].split(" - ")[1] if max_price_records else None
+        return self.get_day_analytics(tomorrow_data).max_end
 
 
 class RCETomorrowMinPriceHourStartSensor(RCETomorrowHoursSensor):
@@ -64,8 +62,7 @@ class RCETomorrowMinPriceHourStartSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
-        return min_price_records[0]["period"].split(" - ")[0] if min_price_records else None
+        return self.get_day_analytics(tomorrow_data).min_start
 
 
 class RCETomorrowMinPriceHourEndSensor(RCETomorrowHoursSensor):
@@ -79,8 +76,7 @@ class RCETomorrowMinPriceHourEndSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
-        return min_price_records[-1]["period"].split(" - ")[1] if min_price_records else None
+        return self.get_day_analytics(tomorrow_data).min_end
 
 
 class RCETomorrowMaxPriceHourStartTimestampSensor(RCETomorrowHoursSensor):
@@ -96,12 +92,11 @@ class RCETomorrowMaxPriceHourStartTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
-        if not max_price_records:
+        start_time_str = self.get_day_analytics(tomorrow_data).max_start
+        if start_time_str is None:
             return None
         
         try:
-            start_time_str = max_price_records[0]["period"].split(" - ")[0]
             tomorrow_str = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
             datetime_str = f"{tomorrow_str} {start_time_str}:00"
             start_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -123,12 +118,11 @@ class RCETomorrowMaxPriceHourEndTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
-        if not max_price_records:
+        end_time_str = self.get_day_analytics(tomorrow_data).max_end
+        if end_time_str is None:
             return None
         
         try:
-            end_time_str = max_price_records[-1]["period"].split(" - ")[1]
             tomorrow_str = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
             datetime_str = f"{tomorrow_str} {end_time_str}:00"
             end_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -150,12 +144,11 @@ class RCETomorrowMinPriceHourStartTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
-        if not min_price_records:
+        start_time_str = self.get_day_analytics(tomorrow_data).min_start
+        if start_time_str is None:
             return None
         
         try:
-            start_time_str = min_price_records[0]["period"].split(" - ")[0]
             tomorrow_str = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
             datetime_str = f"{tomorrow_str} {start_time_str}:00"
             start_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -177,12 +170,11 @@ class RCETomorrowMinPriceHourEndTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
-        if not min_price_records:
+        end_time_str = self.get_day_analytics(tomorrow_data).min_end
+        if end_time_str is None:
             return None
         
         try:
-            end_time_str = min_price_records[-1]["period"].split(" - ")[1]
             tomorrow_str = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
             datetime_str = f"{tomorrow_str} {end_time_str}:00"
             end_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
@@ -203,13 +195,7 @@ class RCETomorrowMinPriceRangeSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
-        if not min_price_records:
-            return None
-            
-        start_time = min_price_records[0]["period"].split(" - ")[0]
-        end_time = min_price_records[-1]["period"].split(" - ")[1]
-        return f"{start_time} - {end_time}"
+        return self.get_day_analytics(tomorrow_data).min_range
 
 
 class RCETomorrowMaxPriceRangeSensor(RCETomorrowHoursSensor):
@@ -224,10 +210,4 @@ class RCETomorrowMaxPriceRangeSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
-        if not max_price_records:
-            return None
-            
-        start_time = max_price_records[0]["period"].split(" - ")[0]
-        end_time = max_price_records[-1]["period"].split(" - ")[1]
-        return f"{start_time} - {end_time}" 
\ No newline at end of file
+        return self.get_day_analytics(tomorrow_data).max_range
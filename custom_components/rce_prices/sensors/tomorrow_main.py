@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from datetime import timedelta
 from typing import Any, TYPE_CHECKING
 
 from homeassistant.util import dt as dt_util
 
 from .base import RCEBaseSensor
+from ..const import STATE_REFRESH_SLOT
 
 if TYPE_CHECKING:
     from ..coordinator import RCEPSEDataUpdateCoordinator
@@ -13,6 +13,9 @@ if TYPE_CHECKING:
 
 class RCETomorrowMainSensor(RCEBaseSensor):
 
+    state_refresh = STATE_REFRESH_SLOT
+    _unrecorded_attributes = frozenset({"prices"})
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "tomorrow_price")
         self._attr_native_unit_of_measurement = "PLN/MWh"
@@ -22,14 +25,6 @@ class RCETomorrowMainSensor(RCEBaseSensor):
     def available(self) -> bool:
         return super().available and self.is_tomorrow_data_available()
 
-    @property
-    def should_poll(self) -> bool:
-        return True
-
-    @property
-    def scan_interval(self) -> timedelta:
-        return timedelta(minutes=1)
-
     @property
     def native_value(self) -> float | None:
         now = dt_util.now()
@@ -57,17 +52,12 @@ class RCETomorrowMainSensor(RCEBaseSensor):
         now = dt_util.now()
         current_hour = now.hour
         tomorrow_data = self.get_tomorrow_data()
-        excluded_keys = {"rce_pln_neg_to_zero", "publication_ts"}
-        sanitized_tomorrow_data = [
-            {k: v for k, v in record.items() if k not in excluded_keys}
-            for record in tomorrow_data
-        ]
         tomorrow_price_record = self.get_tomorrow_price_at_time(now)
         
         attributes = {
             "last_update": self.coordinator.data.get("last_update") if self.coordinator.data else None,
             "data_points": len(tomorrow_data),
-            "prices": sanitized_tomorrow_data,
+            "prices": self.get_price_attributes(tomorrow_data),
             "available_after": "14:00 CET",
             "status": "Available",
             "current_hour": current_hour,
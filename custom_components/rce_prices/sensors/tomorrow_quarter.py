@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
 from .base import RCEBaseSensor
@@ -27,17 +26,4 @@ class RCETomorrowQuarterPriceSensor(RCEBaseSensor):
 
     @property
     def native_value(self) -> float | None:
-        tomorrow_data = self.get_tomorrow_data()
-        if not tomorrow_data:
-            return None
-
-        for record in tomorrow_data:
-            try:
-                period_end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
-                period_start = period_end - timedelta(minutes=15)
-                if period_start.hour == self._hour and period_start.minute == self._minute:
-                    return round(float(record["rce_pln"]), 2)
-            except (ValueError, KeyError):
-                continue
-
-        return None
+        return self.get_slot_price(self.get_tomorrow_data(), self._hour, self._minute)
@@ -31,8 +31,7 @@ class RCETomorrowAvgPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return round(self.calculator.calculate_average(prices), 2)
+        return round(self.get_day_analytics(tomorrow_data).average, 2)
 
 
 class RCETomorrowMaxPriceSensor(RCETomorrowStatsSensor):
@@ -46,8 +45,7 @@ class RCETomorrowMaxPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return max(prices) if prices else None
+        return self.get_day_analytics(tomorrow_data).maximum
 
 
 class RCETomorrowMinPriceSensor(RCETomorrowStatsSensor):
@@ -61,8 +59,7 @@ class RCETomorrowMinPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return min(prices) if prices else None
+        return self.get_day_analytics(tomorrow_data).minimum
 
 
 class RCETomorrowMedianPriceSensor(RCETomorrowStatsSensor):
@@ -76,8 +73,7 @@ class RCETomorrowMedianPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return round(self.calculator.calculate_median(prices), 2)
+        return round(self.get_day_analytics(tomorrow_data).median, 2)
 
 
 class RCETomorrowTodayAvgComparisonSensor(RCETomorrowStatsSensor):
@@ -93,11 +89,8 @@ class RCETomorrowTodayAvgComparisonSensor(RCETomorrowStatsSensor):
         if not tomorrow_data or not today_data:
             return None
         
-        tomorrow_prices = self.calculator.get_prices_from_data(tomorrow_data)
-        today_prices = self.calculator.get_prices_from_data(today_data)
-        
-        tomorrow_avg = self.calculator.calculate_average(tomorrow_prices)
-        today_avg = self.calculator.calculate_average(today_prices)
+        tomorrow_avg = self.get_day_analytics(tomorrow_data).average
+        today_avg = self.get_day_analytics(today_data).average
         
         percentage = self.calculator.calculate_percentage_difference(tomorrow_avg, today_avg)
         return round(percentage, 1) 
\ No newline at end of file
@@ -1,18 +1,71 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from functools import wraps
+from typing import Any
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, MANUFACTURER
+from .const import (
+    CONF_CHEAPEST_SLOTS_COUNT,
+    CONF_CHEAPEST_TIME_WINDOW_END,
+    CONF_CHEAPEST_TIME_WINDOW_START,
+    CONF_CHEAPEST_WINDOW_DURATION_HOURS,
+    CONF_EXPENSIVE_TIME_WINDOW_END,
+    CONF_EXPENSIVE_TIME_WINDOW_START,
+    CONF_EXPENSIVE_WINDOW_DURATION_HOURS,
+    CONF_WINDOW_HORIZON_MODE,
+    DEFAULT_CHEAPEST_SLOTS_COUNT,
+    DEFAULT_TIME_WINDOW_END,
+    DEFAULT_TIME_WINDOW_START,
+    DEFAULT_WINDOW_HORIZON_MODE,
+    DOMAIN,
+    MANUFACTURER,
+    STATE_REFRESH_DAY,
+    STATE_REFRESH_SLOT,
+    WINDOW_HORIZON_HOURS,
+    WINDOW_OVERLAP_DISTINCT_START_HOUR,
+)
+from .coordinator import RCEPSEDataUpdateCoordinator
+from .day_analytics import DayAnalytics
 from .price_calculator import PriceCalculator
+from .price_series import SLOT_SECONDS, PriceDay, PriceSeries, from_timestamp, parse_dtime
+from .window_cache import WindowCache
+
+_INT_OPTIONS = (
+    CONF_CHEAPEST_TIME_WINDOW_START, CONF_CHEAPEST_TIME_WINDOW_END,
+    CONF_CHEAPEST_WINDOW_DURATION_HOURS, CONF_EXPENSIVE_TIME_WINDOW_START,
+    CONF_EXPENSIVE_TIME_WINDOW_END, CONF_EXPENSIVE_WINDOW_DURATION_HOURS,
+    CONF_CHEAPEST_SLOTS_COUNT,
+)
+
+_STATE_PROPERTIES = ("native_value", "is_on", "extra_state_attributes")
+
+
+def _reuse_compared_state(name: str, fget: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Serve ``name`` from the values just compared while their state is being written."""
+
+    @wraps(fget)
+    def getter(self: RCEBaseCommonEntity) -> Any:
+        if self._writing_state is not None:
+            return self._writing_state[name]
+        return fget(self)
+
+    return getter
 
-if TYPE_CHECKING:
-    from .coordinator import RCEPSEDataUpdateCoordinator
 
 class RCEBaseCommonEntity(CoordinatorEntity):
+    config_entry: ConfigEntry | None = None
+    _written_state: tuple | None = None
+    _writing_state: dict[str, Any] | None = None
+    _boundary_refresh: str | None = None
+    _remove_boundary_listener: Callable[[], None] | None = None
+    _fallback_series: PriceSeries | None = None
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
         super().__init__(coordinator)
         self._attr_unique_id = f"rce_prices_{unique_id}"
@@ -20,6 +73,64 @@ class RCEBaseCommonEntity(CoordinatorEntity):
         self._attr_translation_key = f"rce_prices_{unique_id}"
         self.calculator = PriceCalculator()
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in _STATE_PROPERTIES:
+            prop = cls.__dict__.get(name)
+            if isinstance(prop, property) and prop.fget is not None:
+                setattr(cls, name, property(_reuse_compared_state(name, prop.fget)))
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._async_follow_boundaries()
+        self.async_on_remove(self._async_stop_boundaries)
+
+    @callback
+    def _async_follow_boundaries(self) -> None:
+        """Register for the boundaries of ``state_refresh``, moving the listener when options changed it."""
+        refresh = self.state_refresh
+        if refresh == self._boundary_refresh:
+            return
+        self._async_stop_boundaries()
+        self._boundary_refresh = refresh
+        self._remove_boundary_listener = self.coordinator.async_add_boundary_listener(
+            self._handle_boundary_update, refresh
+        )
+
+    @callback
+    def _async_stop_boundaries(self) -> None:
+        if self._remove_boundary_listener is not None:
+            self._remove_boundary_listener()
+            self._remove_boundary_listener = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Hot-applied options reach entities as a coordinator update.
+        if self._boundary_refresh is not None:
+            self._async_follow_boundaries()
+        self._async_write_state_if_changed()
+
+    @callback
+    def _handle_boundary_update(self) -> None:
+        self._async_write_state_if_changed()
+
+    @callback
+    def _async_write_state_if_changed(self) -> None:
+        """Write state only when availability, value or attributes differ from the last write.
+
+        Each state property is evaluated once; the write reuses the compared values.
+        """
+        values = {name: getattr(self, name, None) for name in _STATE_PROPERTIES}
+        state = (self.available, *values.values())
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self._writing_state = values
+        try:
+            self.async_write_ha_state()
+        finally:
+            self._writing_state = None
+
     @property
     def device_info(self):
         return {
@@ -30,29 +141,157 @@ class RCEBaseCommonEntity(CoordinatorEntity):
             "manufacturer": MANUFACTURER,
         }
 
+    def get_price_series(self) -> PriceSeries | None:
+        data = self.coordinator.data
+        if not data or not data.get("raw_data"):
+            return None
+        series = data.get("series")
+        if series is not None and series.source is data["raw_data"]:
+            return series
+        # The coordinator builds the series with every payload; a bare one is
+        # only parsed locally, never written back into the shared data.
+        if self._fallback_series is None or self._fallback_series.source is not data["raw_data"]:
+            self._fallback_series = PriceSeries.from_records(data["raw_data"])
+        return self._fallback_series
+
+    def get_record_bounds(self, record: dict) -> tuple[datetime, datetime]:
+        series = self.get_price_series()
+        index = series.position(record) if series else None
+        if index is not None:
+            return series.slot_start(index), series.slot_end(index)
+        start = parse_dtime(record["dtime"])
+        return from_timestamp(start), from_timestamp(start + SLOT_SECONDS)
+
+    def get_day_analytics(self, day_data: list[dict]) -> DayAnalytics | None:
+        if not day_data:
+            return None
+        if not isinstance(day_data, PriceDay) or day_data.business_date is None:
+            return DayAnalytics(day_data, self.calculator)
+        key = ("day_analytics", day_data.business_date)
+        analytics = day_data.series.cache.get(key)
+        if analytics is None:
+            analytics = day_data.series.cache[key] = DayAnalytics(day_data)
+        return analytics
+
+    def find_optimal_window(self, day_data: list[dict], start_hour: int, end_hour: int,
+                            duration: int, is_max: bool = False) -> list[dict]:
+        cache = getattr(self.coordinator, "window_cache", None)
+        if not isinstance(day_data, PriceDay) or not isinstance(cache, WindowCache):
+            return self.calculator.find_optimal_window(day_data, start_hour, end_hour, duration, is_max=is_max)
+        key = (day_data.series.fingerprint, day_data.offset, len(day_data), start_hour, end_hour, duration, is_max)
+        return cache.get_or_compute(
+            key,
+            lambda: self.calculator.find_optimal_window(day_data, start_hour, end_hour, duration, is_max=is_max),
+        )
+
+    def find_top_windows(self, day_data: list[dict], start_hour: int, end_hour: int, duration: int,
+                         top_n: int, is_max: bool = True,
+                         overlap: str = WINDOW_OVERLAP_DISTINCT_START_HOUR) -> list[list[dict]]:
+        cache = getattr(self.coordinator, "window_cache", None)
+        if not isinstance(day_data, PriceDay) or not isinstance(cache, WindowCache):
+            return self.calculator.find_top_windows(
+                day_data, start_hour, end_hour, duration, top_n=top_n, is_max=is_max, overlap=overlap
+            )
+        key = ("top", day_data.series.fingerprint, day_data.offset, len(day_data), start_hour, end_hour,
+               duration, top_n, is_max, overlap)
+        return cache.get_or_compute(
+            key,
+            lambda: self.calculator.find_top_windows(
+                day_data, start_hour, end_hour, duration, top_n=top_n, is_max=is_max, overlap=overlap
+            ),
+        )
+
+    def find_cheapest_slots(self, day_data: list[dict], start_hour: int, end_hour: int,
+                            slot_count: int) -> list[dict]:
+        cache = getattr(self.coordinator, "window_cache", None)
+        if not isinstance(day_data, PriceDay) or not isinstance(cache, WindowCache):
+            return self.calculator.find_cheapest_slots(day_data, start_hour, end_hour, slot_count)
+        key = ("slots", day_data.series.fingerprint, day_data.offset, len(day_data), start_hour, end_hour, slot_count)
+        return cache.get_or_compute(
+            key,
+            lambda: self.calculator.find_cheapest_slots(day_data, start_hour, end_hour, slot_count),
+        )
+
     def get_today_data(self) -> list[dict]:
-        if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
+        series = self.get_price_series()
+        if series is None:
             return []
-        today = dt_util.now().strftime("%Y-%m-%d")
-        return [
-            record for record in self.coordinator.data["raw_data"]
-            if record.get("business_date") == today
-        ]
+        return series.day(dt_util.now().strftime("%Y-%m-%d")) or []
 
     def get_tomorrow_data(self) -> list[dict]:
         if not self.is_tomorrow_data_available():
             return []
-        if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
+        series = self.get_price_series()
+        if series is None:
             return []
         tomorrow = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-        return [
-            record for record in self.coordinator.data["raw_data"]
-            if record.get("business_date") == tomorrow
-        ]
+        return series.day(tomorrow) or []
+
+    def get_config_value(self, key: str, default: any) -> any:
+        if self.config_entry is None:
+            value = default
+        elif self.config_entry.options and key in self.config_entry.options:
+            value = self.config_entry.options[key]
+        else:
+            value = self.config_entry.data.get(key, default)
+
+        if key in _INT_OPTIONS:
+            return int(value)
+
+        return value
+
+    def is_horizon_mode(self) -> bool:
+        return bool(self.get_config_value(CONF_WINDOW_HORIZON_MODE, DEFAULT_WINDOW_HORIZON_MODE))
+
+    @property
+    def state_refresh(self) -> str:
+        # Every entity picks today/tomorrow from the clock; STATE_REFRESH_SLOT
+        # entities, and windows counted from now, also follow the quarter-hour.
+        return STATE_REFRESH_SLOT if self.is_horizon_mode() else STATE_REFRESH_DAY
+
+    def get_window_data(self) -> list[dict]:
+        if self.is_horizon_mode():
+            return self.get_horizon_data()
+        return self.get_today_data()
+
+    def get_cheapest_slots(self) -> list[dict]:
+        window_data = self.get_anchored_horizon_data() if self.is_horizon_mode() else self.get_today_data()
+        if not window_data:
+            return []
+
+        start_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_START, DEFAULT_TIME_WINDOW_START)
+        end_hour = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
+        slot_count = self.get_config_value(CONF_CHEAPEST_SLOTS_COUNT, DEFAULT_CHEAPEST_SLOTS_COUNT)
+
+        return self.find_cheapest_slots(window_data, start_hour, end_hour, slot_count)
+
+    def get_horizon_data(self) -> list[dict]:
+        series = self.get_price_series()
+        if series is None:
+            return []
+        return series.horizon(dt_util.now(), WINDOW_HORIZON_HOURS)
+
+    def get_anchored_horizon_data(self) -> list[dict]:
+        """Horizon counted from the first read after the data last changed.
+
+        A selection over it stays fixed until the next update, so slots that
+        pass do not make room for later, pricier ones.
+        """
+        series = self.get_price_series()
+        if series is None:
+            return []
+        anchor = series.cache.get("horizon_anchor")
+        if anchor is None:
+            anchor = series.cache["horizon_anchor"] = dt_util.now()
+        return series.horizon(anchor, WINDOW_HORIZON_HOURS)
 
     def is_tomorrow_data_available(self) -> bool:
-        now = dt_util.now()
-        return now.hour >= 14
+        """Whether every quarter-hour of tomorrow is published, as the fetch planner sees it."""
+        series = self.get_price_series()
+        if series is None:
+            return False
+        tomorrow = (dt_util.now() + timedelta(days=1)).date()
+        return RCEPSEDataUpdateCoordinator.is_date_complete({"series": series}, tomorrow)
 
     @property
     def available(self) -> bool:
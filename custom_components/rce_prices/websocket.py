@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED, STATE_REFRESH_SLOT, WEBSOCKET_SUBSCRIBE
+from .price_series import PriceSeries
+
+if TYPE_CHECKING:
+    from .coordinator import RCEPSEDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def _isoformat(timestamp: int) -> str:
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+def _series(coordinator: RCEPSEDataUpdateCoordinator) -> PriceSeries | None:
+    data = coordinator.data
+    if not data or not data.get("raw_data"):
+        return None
+    return data.get("series") or PriceSeries.from_records(data["raw_data"])
+
+
+def _slots(series: PriceSeries | None) -> dict[str, dict[int, float]]:
+    """Slot prices of every business date, keyed by UTC slot start."""
+    if series is None:
+        return {}
+    utc_starts = series.utc_starts(dt_util.DEFAULT_TIME_ZONE)
+    return {
+        business_date: dict(zip(utc_starts[first:end], series.prices[first:end]))
+        for business_date, (first, end) in series.date_offsets.items()
+    }
+
+
+def _columns(slots: dict[int, float]) -> dict[str, list]:
+    starts = sorted(slots)
+    return {
+        "start": [_isoformat(start) for start in starts],
+        "price": [round(slots[start], 2) for start in starts],
+    }
+
+
+def series_delta(previous: dict[str, dict[int, float]],
+                 current: dict[str, dict[int, float]]) -> dict[str, Any] | None:
+    """New dates, revised or added slots and dropped dates between two snapshots, or None."""
+    added = sorted(set(current) - set(previous))
+    removed = sorted(set(previous) - set(current))
+    revised: dict[int, float] = {}
+    for business_date in set(current) & set(previous):
+        held = previous[business_date]
+        revised.update(
+            (start, price) for start, price in current[business_date].items() if held.get(start) != price
+        )
+    if not added and not removed and not revised:
+        return None
+    return {
+        "type": "delta",
+        "dates_added": {business_date: _columns(current[business_date]) for business_date in added},
+        "dates_removed": removed,
+        "slots_revised": _columns(revised),
+    }
+
+
+def current_slot(series: PriceSeries | None) -> dict[str, Any] | None:
+    index = series.index_at(dt_util.now()) if series is not None else None
+    if index is None:
+        return None
+    utc_starts = series.utc_starts(dt_util.DEFAULT_TIME_ZONE)
+    return {"start": _isoformat(utc_starts[index]), "price": round(series.prices[index], 2)}
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): WEBSOCKET_SUBSCRIBE,
+    vol.Optional("entry_id"): str,
+})
+@callback
+def websocket_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection,
+                        msg: dict[str, Any]) -> None:
+    """Send the full price series once, then deltas whenever the coordinator data changes.
+
+    The subscription ends with an error when its config entry unloads.
+    """
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = msg["entry_id"] if "entry_id" in msg else next(iter(coordinators), None)
+    coordinator = coordinators.get(entry_id)
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "RCE Prices entry not found")
+        return
+
+    series = _series(coordinator)
+    state = {"series": series, "slots": _slots(series), "current": current_slot(series)}
+
+    @callback
+    def forward_update() -> None:
+        series = _series(coordinator)
+        if series is state["series"]:
+            return
+        slots = _slots(series)
+        delta = series_delta(state["slots"], slots)
+        state.update(series=series, slots=slots)
+        if delta is not None:
+            connection.send_message(websocket_api.event_message(msg["id"], delta))
+        forward_current()
+
+    @callback
+    def forward_current() -> None:
+        current = current_slot(state["series"])
+        if current == state["current"]:
+            return
+        state["current"] = current
+        connection.send_message(websocket_api.event_message(msg["id"], {"type": "current", "current": current}))
+
+    remove_update = coordinator.async_add_listener(forward_update)
+    remove_current = coordinator.async_add_boundary_listener(forward_current, STATE_REFRESH_SLOT)
+
+    @callback
+    def entry_unloaded() -> None:
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        unsubscribe()
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "RCE Prices entry unloaded")
+        _LOGGER.debug("Websocket subscription %s closed, RCE Prices entry unloaded", msg["id"])
+
+    remove_unloaded = async_dispatcher_connect(hass, SIGNAL_ENTRY_UNLOADED.format(entry_id), entry_unloaded)
+
+    @callback
+    def unsubscribe() -> None:
+        remove_update()
+        remove_current()
+        remove_unloaded()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {
+        "type": "full",
+        "dates": {business_date: _columns(slots) for business_date, slots in state["slots"].items()},
+        "current": state["current"],
+    }))
+    _LOGGER.debug("Websocket subscription %s opened for RCE Prices", msg["id"])
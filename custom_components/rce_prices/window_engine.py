@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import heapq
+import sys
+from collections.abc import Iterator, Sequence
+
+from .const import (
+    WINDOW_OVERLAP_ANY,
+    WINDOW_OVERLAP_DISTINCT_START_HOUR,
+    WINDOW_OVERLAP_MIN_GAP,
+    WINDOW_OVERLAP_NON_OVERLAPPING,
+)
+from .price_series import SLOT_SECONDS
+
+_EPSILON = sys.float_info.epsilon
+
+
+class WindowEngine:
+    """Contiguous-window search over slots sorted by start time.
+
+    Continuity (run lengths), prefix sums and a prefix count of unusable
+    prices are built once, so every candidate window is checked and scored
+    in O(1). Averages taken from prefix sums can differ from a plain
+    ``sum(window) / len(window)`` in the last bits, so candidates that are
+    within rounding distance of each other are re-scored exactly; this keeps
+    results and tie-breaking identical to summing each window.
+    """
+
+    __slots__ = ("starts", "prices", "_runs", "_prefix", "_invalid", "_abs_total")
+
+    def __init__(self, starts: Sequence[int], prices: Sequence[float | None]) -> None:
+        self.starts = starts
+        self.prices = prices
+        runs = []
+        prefix = [0.0]
+        invalid = [0]
+        total = 0.0
+        abs_total = 0.0
+        bad = 0
+        run = 0
+        previous = None
+
+        for start, price in zip(starts, prices):
+            run = run + 1 if previous is not None and start - previous == SLOT_SECONDS else 1
+            previous = start
+            runs.append(run)
+            if price is None:
+                bad += 1
+            else:
+                total += price
+                abs_total += abs(price)
+            prefix.append(total)
+            invalid.append(bad)
+
+        self._runs = runs
+        self._prefix = prefix
+        self._invalid = invalid
+        self._abs_total = abs_total
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def window_starts(self, duration: int) -> Iterator[int]:
+        """Positions where a contiguous window of ``duration`` usable slots begins."""
+        if duration <= 0:
+            return
+        runs = self._runs
+        invalid = self._invalid
+        for end in range(duration - 1, len(runs)):
+            first = end + 1 - duration
+            if runs[end] >= duration and invalid[end + 1] == invalid[first]:
+                yield first
+
+    def approx_average(self, position: int, duration: int) -> float:
+        return (self._prefix[position + duration] - self._prefix[position]) / duration
+
+    def exact_average(self, position: int, duration: int) -> float:
+        window_prices = self.prices[position:position + duration]
+        return sum(window_prices) / len(window_prices)
+
+    def tolerance(self, duration: int) -> float:
+        return 8 * _EPSILON * (len(self._runs) + duration) * self._abs_total / duration
+
+    def best(self, duration: int, is_max: bool = False, positions: Iterator[int] | None = None) -> int | None:
+        """First position holding the lowest (or highest) average window."""
+        if positions is None:
+            positions = self.window_starts(duration)
+        scored = [(self.approx_average(position, duration), position) for position in positions]
+        if not scored:
+            return None
+
+        target = max(scored)[0] if is_max else min(scored)[0]
+        tolerance = self.tolerance(duration)
+
+        best_position = None
+        best_average = None
+        for approx, position in scored:
+            if abs(approx - target) > tolerance:
+                continue
+            average = self.exact_average(position, duration)
+            if best_average is None or (is_max and average > best_average) or (
+                not is_max and average < best_average
+            ):
+                best_position = position
+                best_average = average
+        return best_position
+
+    def best_by_duration(self, max_duration: int) -> list[tuple[int, int | None, int | None]]:
+        """Cheapest and most expensive window position for every duration up to ``max_duration``."""
+        return [
+            (duration, self.best(duration, is_max=False), self.best(duration, is_max=True))
+            for duration in range(1, max_duration + 1)
+        ]
+
+    def ranked(self, duration: int, is_max: bool, positions: Sequence[int]) -> list[int]:
+        """Positions ordered by exact window average, ties kept in position order."""
+        sign = -1.0 if is_max else 1.0
+        ordered = sorted(positions, key=lambda position: sign * self.approx_average(position, duration))
+        return self._refine(ordered, duration, sign)
+
+    def top(self, duration: int, is_max: bool, positions: Sequence[int], top_n: int,
+            overlap: str = WINDOW_OVERLAP_DISTINCT_START_HOUR, min_gap_minutes: int = 0) -> list[int]:
+        """Best ``top_n`` positions accepted by the overlap policy, in rank order.
+
+        Candidates are heapified and popped lazily, so only as many windows
+        as needed to fill ``top_n`` are ever ordered.
+        """
+        if top_n <= 0:
+            return []
+        sign = -1.0 if is_max else 1.0
+        heap = [(sign * self.approx_average(position, duration), position) for position in positions]
+        heapq.heapify(heap)
+
+        gap = 0
+        if overlap == WINDOW_OVERLAP_MIN_GAP:
+            gap = max(0, int(min_gap_minutes)) * 60
+        span = duration * SLOT_SECONDS
+        tolerance = self.tolerance(duration)
+        accepted: list[int] = []
+        used_hours: set[int] = set()
+
+        while heap and len(accepted) < top_n:
+            approx, position = heapq.heappop(heap)
+            cluster = [position]
+            while heap and heap[0][0] - approx <= tolerance:
+                approx, position = heapq.heappop(heap)
+                cluster.append(position)
+
+            for position in self._exact_order(cluster, duration, sign):
+                start = self.starts[position]
+                if overlap == WINDOW_OVERLAP_DISTINCT_START_HOUR:
+                    hour = (start % 86400) // 3600
+                    if hour in used_hours:
+                        continue
+                    used_hours.add(hour)
+                elif overlap in (WINDOW_OVERLAP_NON_OVERLAPPING, WINDOW_OVERLAP_MIN_GAP):
+                    if any(
+                        start < self.starts[other] + span + gap and self.starts[other] < start + span + gap
+                        for other in accepted
+                    ):
+                        continue
+                elif overlap != WINDOW_OVERLAP_ANY:
+                    raise ValueError(f"Unknown window overlap policy: {overlap}")
+
+                accepted.append(position)
+                if len(accepted) >= top_n:
+                    break
+
+        return accepted
+
+    def _refine(self, ordered: list[int], duration: int, sign: float) -> list[int]:
+        tolerance = self.tolerance(duration)
+        result = []
+        cluster = []
+        previous = None
+
+        for position in ordered:
+            approx = sign * self.approx_average(position, duration)
+            if cluster and approx - previous > tolerance:
+                result.extend(self._exact_order(cluster, duration, sign))
+                cluster = []
+            cluster.append(position)
+            previous = approx
+
+        if cluster:
+            result.extend(self._exact_order(cluster, duration, sign))
+        return result
+
+    def _exact_order(self, cluster: list[int], duration: int, sign: float) -> list[int]:
+        if len(cluster) == 1:
+            return cluster
+        return sorted(cluster, key=lambda position: (sign * self.exact_average(position, duration), position))
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from custom_components.rce_prices.binary_sensors.custom_windows import RCETodayCheapestSlotsBinarySensor
+from custom_components.rce_prices.const import (
+    CONF_CHEAPEST_SLOTS_COUNT,
+    CONF_CHEAPEST_TIME_WINDOW_END,
+    CONF_CHEAPEST_TIME_WINDOW_START,
+    CONF_WINDOW_HORIZON_MODE,
+)
+from custom_components.rce_prices.price_calculator import PriceCalculator
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.sensors.custom_windows import RCETodayCheapestSlotsSensor
+from custom_components.rce_prices.window_cache import WindowCache
+
+from .test_price_series import make_records
+
+PRICES = [300.0, 120.0, 500.0, 80.0, 120.0, 90.0, 700.0, 60.0]
+
+
+def make_config_entry(slot_count: int) -> Mock:
+    config_entry = Mock()
+    config_entry.data = {
+        CONF_CHEAPEST_TIME_WINDOW_START: 10,
+        CONF_CHEAPEST_TIME_WINDOW_END: 12,
+        CONF_CHEAPEST_SLOTS_COUNT: float(slot_count),
+    }
+    config_entry.options = {}
+    return config_entry
+
+
+class TestFindCheapestSlots:
+
+    def test_selects_cheapest_slots_in_time_order(self):
+        records = make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")
+
+        slots = PriceCalculator.find_cheapest_slots(records, 10, 12, 4)
+
+        assert [record["period"] for record in slots] == [
+            "10:15 - 10:30", "10:45 - 11:00", "11:15 - 11:30", "11:45 - 12:00",
+        ]
+
+    def test_ties_prefer_earlier_slot_and_respect_hours(self):
+        records = make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")
+
+        assert [record["rce_pln"] for record in PriceCalculator.find_cheapest_slots(records, 10, 11, 2)] == \
+            ["120.00", "80.00"]
+        assert PriceCalculator.find_cheapest_slots(records, 11, 12, 1)[0]["period"] == "11:45 - 12:00"
+
+    def test_most_expensive_and_series_view_match(self):
+        records = make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")
+        day = PriceSeries.from_records(records).day("2024-01-15")
+
+        assert PriceCalculator.find_cheapest_slots(day, 10, 12, 2, is_max=True) == [records[2], records[6]]
+        assert PriceCalculator.find_cheapest_slots(day, 10, 12, 3) == \
+            PriceCalculator.find_cheapest_slots(records, 10, 12, 3)
+
+    def test_invalid_input(self):
+        records = make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")
+
+        assert PriceCalculator.find_cheapest_slots([], 10, 12, 4) == []
+        assert PriceCalculator.find_cheapest_slots(records, 10, 12, 0) == []
+        assert len(PriceCalculator.find_cheapest_slots(records, 10, 12, 50)) == len(PRICES)
+
+
+class TestCheapestSlotsEntities:
+
+    def test_sensor_lists_selected_slots(self, mock_coordinator):
+        mock_coordinator.data = {"raw_data": make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")}
+        sensor = RCETodayCheapestSlotsSensor(mock_coordinator, make_config_entry(3))
+
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 9, 0)):
+            assert sensor.native_value == 76.67
+            attributes = sensor.extra_state_attributes
+
+        assert attributes["slot_count"] == 3
+        assert [slot["price"] for slot in attributes["slots"]] == [80.0, 90.0, 60.0]
+        assert attributes["slots"][0]["start"].startswith("2024-01-15T10:45:00")
+        assert attributes["slots"][0]["end"].startswith("2024-01-15T11:00:00")
+
+    def test_binary_sensor_on_only_in_selected_slot(self, mock_coordinator):
+        mock_coordinator.data = {"raw_data": make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")}
+        binary_sensor = RCETodayCheapestSlotsBinarySensor(mock_coordinator, make_config_entry(3))
+
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 10, 50)):
+            assert binary_sensor.is_on is True
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 11, 0)):
+            assert binary_sensor.is_on is False
+
+    def test_selection_computed_once_per_data_update(self, mock_coordinator):
+        mock_coordinator.data = {"raw_data": make_records("2024-01-15", PRICES, "2024-01-15 10:00:00")}
+        mock_coordinator.window_cache = WindowCache(maxsize=8)
+        sensor = RCETodayCheapestSlotsSensor(mock_coordinator, make_config_entry(3))
+        binary_sensor = RCETodayCheapestSlotsBinarySensor(mock_coordinator, make_config_entry(3))
+
+        with patch.object(PriceCalculator, "find_cheapest_slots",
+                          wraps=PriceCalculator.find_cheapest_slots) as find_slots, \
+                patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 10, 50)):
+            sensor.native_value
+            sensor.extra_state_attributes
+            binary_sensor.is_on
+            binary_sensor.is_on
+            assert find_slots.call_count == 1
+
+            mock_coordinator.data = {"raw_data": make_records("2024-01-15", PRICES[::-1], "2024-01-15 10:00:00")}
+            sensor.native_value
+            assert find_slots.call_count == 2
+
+    def test_horizon_selection_stays_fixed_across_boundaries(self, mock_coordinator):
+        prices = [float(index) for index in range(192)]
+        records = make_records("2024-01-15", prices[:96], "2024-01-15 00:00:00") + \
+            make_records("2024-01-16", prices[96:], "2024-01-16 00:00:00")
+        mock_coordinator.data = {"raw_data": records, "series": PriceSeries.from_records(records)}
+        mock_coordinator.window_cache = WindowCache(maxsize=8)
+        config_entry = make_config_entry(4)
+        config_entry.data.update({
+            CONF_CHEAPEST_TIME_WINDOW_START: 0,
+            CONF_CHEAPEST_TIME_WINDOW_END: 24,
+            CONF_WINDOW_HORIZON_MODE: True,
+        })
+        binary_sensor = RCETodayCheapestSlotsBinarySensor(mock_coordinator, config_entry)
+
+        active = set()
+        moment = datetime(2024, 1, 15, 6, 5)
+        for _ in range(96):
+            with patch("homeassistant.util.dt.now", return_value=moment):
+                if binary_sensor.is_on:
+                    active.add(moment.replace(minute=moment.minute - moment.minute % 15))
+            moment += timedelta(minutes=15)
+
+        assert len(active) == 4
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.rce_prices.circuit_breaker import CircuitBreaker, parse_retry_after
+from custom_components.rce_prices.const import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+from custom_components.rce_prices.coordinator import PSEApiError, RCEPSEDataUpdateCoordinator
+from custom_components.rce_prices.sensors.api_status import RCEApiStatusSensor
+
+NOW = datetime(2024, 1, 15, 14, 0, tzinfo=timezone.utc)
+
+
+class TestCircuitBreaker:
+
+    def test_jittered_exponential_backoff(self):
+        breaker = CircuitBreaker(threshold=10, base_delay=timedelta(seconds=30), max_delay=timedelta(minutes=2))
+
+        delays = [breaker.record_failure(NOW, TimeoutError()) - NOW for _ in range(4)]
+
+        for delay, backoff in zip(delays, (30, 60, 120, 120)):
+            assert timedelta(seconds=backoff / 2) <= delay <= timedelta(seconds=backoff)
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.last_error == "TimeoutError"
+        assert not breaker.allow(NOW)
+
+    def test_retry_after_and_non_retryable_errors(self):
+        breaker = CircuitBreaker(threshold=10)
+
+        assert breaker.record_failure(NOW, Exception("429"), retry_after=timedelta(minutes=7)) == NOW + timedelta(minutes=7)
+        assert breaker.record_failure(NOW, Exception("400"), retryable=False) == NOW + breaker.max_delay
+
+    def test_circuit_opens_probes_and_closes(self):
+        breaker = CircuitBreaker(threshold=2, open_duration=timedelta(minutes=30))
+        breaker.record_failure(NOW, Exception("boom"))
+
+        assert breaker.record_failure(NOW, Exception("boom")) == NOW + timedelta(minutes=30)
+        assert breaker.state == CIRCUIT_OPEN
+        assert not breaker.allow(NOW + timedelta(minutes=29))
+        assert breaker.allow(NOW + timedelta(minutes=30))
+        assert breaker.state == CIRCUIT_HALF_OPEN
+
+        breaker.record_success(NOW + timedelta(minutes=30))
+        assert breaker.as_dict() == {
+            "state": CIRCUIT_CLOSED,
+            "consecutive_failures": 0,
+            "last_error": None,
+            "next_retry": None,
+            "last_success": (NOW + timedelta(minutes=30)).isoformat(),
+        }
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("120", NOW) == timedelta(seconds=120)
+        assert parse_retry_after("Mon, 15 Jan 2024 14:05:00 GMT", NOW) == timedelta(minutes=5)
+        assert parse_retry_after("soon", NOW) is None
+        assert parse_retry_after(None, NOW) is None
+
+
+class TestCoordinatorRetry:
+
+    @pytest.mark.asyncio
+    async def test_failure_backs_off_instead_of_locking_out(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = {"raw_data": [{"business_date": "2024-01-15"}]}
+        coordinator._last_api_fetch = NOW - timedelta(minutes=31)
+        listener = Mock()
+        coordinator.async_add_health_listener(listener)
+
+        with patch("homeassistant.util.dt.now", return_value=NOW), \
+                patch.object(coordinator, "_fetch_data", AsyncMock(side_effect=PSEApiError("API returned status 503", 503, "90"))):
+            assert await coordinator._async_update_data() is coordinator.data
+
+        assert coordinator._last_api_fetch == NOW - timedelta(minutes=31)
+        assert coordinator.breaker.retry_at == NOW + timedelta(seconds=90)
+        assert coordinator.update_interval == timedelta(seconds=90)
+        listener.assert_called_once()
+
+        with patch("homeassistant.util.dt.now", return_value=NOW + timedelta(seconds=30)), \
+                patch.object(coordinator, "_fetch_data") as fetch:
+            await coordinator._async_update_data()
+        fetch.assert_not_called()
+
+        fresh = {"raw_data": [{"business_date": "2024-01-15"}], "last_update": NOW.isoformat()}
+        with patch("homeassistant.util.dt.now", return_value=NOW + timedelta(seconds=90)), \
+                patch.object(coordinator, "_fetch_data", AsyncMock(return_value=fresh)):
+            assert await coordinator._async_update_data() is fresh
+
+        assert coordinator.breaker.failures == 0
+        assert listener.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retryable_statuses(self):
+        assert PSEApiError("x", 500).retryable
+        assert PSEApiError("x", 429).retryable
+        assert PSEApiError("x").retryable
+        assert not PSEApiError("x", 404).retryable
+
+    def test_status_sensor_reports_breaker(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        sensor = RCEApiStatusSensor(coordinator)
+        for _ in range(coordinator.breaker.threshold):
+            coordinator.breaker.record_failure(NOW, Exception("API returned status 500"))
+
+        assert sensor.available is True
+        assert sensor.native_value == CIRCUIT_OPEN
+        assert sensor.extra_state_attributes["consecutive_failures"] == coordinator.breaker.threshold
+        assert sensor.extra_state_attributes["last_error"] == "API returned status 500"
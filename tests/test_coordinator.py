@@ -1,15 +1,33 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+import functools
+import time
+from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock, Mock
 
+import aiohttp
 import pytest
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from custom_components.rce_prices.coordinator import RCEPSEDataUpdateCoordinator
-from custom_components.rce_prices.const import CONF_USE_HOURLY_PRICES
+from custom_components.rce_prices.coordinator import PSEApiError, RCEPSEDataUpdateCoordinator
+from custom_components.rce_prices.const import (
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_USE_HOURLY_PRICES,
+    STATE_REFRESH_DAY,
+    STATE_REFRESH_SLOT,
+)
+from custom_components.rce_prices.price_series import PriceSeries, next_slot_boundary
+
+from .test_price_series import make_records
+
+
+@pytest.fixture
+def warsaw_time_zone():
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Warsaw"))
+    yield
+    dt_util.set_default_time_zone(dt_util.UTC)
 
 
 class TestRCEPSEDataUpdateCoordinator:
@@ -47,22 +65,22 @@ class TestRCEPSEDataUpdateCoordinator:
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         assert coordinator.session is None
         
-        with patch("custom_components.rce_prices.coordinator.aiohttp.ClientSession") as mock_session_class:
-            mock_session = AsyncMock()
+        with patch("custom_components.rce_prices.coordinator.async_get_clientsession") as mock_session_class:
+            mock_session = Mock()
+            mock_response = AsyncMock()
+            mock_response.status = 200
+            mock_response.headers = {}
+            mock_response.json = AsyncMock(return_value=sample_api_response)
+            mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+            mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
             mock_session_class.return_value = mock_session
             
-            with patch.object(coordinator, '_fetch_data') as mock_fetch:
-                expected_data = {
-                    "raw_data": sample_api_response["value"],
-                    "last_update": "2025-05-29T12:00:00+00:00"
-                }
-                mock_fetch.return_value = expected_data
-                
-                result = await coordinator._async_update_data()
-                
-                mock_session_class.assert_called_once()
-                assert coordinator.session == mock_session
-                assert result["raw_data"] == sample_api_response["value"]
+            result = await coordinator._async_update_data()
+            
+            mock_session_class.assert_called_once_with(mock_hass)
+            assert coordinator.session == mock_session
+            assert len(result["raw_data"]) == len(sample_api_response["value"])
+
 
     @pytest.mark.asyncio
     async def test_api_request_behavior(self, mock_hass, sample_api_response):
@@ -71,14 +89,20 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value=sample_api_response)
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
             mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
             
-            result = await coordinator._fetch_data()
+            with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+00:00")):
+                result = await coordinator._fetch_data()
             
-            mock_session.get.assert_called_once()
+            assert mock_session.get.call_count == 2
+            assert [call[1]["params"]["$filter"] for call in mock_session.get.call_args_list] == [
+                "business_date eq '2024-01-15'",
+                "business_date eq '2024-01-16'",
+            ]
             call_args = mock_session.get.call_args
             
             assert "https://api.raporty.pse.pl/api/rce-pln" in call_args[0]
@@ -98,6 +122,7 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value=sample_api_response)
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
@@ -117,7 +142,7 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert record["business_date"] == original_record["business_date"]
 
     @pytest.mark.asyncio
-    async def test_successful_close_session(self, mock_hass):
+    async def test_close_leaves_shared_session_open(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
         await coordinator.async_close()
@@ -126,7 +151,8 @@ class TestRCEPSEDataUpdateCoordinator:
         coordinator.session = mock_session
         
         await coordinator.async_close()
-        mock_session.close.assert_called_once()
+        mock_session.close.assert_not_called()
+        assert coordinator.session is None
 
     @pytest.mark.asyncio 
     async def test_data_processing_with_valid_response(self, mock_hass, sample_api_response):
@@ -265,7 +291,7 @@ class TestRCEPSEDataUpdateCoordinator:
             assert coordinator._last_api_fetch is not None
 
     @pytest.mark.asyncio
-    async def test_last_api_fetch_updated_on_error(self, mock_hass, sample_api_response):
+    async def test_last_api_fetch_kept_on_error(self, mock_hass, sample_api_response):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         coordinator._last_api_fetch = None
         
@@ -280,7 +306,8 @@ class TestRCEPSEDataUpdateCoordinator:
             
             await coordinator._async_update_data()
             
-            assert coordinator._last_api_fetch is not None
+            assert coordinator._last_api_fetch is None
+            assert coordinator.breaker.failures == 1
 
     @pytest.mark.asyncio
     async def test_api_error_status_handling(self, mock_hass):
@@ -303,6 +330,7 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value={"invalid": "format"})
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
@@ -318,6 +346,7 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value={"value": []})
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
@@ -559,6 +588,7 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value=sample_data)
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
@@ -598,6 +628,7 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value=sample_data)
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
@@ -912,6 +943,7 @@ class TestRCEPSEDataUpdateCoordinator:
         with patch.object(coordinator, 'session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
+            mock_response.headers = {}
             mock_response.json = AsyncMock(return_value=sample_data)
             
             mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
@@ -923,4 +955,658 @@ class TestRCEPSEDataUpdateCoordinator:
             assert result["raw_data"][0]["rce_pln"] == "300.00"
             assert result["raw_data"][0]["rce_pln_neg_to_zero"] == "300.00"
             assert result["raw_data"][1]["rce_pln"] == "-50.00"
-            assert result["raw_data"][1]["rce_pln_neg_to_zero"] == "0.00" 
\ No newline at end of file
+            assert result["raw_data"][1]["rce_pln_neg_to_zero"] == "0.00" 
+
+class TestBoundaryScheduler:
+
+    @pytest.mark.asyncio
+    async def test_listeners_fire_on_quarter_hour_boundaries(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        slot_listener = Mock()
+        day_listener = Mock()
+
+        with patch("custom_components.rce_prices.coordinator.async_track_point_in_time") as track, \
+                patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 23, 37, 12)):
+            remove_slot = coordinator.async_add_boundary_listener(slot_listener, STATE_REFRESH_SLOT)
+            coordinator.async_add_boundary_listener(day_listener, STATE_REFRESH_DAY)
+
+            assert track.call_count == 1
+            assert track.call_args[0][2] == datetime(2024, 1, 15, 23, 45)
+
+            coordinator._handle_boundary(datetime(2024, 1, 15, 23, 45))
+            assert slot_listener.call_count == 1
+            assert day_listener.call_count == 0
+            assert track.call_count == 2
+
+            coordinator._handle_boundary(datetime(2024, 1, 16, 0, 0))
+            assert slot_listener.call_count == 2
+            assert day_listener.call_count == 1
+
+            remove_slot()
+            coordinator._handle_boundary(datetime(2024, 1, 16, 14, 0))
+            assert slot_listener.call_count == 2
+            assert day_listener.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_timer_cancelled_without_listeners(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        unsub = Mock()
+
+        with patch("custom_components.rce_prices.coordinator.async_track_point_in_time", return_value=unsub):
+            remove = coordinator.async_add_boundary_listener(Mock())
+            remove()
+
+        unsub.assert_called_once()
+        assert coordinator._unsub_boundary is None
+
+    def test_next_slot_boundary(self):
+        assert next_slot_boundary(datetime(2024, 1, 15, 10, 0)) == datetime(2024, 1, 15, 10, 15)
+        assert next_slot_boundary(datetime(2024, 1, 15, 10, 14, 59, 999)) == datetime(2024, 1, 15, 10, 15)
+        assert next_slot_boundary(datetime(2024, 1, 15, 23, 50)) == datetime(2024, 1, 16, 0, 0)
+
+
+class TestStoredData:
+
+    def make_coordinator(self, mock_hass, stored):
+        config_entry = Mock()
+        config_entry.entry_id = "entry"
+        config_entry.options = {}
+        config_entry.data = {}
+        config_entry.async_create_background_task = Mock(side_effect=lambda hass, target, name: target.close())
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass, config_entry)
+        coordinator._store = Mock()
+        coordinator._store.async_load = AsyncMock(return_value=stored)
+        return coordinator
+
+    def make_stored(self, dates, last_api_fetch):
+        return {
+            "raw_data": [
+                record
+                for date in dates
+                for record in make_records(date, [100.0] * 96, f"{date} 00:00:00")
+            ],
+            "last_update": last_api_fetch,
+            "last_api_fetch": last_api_fetch,
+            "use_hourly_prices": False,
+        }
+
+    @pytest.mark.asyncio
+    async def test_first_refresh_serves_stored_data_without_network(self, mock_hass):
+        stored = self.make_stored(["2024-01-14", "2024-01-15", "2024-01-16"], "2024-01-15T14:05:00+01:00")
+        coordinator = self.make_coordinator(mock_hass, stored)
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T20:00:00+01:00")), \
+                patch.object(coordinator, "_fetch_data") as fetch:
+            await coordinator.async_config_entry_first_refresh()
+
+        fetch.assert_not_called()
+        coordinator.config_entry.async_create_background_task.assert_not_called()
+        assert {record["business_date"] for record in coordinator.data["raw_data"]} == {"2024-01-15", "2024-01-16"}
+        assert coordinator.data["series"].day("2024-01-16") is not None
+        assert coordinator._last_api_fetch == dt_util.parse_datetime("2024-01-15T14:05:00+01:00")
+
+    @pytest.mark.asyncio
+    async def test_stale_stored_data_refreshes_in_background(self, mock_hass, warsaw_time_zone):
+        stored = self.make_stored(["2024-01-15"], "2024-01-15T08:00:00+01:00")
+        coordinator = self.make_coordinator(mock_hass, stored)
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T13:30:00+01:00")):
+            await coordinator.async_config_entry_first_refresh()
+
+        assert coordinator.data["raw_data"] == stored["raw_data"]
+        coordinator.config_entry.async_create_background_task.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_outdated_or_mismatched_store_is_ignored(self, mock_hass):
+        outdated = self.make_stored(["2024-01-14"], "2024-01-14T20:00:00+01:00")
+        hourly = self.make_stored(["2024-01-15"], "2024-01-15T08:00:00+01:00")
+        hourly["use_hourly_prices"] = True
+
+        for stored in (None, outdated, hourly):
+            coordinator = self.make_coordinator(mock_hass, stored)
+            with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T10:00:00+01:00")):
+                assert await coordinator._async_load_stored_data() is None
+
+    @pytest.mark.asyncio
+    async def test_successful_fetch_is_stored(self, mock_hass):
+        coordinator = self.make_coordinator(mock_hass, None)
+        data = {"raw_data": [{"business_date": "2024-01-15"}], "last_update": "2024-01-15T10:00:00+01:00"}
+
+        with patch.object(coordinator, "_fetch_data", AsyncMock(return_value=data)):
+            coordinator.session = Mock()
+            await coordinator._async_update_data()
+
+        data_func, delay = coordinator._store.async_delay_save.call_args[0]
+        assert data_func()["raw_data"] == data["raw_data"]
+        assert data_func()["last_api_fetch"] == coordinator._last_api_fetch.isoformat()
+
+
+class TestPublicationSchedule:
+
+    def make_data(self, days):
+        records = [
+            record
+            for date, count in days.items()
+            for record in make_records(date, [100.0] * count, f"{date} 00:00:00")
+        ]
+        return {"raw_data": records, "series": PriceSeries.from_records(records)}
+
+    def test_date_completeness_follows_dst(self, warsaw_time_zone):
+        coordinator = RCEPSEDataUpdateCoordinator
+        data = self.make_data({"2024-01-15": 96, "2024-01-16": 95, "2024-03-31": 92, "2024-10-27": 96})
+
+        assert coordinator.is_date_complete(data, datetime(2024, 1, 15).date())
+        assert not coordinator.is_date_complete(data, datetime(2024, 1, 16).date())
+        assert not coordinator.is_date_complete(data, datetime(2024, 1, 17).date())
+        assert coordinator.is_date_complete(data, datetime(2024, 3, 31).date())
+        assert not coordinator.is_date_complete(data, datetime(2024, 10, 27).date())
+        assert not coordinator.is_date_complete(None, datetime(2024, 1, 15).date())
+
+    def test_next_fetch_follows_publication_window(self, mock_hass, warsaw_time_zone):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        today_only = self.make_data({"2024-01-15": 96})
+        both_days = self.make_data({"2024-01-15": 96, "2024-01-16": 96})
+
+        def plan(data, time):
+            moment = dt_util.parse_datetime(f"2024-01-15T{time}:00+01:00")
+            return coordinator._next_fetch_time(data, moment) - moment
+
+        assert plan(today_only, "09:00") == timedelta(hours=4)
+        assert plan(today_only, "13:10") == timedelta(minutes=15)
+        assert plan(today_only, "14:10") == timedelta(minutes=5)
+        assert plan(today_only, "14:40") == timedelta(minutes=2)
+        assert plan(today_only, "18:00") == timedelta(minutes=30)
+        assert plan(both_days, "14:40") == timedelta(hours=22, minutes=20)
+        assert plan(self.make_data({"2024-01-15": 40}), "14:40") == timedelta(minutes=30)
+
+    @pytest.mark.asyncio
+    async def test_complete_data_skips_fetch_until_next_window(self, mock_hass, warsaw_time_zone):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = self.make_data({"2024-01-15": 96, "2024-01-16": 96})
+        coordinator._last_api_fetch = dt_util.parse_datetime("2024-01-15T14:02:00+01:00")
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T22:00:00+01:00")), \
+                patch.object(coordinator, "_fetch_data") as fetch:
+            assert await coordinator._async_update_data() is coordinator.data
+
+        fetch.assert_not_called()
+        assert coordinator.update_interval == timedelta(hours=15)
+
+
+class TestIncrementalFetch:
+
+    def make_day(self, business_date, price, published):
+        records = make_records(business_date, [price] * 96, f"{business_date} 00:00:00")
+        for record in records:
+            record["publication_ts"] = published
+            record["rce_pln_neg_to_zero"] = record["rce_pln"]
+        return records
+
+    def make_coordinator(self, mock_hass, held, response):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = {"raw_data": held, "series": PriceSeries.from_records(held)}
+        coordinator.session = Mock()
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.json = AsyncMock(return_value={"value": response})
+        coordinator.session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        coordinator.session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_revalidates_complete_dates_and_merges(self, mock_hass, warsaw_time_zone):
+        today = self.make_day("2024-01-15", 100.0, "2024-01-14T13:00:00Z")
+        tomorrow = self.make_day("2024-01-16", 200.0, "2024-01-15T13:00:00Z")
+        coordinator = self.make_coordinator(mock_hass, today, [])
+        coordinator._validators["business_date eq '2024-01-15'"] = {"If-None-Match": '"today"'}
+
+        def respond(url, params, headers):
+            response = AsyncMock()
+            response.headers = {}
+            if "2024-01-15" in params["$filter"]:
+                response.status = 304
+            else:
+                response.status = 200
+                response.json = AsyncMock(return_value={"value": tomorrow})
+            context = Mock()
+            context.__aenter__ = AsyncMock(return_value=response)
+            context.__aexit__ = AsyncMock(return_value=None)
+            return context
+
+        coordinator.session.get.side_effect = respond
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")):
+            result = await coordinator._fetch_data()
+
+        requests = {call[1]["params"]["$filter"]: call[1]["headers"] for call in coordinator.session.get.call_args_list}
+        assert requests["business_date eq '2024-01-15'"]["If-None-Match"] == '"today"'
+        assert "If-None-Match" not in requests["business_date eq '2024-01-16'"]
+        assert result["raw_data"][:96] == today
+        assert result["series"].day("2024-01-16")[0]["rce_pln"] == "200.00"
+        assert len(result["raw_data"]) == 192
+
+    @pytest.mark.asyncio
+    async def test_recently_checked_complete_date_is_skipped(self, mock_hass, warsaw_time_zone):
+        today = self.make_day("2024-01-15", 100.0, "2024-01-14T13:00:00Z")
+        tomorrow = self.make_day("2024-01-16", 200.0, "2024-01-15T13:00:00Z")
+        coordinator = self.make_coordinator(mock_hass, today, tomorrow)
+        now = dt_util.parse_datetime("2024-01-15T14:00:00+01:00")
+        coordinator._dates_checked["2024-01-15"] = now - timedelta(hours=1)
+
+        with patch("homeassistant.util.dt.now", return_value=now):
+            result = await coordinator._fetch_data()
+
+        coordinator.session.get.assert_called_once()
+        assert coordinator.session.get.call_args[1]["params"]["$filter"] == "business_date eq '2024-01-16'"
+        assert result["raw_data"][:96] == today
+        assert len(result["raw_data"]) == 192
+        assert coordinator._dates_checked["2024-01-16"] == now
+
+        coordinator.data = result
+        assert coordinator._dates_to_fetch(now + timedelta(hours=4)) == []
+        assert coordinator._dates_to_fetch(now + timedelta(hours=5, minutes=30)) == ["2024-01-15"]
+        coordinator._validators["business_date eq '2024-01-16'"] = {"If-None-Match": '"v2"'}
+        assert coordinator._dates_to_fetch(now + timedelta(hours=4)) == ["2024-01-16"]
+
+    @pytest.mark.asyncio
+    async def test_revision_of_complete_date_is_picked_up(self, mock_hass, warsaw_time_zone):
+        held = self.make_day("2024-01-15", 100.0, "2024-01-14T13:00:00Z")
+        revised = self.make_day("2024-01-15", 120.0, "2024-01-15T09:00:00Z")
+        coordinator = self.make_coordinator(mock_hass, held, revised)
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T10:00:00+01:00")):
+            result = await coordinator._fetch_data()
+
+        assert result["series"].day("2024-01-15")[0]["rce_pln"] == "120.00"
+
+    @pytest.mark.asyncio
+    async def test_incomplete_or_unpublished_dates_are_refetched(self, mock_hass, warsaw_time_zone):
+        today = self.make_day("2024-01-15", 100.0, "2024-01-14T13:00:00Z")[:50]
+        coordinator = self.make_coordinator(mock_hass, today, [])
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")):
+            assert coordinator._dates_to_fetch(dt_util.now()) == ["2024-01-15", "2024-01-16"]
+            result = await coordinator._fetch_data()
+
+        assert result["raw_data"] == today
+
+    @pytest.mark.asyncio
+    async def test_older_publication_does_not_replace_held_date(self, mock_hass, warsaw_time_zone):
+        held = self.make_day("2024-01-16", 200.0, "2024-01-15T15:00:00Z")
+        stale = self.make_day("2024-01-16", 150.0, "2024-01-15T13:00:00Z")
+        revised = self.make_day("2024-01-16", 180.0, "2024-01-15T16:00:00Z")
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")):
+            coordinator = self.make_coordinator(mock_hass, held, [])
+            assert coordinator._merge_records(stale, "2024-01-15") == held
+            assert coordinator._merge_records(revised, "2024-01-15") == revised
+
+
+class TestRevalidation:
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_decoding_and_processing(self, mock_hass, warsaw_time_zone):
+        records = make_records("2024-01-15", [100.0] * 4, "2024-01-15 00:00:00")
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+        response = AsyncMock()
+        response.status = 200
+        response.headers = {"ETag": '"v1"', "Last-Modified": "Mon, 15 Jan 2024 12:00:00 GMT"}
+        response.json = AsyncMock(return_value={"value": records})
+        coordinator.session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        coordinator.session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")):
+            coordinator.data = await coordinator._fetch_data()
+
+            headers = coordinator.session.get.call_args[1]["headers"]
+            assert headers["Accept-Encoding"] == "gzip"
+            assert "If-None-Match" not in headers
+
+            response.status = 304
+            response.json.reset_mock()
+            with patch.object(coordinator, "_add_neg_to_zero_key") as process:
+                assert await coordinator._fetch_data() is coordinator.data
+
+        headers = coordinator.session.get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 15 Jan 2024 12:00:00 GMT"
+        response.json.assert_not_called()
+        process.assert_not_called()
+
+
+class TestPagination:
+
+    def make_response(self, body):
+        response = AsyncMock()
+        response.status = 200
+        response.headers = {}
+        response.json = AsyncMock(return_value=body)
+        context = Mock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=None)
+        return context
+
+    @pytest.mark.asyncio
+    async def test_follows_next_link_pages(self, mock_hass, warsaw_time_zone):
+        records = make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+        coordinator.session.get.side_effect = [
+            self.make_response({"value": records[:40], "@odata.nextLink": "https://next/1"}),
+            self.make_response({"value": records[40:80], "@odata.nextLink": "https://next/2"}),
+            self.make_response({"value": records[80:]}),
+        ]
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T10:00:00+01:00")), \
+                patch.object(coordinator, "_dates_to_fetch", return_value=["2024-01-15"]):
+            result = await coordinator._fetch_data()
+
+        assert len(result["raw_data"]) == 96
+        assert [call[0][0] for call in coordinator.session.get.call_args_list[1:]] == ["https://next/1", "https://next/2"]
+        assert coordinator.session.get.call_args_list[1][1]["params"] is None
+
+    @pytest.mark.asyncio
+    async def test_page_limit_stops_following(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+        coordinator.session.get.side_effect = lambda *args, **kwargs: self.make_response(
+            {"value": [{}], "@odata.nextLink": "https://next"}
+        )
+
+        with patch("custom_components.rce_prices.coordinator.API_MAX_PAGES", 3):
+            pages = [records async for records in coordinator._async_iter_pages({"value": [{}], "@odata.nextLink": "x"})]
+
+        assert len(pages) == 3
+        assert coordinator.session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_history_chunk_written_page_by_page(self, mock_hass):
+        records = make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.history = Mock()
+        coordinator.history.write.side_effect = lambda records, seen: len(records)
+        mock_hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+        coordinator.session = Mock()
+        coordinator.session.get.side_effect = [
+            self.make_response({"value": records[:50], "@odata.nextLink": "https://next/1"}),
+            self.make_response({"value": records[50:]}),
+        ]
+
+        count = await coordinator.async_fetch_history(datetime(2024, 1, 15).date(), datetime(2024, 1, 21).date())
+
+        assert count == 96
+        calls = coordinator.history.write.call_args_list
+        assert [len(call[0][0]) for call in calls] == [50, 46]
+        assert calls[0][0][1] is calls[1][0][1]
+        assert coordinator.session.get.call_args_list[0][1]["params"]["$filter"] == \
+            "business_date ge '2024-01-15' and business_date le '2024-01-21'"
+
+
+    @pytest.mark.asyncio
+    async def test_history_backfill_holds_a_bounded_number_of_records(self, mock_hass):
+        page_size, page_count = 50, 200
+        held = {"now": 0, "peak": 0}
+
+        class Record(dict):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                held["now"] += 1
+                held["peak"] = max(held["peak"], held["now"])
+
+            def __del__(self):
+                held["now"] -= 1
+
+        class Response:
+            status = 200
+            headers = {}
+
+            def __init__(self, page):
+                self.page = page
+
+            async def json(self):
+                value = [Record(dtime="2024-01-15 00:15:00", rce_pln="100.00", business_date="2024-01-15")
+                         for _ in range(page_size)]
+                if self.page + 1 < page_count:
+                    return {"value": value, "@odata.nextLink": f"https://next/{self.page + 1}"}
+                return {"value": value}
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                return None
+
+        class Session:
+            def get(self, url, params=None, headers=None):
+                return Response(int(url.rsplit("/", 1)[1]) if "next" in url else 0)
+
+        async def run_in_executor(func, *args):
+            return func(*args)
+
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Session()
+        coordinator.history = Mock()
+        coordinator.history.write = lambda records, seen: len(records)
+        mock_hass.async_add_executor_job = run_in_executor
+
+        count = await coordinator.async_fetch_history(datetime(2024, 1, 1).date(), datetime(2024, 3, 31).date())
+
+        assert count == page_size * page_count
+        assert held["peak"] <= 2 * page_size
+
+
+class TestPerDateFetch:
+
+    def make_coordinator(self, mock_hass, responses):
+        """``responses`` maps a business date to its records, an exception, an HTTP status or None to hang."""
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+        running = {"now": 0, "peak": 0}
+
+        async def enter(business_date, *args):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0)
+            running["now"] -= 1
+            outcome = responses[business_date]
+            if outcome is None:
+                await asyncio.sleep(3600)
+            if isinstance(outcome, Exception):
+                raise outcome
+            response = AsyncMock()
+            response.headers = {}
+            response.status = outcome if isinstance(outcome, int) else 200
+            response.json = AsyncMock(return_value={"value": outcome})
+            return response
+
+        def get(url, params=None, headers=None):
+            business_date = params["$filter"].split("'")[1]
+            context = Mock()
+            context.__aenter__ = AsyncMock(side_effect=functools.partial(enter, business_date))
+            context.__aexit__ = AsyncMock(return_value=None)
+            return context
+
+        coordinator.session.get.side_effect = get
+        return coordinator, running
+
+    @pytest.mark.asyncio
+    async def test_dates_are_fetched_concurrently_and_merged(self, mock_hass, warsaw_time_zone):
+        today = make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+        tomorrow = make_records("2024-01-16", [200.0] * 96, "2024-01-16 00:00:00")
+        coordinator, running = self.make_coordinator(mock_hass, {"2024-01-15": today, "2024-01-16": tomorrow})
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")):
+            result = await coordinator._fetch_data()
+
+        assert running["peak"] == 2
+        assert len(result["raw_data"]) == 192
+        assert result["series"].day("2024-01-16")[0]["rce_pln"] == "200.00"
+
+    @pytest.mark.asyncio
+    async def test_failed_date_keeps_the_others(self, mock_hass, warsaw_time_zone):
+        today = make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+        coordinator, _ = self.make_coordinator(mock_hass, {"2024-01-15": today, "2024-01-16": 503})
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")):
+            result = await coordinator._fetch_data()
+
+        assert len(result["raw_data"]) == 96
+        assert result["series"].day("2024-01-16") is None
+
+    @pytest.mark.asyncio
+    async def test_hung_date_times_out_alone(self, mock_hass, warsaw_time_zone):
+        today = make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+        coordinator, _ = self.make_coordinator(mock_hass, {"2024-01-15": today, "2024-01-16": None})
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")), \
+                patch("custom_components.rce_prices.coordinator.API_DATE_TIMEOUT", 0.01):
+            result = await coordinator._fetch_data()
+
+        assert len(result["raw_data"]) == 96
+        assert result["series"].day("2024-01-15")[0]["rce_pln"] == "100.00"
+        assert result["series"].day("2024-01-16") is None
+
+    @pytest.mark.asyncio
+    async def test_all_dates_failing_raises(self, mock_hass, warsaw_time_zone):
+        coordinator, _ = self.make_coordinator(mock_hass, {
+            "2024-01-15": aiohttp.ClientError("reset"),
+            "2024-01-16": 500,
+        })
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T14:00:00+01:00")), \
+                pytest.raises(PSEApiError) as error:
+            await coordinator._fetch_data()
+
+        assert error.value.status is None
+        assert error.value.retryable
+
+
+class TestHistoryFeed:
+
+    def make_coordinator(self, mock_hass, options):
+        config_entry = Mock()
+        config_entry.entry_id = "entry"
+        config_entry.options = options
+        config_entry.data = {}
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass, config_entry)
+        coordinator.history = Mock()
+        mock_hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_fetched_records_are_recorded_before_processing(self, mock_hass):
+        coordinator = self.make_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
+        mock_hass.async_add_executor_job = Mock(
+            side_effect=lambda func, *args: asyncio.get_running_loop().run_in_executor(None, func, *args)
+        )
+        records = make_records("2024-01-15", [100.0, 200.0, 300.0, 400.0], "2024-01-15 10:00:00")
+        coordinator.session = Mock()
+        response = AsyncMock()
+        response.status = 200
+        response.headers = {}
+        response.json = AsyncMock(return_value={"value": records})
+        coordinator.session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        coordinator.session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with patch.object(coordinator, "_dates_to_fetch", return_value=["2024-01-15"]):
+            result = await coordinator._fetch_data()
+        await coordinator.async_close()
+
+        coordinator.history.write.assert_called_once_with(records)
+        assert result["raw_data"][0]["rce_pln"] == "250.00"
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_queued_writes(self, mock_hass):
+        coordinator = self.make_coordinator(mock_hass, {})
+        mock_hass.async_add_executor_job = Mock(
+            side_effect=lambda func, *args: asyncio.get_running_loop().run_in_executor(None, func, *args)
+        )
+        calls = []
+        coordinator.history.write.side_effect = lambda records: time.sleep(0.05) or calls.append("write")
+        coordinator.history.close.side_effect = lambda: calls.append("close")
+
+        coordinator._async_record_history(make_records("2024-01-15", [100.0], "2024-01-15 10:00:00"))
+        await coordinator.async_close()
+
+        assert calls == ["write", "close"]
+        assert not coordinator._history_writes
+
+    @pytest.mark.asyncio
+    async def test_compaction_applies_retention(self, mock_hass):
+        coordinator = self.make_coordinator(mock_hass, {CONF_HISTORY_RETENTION_DAYS: 30.0})
+        coordinator.history.compact.return_value = 0
+
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 3, 31, 3, 0)):
+            await coordinator.async_compact_history()
+        coordinator.config_entry.options = {CONF_HISTORY_RETENTION_DAYS: 0}
+        await coordinator.async_compact_history()
+
+        assert [call[0][0] for call in coordinator.history.compact.call_args_list] == ["2024-03-01", None]
+
+
+class TestPriceSlots:
+
+    @pytest.mark.asyncio
+    async def test_series_slots_override_history_outside_held_dates(self, mock_hass):
+        held = make_records("2024-01-15", [100.0, -20.0], "2024-01-15 00:00:00")
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = {"raw_data": held, "series": PriceSeries.from_records(held)}
+        coordinator.history = Mock()
+        stored = PriceSeries.from_records(
+            make_records("2024-01-14", [50.0, 60.0], "2024-01-14 23:30:00")
+        )
+        coordinator.async_query_history = AsyncMock(return_value=(stored.starts, stored.prices))
+
+        starts, prices, neg_to_zero = await coordinator.async_get_price_slots(
+            datetime(2024, 1, 14, 23, 45), datetime(2024, 1, 15, 0, 30)
+        )
+
+        coordinator.async_query_history.assert_awaited_once_with(
+            datetime(2024, 1, 14).date(), datetime(2024, 1, 14).date()
+        )
+        assert [datetime(1970, 1, 1) + timedelta(seconds=start) for start in starts] == [
+            datetime(2024, 1, 14, 23, 45), datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 15, 0, 15)
+        ]
+        assert list(prices) == [60.0, 100.0, -20.0]
+        assert list(neg_to_zero) == [60.0, 100.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_held_dates_skip_the_history_store(self, mock_hass):
+        held = make_records("2024-01-15", [100.0] * 4, "2024-01-15 00:00:00")
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = {"raw_data": held, "series": PriceSeries.from_records(held)}
+        coordinator.history = Mock()
+        coordinator.async_query_history = AsyncMock()
+
+        starts, _, _ = await coordinator.async_get_price_slots(datetime(2024, 1, 15), datetime(2024, 1, 15, 1))
+
+        coordinator.async_query_history.assert_not_called()
+        assert len(starts) == 4
+
+
+class TestChangeDetection:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_prices_keep_current_data(self, mock_hass, warsaw_time_zone):
+        records = make_records("2024-01-15", [100.0] * 4, "2024-01-15 00:00:00")
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+        response = AsyncMock()
+        response.status = 200
+        response.headers = {}
+        response.json = AsyncMock(side_effect=lambda: {"value": [dict(record) for record in records]})
+        coordinator.session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        coordinator.session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T10:00:00+01:00")):
+            coordinator.data = await coordinator._fetch_data()
+            assert await coordinator._fetch_data() is coordinator.data
+
+            records[0]["rce_pln"] = "90.00"
+            changed = await coordinator._fetch_data()
+
+        assert changed is not coordinator.data
+        assert changed["fingerprint"] != coordinator.data["fingerprint"]
+        assert coordinator.always_update is False
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.rce_prices.day_analytics import DayAnalytics
+from custom_components.rce_prices.sensors.today_stats import RCETodayAvgPriceSensor
+
+from .test_price_series import make_records
+
+
+class TestDayAnalytics:
+
+    def test_statistics_and_extremes(self):
+        records = make_records("2024-01-15", [300.0, 150.0, 150.0, 420.0, 200.0], "2024-01-15 10:00:00")
+
+        analytics = DayAnalytics(records)
+
+        assert analytics.count == 5
+        assert analytics.average == 244.0
+        assert analytics.median == 200.0
+        assert analytics.minimum == 150.0
+        assert analytics.maximum == 420.0
+        assert analytics.argmin == 1
+        assert analytics.argmax == 3
+        assert analytics.min_range == "10:15 - 10:45"
+        assert analytics.max_range == "10:45 - 11:00"
+
+    def test_records_without_period(self):
+        analytics = DayAnalytics([{"rce_pln": "300.00"}, {"rce_pln": "100.00"}])
+
+        assert analytics.average == 200.0
+        assert analytics.min_records == []
+        assert analytics.min_start is None
+        assert analytics.max_range is None
+
+
+class TestDayAnalyticsCache:
+
+    def test_cached_per_series_and_business_date(self, mock_coordinator):
+        records = make_records("2024-01-15", [300.0, 150.0], "2024-01-15 10:00:00")
+        mock_coordinator.data = {"raw_data": records}
+        sensor = RCETodayAvgPriceSensor(mock_coordinator)
+        day = sensor.get_price_series().day("2024-01-15")
+
+        with patch("custom_components.rce_prices.shared_base.DayAnalytics",
+                   wraps=DayAnalytics) as analytics_class:
+            first = sensor.get_day_analytics(day)
+            second = sensor.get_day_analytics(day)
+
+        assert first is second
+        assert analytics_class.call_count == 1
+
+        mock_coordinator.data = {"raw_data": make_records("2024-01-15", [10.0], "2024-01-15 10:00:00")}
+        refreshed = sensor.get_day_analytics(sensor.get_price_series().day("2024-01-15"))
+
+        assert refreshed is not first
+        assert refreshed.average == 10.0
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_prices.history import PriceHistoryStore, async_backfill, plan_chunks
+
+from .test_price_series import make_records
+
+
+@pytest.fixture
+def warsaw_time_zone():
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Warsaw"))
+    yield
+    dt_util.set_default_time_zone(dt_util.UTC)
+
+
+class TestPriceHistoryStore:
+
+    def test_write_and_count_dates(self, tmp_path):
+        store = PriceHistoryStore(str(tmp_path / "history.db"))
+        records = (
+            make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+            + make_records("2024-01-16", [200.0] * 10, "2024-01-16 00:00:00")
+        )
+
+        assert store.write(records + [{"dtime": "bad"}]) == 106
+        assert store.write(records) == 106
+        assert store.date_counts("2024-01-01", "2024-01-31") == {"2024-01-15": 96, "2024-01-16": 10}
+        assert store.date_counts("2024-01-16", "2024-01-16") == {"2024-01-16": 10}
+        store.close()
+
+    def test_newer_publication_wins(self, tmp_path):
+        store = PriceHistoryStore(str(tmp_path / "history.db"))
+        revised, stale = (make_records("2024-01-15", [price], "2024-01-15 10:00:00") for price in (120.0, 90.0))
+        revised[0]["publication_ts"] = "2024-01-14T15:00:00Z"
+        stale[0]["publication_ts"] = "2024-01-14T13:00:00Z"
+
+        store.write(revised)
+        store.write(stale)
+
+        assert store._connect().execute("SELECT price FROM prices").fetchall() == [(120.0,)]
+        store.close()
+
+    def test_range_query_and_compaction(self, tmp_path):
+        store = PriceHistoryStore(str(tmp_path / "history.db"))
+        for day in range(1, 32):
+            business_date = f"2024-03-{day:02d}"
+            store.write(make_records(business_date, [float(day)] * 96, f"{business_date} 00:00:00"))
+
+        starts, prices = store.columns(date(2024, 3, 10), date(2024, 3, 11))
+
+        assert len(starts) == 192
+        assert list(starts) == sorted(starts)
+        assert prices[0] == 10.0 and prices[-1] == 11.0
+        assert store.compact("2024-03-30") == 29 * 96
+        assert store.compact(None) == 0
+        assert store.date_counts("2024-01-01", "2024-12-31") == {"2024-03-30": 96, "2024-03-31": 96}
+        store.close()
+
+
+    def test_fall_back_day_keeps_repeated_quarter_hours(self, tmp_path, warsaw_time_zone):
+        store = PriceHistoryStore(str(tmp_path / "history.db"))
+        records = (
+            make_records("2024-10-27", [float(index) for index in range(12)], "2024-10-27 00:00:00")
+            + make_records("2024-10-27", [float(index) for index in range(100, 188)], "2024-10-27 02:00:00")
+        )
+        seen = {}
+
+        assert store.write(records[:10], seen) + store.write(records[10:], seen) == 100
+        starts, prices = store.columns(date(2024, 10, 27), date(2024, 10, 27))
+
+        assert store.date_counts("2024-10-27", "2024-10-27") == {"2024-10-27": 100}
+        assert len(starts) == 100
+        assert list(prices[8:16]) == [8.0, 100.0, 9.0, 101.0, 10.0, 102.0, 11.0, 103.0]
+        store.close()
+
+    def test_migrates_slot_start_keyed_table(self, tmp_path, warsaw_time_zone):
+        path = str(tmp_path / "history.db")
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE prices (slot_start INTEGER PRIMARY KEY, business_date TEXT NOT NULL, "
+            "period TEXT, price REAL NOT NULL, publication_ts TEXT) WITHOUT ROWID"
+        )
+        connection.execute("CREATE INDEX prices_business_date ON prices (business_date)")
+        connection.execute("INSERT INTO prices VALUES (1705312800, '2024-01-15', '10:00 - 10:15', 120.0, NULL)")
+        connection.commit()
+        connection.close()
+
+        store = PriceHistoryStore(path)
+
+        assert store._connect().execute("SELECT slot_start, utc_offset, price FROM prices").fetchall() == [
+            (1705312800, 3600, 120.0)
+        ]
+        store.close()
+
+
+class TestPlanChunks:
+
+    def test_chunks_cover_range_and_skip_complete(self):
+        chunks = plan_chunks(date(2024, 1, 1), date(2024, 1, 17), 7, {f"2024-01-{day:02d}" for day in range(8, 15)})
+
+        assert chunks == [(date(2024, 1, 1), date(2024, 1, 7)), (date(2024, 1, 15), date(2024, 1, 17))]
+        assert plan_chunks(date(2024, 1, 2), date(2024, 1, 1), 7) == []
+
+
+class TestAsyncBackfill:
+
+    @pytest.mark.asyncio
+    async def test_bounded_parallelism_and_progress(self):
+        running = {"now": 0, "peak": 0}
+        progress = []
+
+        async def fetch_chunk(first, last):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0)
+            running["now"] -= 1
+            return 96
+
+        chunks = plan_chunks(date(2024, 1, 1), date(2024, 1, 10), 1)
+        result = await async_backfill(fetch_chunk, chunks, lambda *args: progress.append(args), parallel=3)
+
+        assert result == {"chunks": 10, "records": 960, "failed": []}
+        assert running["peak"] == 3
+        assert progress[-1] == (10, 10, 960)
+
+    @pytest.mark.asyncio
+    async def test_failed_chunks_are_retried_then_reported(self):
+        attempts = {}
+
+        async def fetch_chunk(first, last):
+            attempts[first] = attempts.get(first, 0) + 1
+            if first == date(2024, 1, 1) and attempts[first] == 1:
+                raise asyncio.TimeoutError()
+            if first == date(2024, 1, 2):
+                raise UpdateFailed("API returned status 500")
+            return 96
+
+        with patch("custom_components.rce_prices.history.asyncio.sleep") as sleep:
+            result = await async_backfill(fetch_chunk, plan_chunks(date(2024, 1, 1), date(2024, 1, 2), 1), retries=3)
+
+        assert attempts == {date(2024, 1, 1): 2, date(2024, 1, 2): 3}
+        assert sleep.call_count == 3
+        assert result["records"] == 96
+        assert result["failed"] == [{"start": "2024-01-02", "end": "2024-01-02", "error": "API returned status 500"}]
@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
-from custom_components.rce_prices import async_setup_entry, async_unload_entry
+from custom_components.rce_prices import async_setup_entry, async_unload_entry, async_update_options
+from custom_components.rce_prices.sensor import async_setup_entry as async_setup_sensor_entry
 from custom_components.rce_prices.config_flow import RCEConfigFlow
-from custom_components.rce_prices.const import DOMAIN
+from custom_components.rce_prices.const import (
+    CONF_CHEAPEST_WINDOW_DURATION_HOURS,
+    CONF_PRICE_SLOT_SENSORS,
+    CONF_USE_HOURLY_PRICES,
+    CONF_WINDOW_HORIZON_MODE,
+    DOMAIN,
+    PRICE_SLOT_SENSORS_HOURLY,
+    PRICE_SLOT_SENSORS_QUARTER,
+)
+from custom_components.rce_prices.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_prices.history import PriceHistoryStore
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.sensors import RCETodayHourPriceSensor, RCETodayQuarterPriceSensor
+from custom_components.rce_prices.sensors.custom_windows import RCETodayCheapestWindowStartSensor
+from custom_components.rce_prices.sensors.base import RCEBaseSensor
+
+from .test_price_series import make_records
 
 
 class TestRCEPSEIntegration:
@@ -58,6 +77,160 @@ class TestRCEPSEIntegration:
         assert mock_entry.entry_id not in mock_hass.data[DOMAIN]
 
 
+class TestOptionsUpdate:
+
+    def make_entry(self, mock_hass, options):
+        entry = Mock(spec=ConfigEntry)
+        entry.entry_id = "test_entry_id"
+        entry.data = {}
+        entry.options = options
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass, entry)
+        coordinator.applied_options = {CONF_USE_HOURLY_PRICES: options.get(CONF_USE_HOURLY_PRICES)}
+        coordinator.async_update_listeners = Mock()
+        mock_hass.data[DOMAIN] = {entry.entry_id: coordinator}
+        mock_hass.config_entries = Mock()
+        mock_hass.config_entries.async_reload = AsyncMock()
+        return entry, coordinator
+
+    @pytest.mark.asyncio
+    async def test_window_and_slot_options_apply_without_reload(self, mock_hass):
+        entry, coordinator = self.make_entry(mock_hass, {CONF_CHEAPEST_WINDOW_DURATION_HOURS: 2})
+        entry.options = {CONF_CHEAPEST_WINDOW_DURATION_HOURS: 3, CONF_PRICE_SLOT_SENSORS: PRICE_SLOT_SENSORS_HOURLY}
+
+        with patch("custom_components.rce_prices.async_dispatcher_send") as send:
+            await async_update_options(mock_hass, entry)
+
+        mock_hass.config_entries.async_reload.assert_not_called()
+        send.assert_called_once_with(mock_hass, "rce_prices_options_updated_test_entry_id")
+        coordinator.async_update_listeners.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_hourly_prices_option_reloads(self, mock_hass):
+        entry, coordinator = self.make_entry(mock_hass, {CONF_USE_HOURLY_PRICES: False})
+        entry.options = {CONF_USE_HOURLY_PRICES: True}
+
+        with patch("custom_components.rce_prices.async_dispatcher_send") as send:
+            await async_update_options(mock_hass, entry)
+
+        mock_hass.config_entries.async_reload.assert_awaited_once_with(entry.entry_id)
+        send.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_horizon_mode_toggle_moves_boundary_listener(self, mock_hass):
+        entry, coordinator = self.make_entry(mock_hass, {CONF_WINDOW_HORIZON_MODE: False})
+        sensor = RCETodayCheapestWindowStartSensor(coordinator, entry)
+        sensor._async_write_state_if_changed = Mock()
+
+        with patch("custom_components.rce_prices.coordinator.async_track_point_in_time"), \
+                patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 10, 5)):
+            sensor._async_follow_boundaries()
+            coordinator._handle_boundary(datetime(2024, 1, 15, 10, 15))
+            assert sensor._async_write_state_if_changed.call_count == 0
+
+            entry.options = {CONF_WINDOW_HORIZON_MODE: True}
+            sensor._handle_coordinator_update()
+            sensor._async_write_state_if_changed.reset_mock()
+            coordinator._handle_boundary(datetime(2024, 1, 15, 10, 30))
+            assert sensor._async_write_state_if_changed.call_count == 1
+
+            entry.options = {CONF_WINDOW_HORIZON_MODE: False}
+            sensor._handle_coordinator_update()
+            sensor._async_write_state_if_changed.reset_mock()
+            coordinator._handle_boundary(datetime(2024, 1, 15, 10, 45))
+            assert sensor._async_write_state_if_changed.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_sensor_platform_swaps_slot_sensors(self, mock_hass):
+        entry = Mock(spec=ConfigEntry)
+        entry.entry_id = "test_entry_id"
+        entry.data = {}
+        entry.options = {CONF_PRICE_SLOT_SENSORS: PRICE_SLOT_SENSORS_HOURLY}
+        mock_hass.data[DOMAIN] = {entry.entry_id: RCEPSEDataUpdateCoordinator(mock_hass)}
+        batches = []
+
+        with patch("custom_components.rce_prices.sensor.async_dispatcher_connect") as connect:
+            await async_setup_sensor_entry(mock_hass, entry, batches.append)
+        apply_options = connect.call_args[0][2]
+        hourly = [sensor for sensor in batches[0] if isinstance(sensor, RCETodayHourPriceSensor)]
+        assert len(hourly) == 24
+
+        entry.options = {CONF_PRICE_SLOT_SENSORS: PRICE_SLOT_SENSORS_QUARTER}
+        registry = Mock()
+        registry.async_get_entity_id.side_effect = lambda domain, platform, unique_id: f"{domain}.{unique_id}"
+        with patch.object(RCEBaseSensor, "async_remove", AsyncMock()) as remove, \
+                patch("custom_components.rce_prices.sensor.er.async_get", return_value=registry):
+            await apply_options()
+            await apply_options()
+
+        assert remove.await_count == 48
+        remove.assert_awaited_with(force_remove=True)
+        removed = [call[0][0] for call in registry.async_remove.call_args_list]
+        assert len(removed) == 48
+        assert {f"sensor.{sensor.unique_id}" for sensor in hourly} <= set(removed)
+        assert len(batches) == 2
+        assert len([sensor for sensor in batches[1] if isinstance(sensor, RCETodayQuarterPriceSensor)]) == 96
+
+
+class TestGetPrices:
+
+    @pytest.fixture
+    def warsaw_time_zone(self):
+        dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Warsaw"))
+        yield
+        dt_util.set_default_time_zone(dt_util.UTC)
+
+    async def setup_service(self, mock_hass, tmp_path, records):
+        entry = Mock(spec=ConfigEntry)
+        entry.entry_id = "test_entry_id"
+        entry.data = {}
+        entry.options = {}
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass, entry)
+        coordinator.data = {"raw_data": records, "series": PriceSeries.from_records(records)}
+        coordinator.history = PriceHistoryStore(str(tmp_path / "history.db"))
+        coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_hass.async_add_executor_job = AsyncMock(side_effect=lambda job, *args: job(*args))
+        mock_hass.services = Mock()
+        mock_hass.config_entries = Mock()
+        mock_hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
+
+        with patch("custom_components.rce_prices.RCEPSEDataUpdateCoordinator", return_value=coordinator), \
+                patch("custom_components.rce_prices.async_track_time_interval"):
+            await async_setup_entry(mock_hass, entry)
+
+        return next(
+            call[0][2] for call in mock_hass.services.async_register.call_args_list if call[0][1] == "get_prices"
+        )
+
+    @pytest.mark.asyncio
+    async def test_fall_back_day_keeps_repeated_quarter_hours(self, mock_hass, tmp_path, warsaw_time_zone):
+        records = (
+            make_records("2024-10-27", [float(index) for index in range(12)], "2024-10-27 00:00:00")
+            + make_records("2024-10-27", [float(index) for index in range(100, 188)], "2024-10-27 02:00:00")
+        )
+        get_prices = await self.setup_service(mock_hass, tmp_path, records)
+        call = Mock()
+        call.data = {
+            "start": datetime(2024, 10, 27),
+            "end": datetime(2024, 10, 28),
+            "resolution": 15,
+            "fields": ["start", "price"],
+        }
+
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 10, 27, 12, 0)):
+            response = await get_prices(call)
+
+        assert response["count"] == 100
+        starts = response["prices"]["start"]
+        assert len(set(starts)) == 100
+        assert starts[8:10] == ["2024-10-27T02:00:00+02:00", "2024-10-27T02:15:00+02:00"]
+        assert starts[12:14] == ["2024-10-27T02:00:00+01:00", "2024-10-27T02:15:00+01:00"]
+        assert response["prices"]["price"][8:16] == [8.0, 9.0, 10.0, 11.0, 100.0, 101.0, 102.0, 103.0]
+
+        call.data = {**call.data, "resolution": 60}
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 10, 27, 12, 0)):
+            assert (await get_prices(call))["count"] == 25
+
+
 class TestRCEPSEConfigFlow:
 
     @pytest.mark.asyncio
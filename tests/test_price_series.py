@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import math
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from custom_components.rce_prices.price_calculator import PriceCalculator
+from custom_components.rce_prices.price_series import PriceDay, PriceSeries, hourly_means
+from custom_components.rce_prices.sensors.base import RCEBaseSensor
+
+
+def make_records(business_date: str, prices: list[float], first_dtime: str) -> list[dict]:
+    start = datetime.strptime(first_dtime, "%Y-%m-%d %H:%M:%S")
+    records = []
+    for index, price in enumerate(prices):
+        period_start = start + timedelta(minutes=15 * index)
+        period_end = period_start + timedelta(minutes=15)
+        records.append({
+            "dtime": period_end.strftime("%Y-%m-%d %H:%M:%S"),
+            "period": f"{period_start.strftime('%H:%M')} - {period_end.strftime('%H:%M')}",
+            "rce_pln": f"{price:.2f}",
+            "business_date": business_date,
+        })
+    return records
+
+
+class TestPriceSeries:
+
+    def test_from_records_builds_sorted_columns(self):
+        records = make_records("2024-01-15", [300.0, -10.0, 250.0], "2024-01-15 10:00:00")
+        series = PriceSeries.from_records(list(reversed(records)))
+
+        assert len(series) == 3
+        assert series.records == records
+        assert list(series.prices) == [300.0, -10.0, 250.0]
+        assert list(series.prices_neg_to_zero) == [300.0, 0.0, 250.0]
+        assert series.slot_start(0) == datetime(2024, 1, 15, 10, 0)
+        assert series.slot_end(2) == datetime(2024, 1, 15, 10, 45)
+        assert series.date_offsets == {"2024-01-15": (0, 3)}
+
+    def test_from_records_skips_invalid_records(self):
+        records = make_records("2024-01-15", [300.0, 310.0], "2024-01-15 10:00:00")
+        records.append({"dtime": "invalid", "rce_pln": "1.00", "business_date": "2024-01-15"})
+        records.append({"dtime": "2024-01-15 11:00:00", "rce_pln": "n/a", "business_date": "2024-01-15"})
+
+        series = PriceSeries.from_records(records)
+
+        assert len(series) == 2
+
+    def test_day_views_are_cached_and_carry_columns(self):
+        records = (
+            make_records("2024-01-15", [300.0, 310.0], "2024-01-15 23:30:00")
+            + make_records("2024-01-16", [200.0], "2024-01-16 00:00:00")
+        )
+        series = PriceSeries.from_records(records)
+
+        day = series.day("2024-01-16")
+
+        assert isinstance(day, PriceDay)
+        assert day is series.day("2024-01-16")
+        assert list(day) == records[2:]
+        assert list(day.prices) == [200.0]
+        assert series.day("2024-01-17") is None
+
+    def test_index_lookups_use_half_open_slots(self):
+        series = PriceSeries.from_records(
+            make_records("2024-01-15", [300.0, 310.0, 320.0], "2024-01-15 10:00:00")
+        )
+
+        assert series.index_at(datetime(2024, 1, 15, 10, 0)) == 0
+        assert series.index_at(datetime(2024, 1, 15, 10, 15)) == 1
+        assert series.index_at(datetime(2024, 1, 15, 10, 44, 59)) == 2
+        assert series.index_at(datetime(2024, 1, 15, 10, 45)) is None
+        assert series.index_at(datetime(2024, 1, 15, 9, 59)) is None
+        assert series.index_ended_before(datetime(2024, 1, 15, 12, 0)) == 2
+        assert series.index_ended_before(datetime(2024, 1, 15, 10, 10)) is None
+
+    def test_slot_index_handles_gaps(self):
+        records = make_records("2024-01-15", [300.0, 310.0, 320.0, 330.0], "2024-01-15 10:00:00")
+        del records[1:3]
+        series = PriceSeries.from_records(records)
+
+        assert series.index_for_slot(date(2024, 1, 15), 40) == 0
+        assert series.index_for_slot(date(2024, 1, 15), 41) is None
+        assert series.index_for_slot(date(2024, 1, 15), 43) == 1
+        assert series.index_for_slot(date(2024, 1, 15), 96) is None
+        assert series.index_at(datetime(2024, 1, 15, 10, 20)) is None
+        assert series.index_ended_before(datetime(2024, 1, 15, 10, 40)) == 0
+
+
+    def test_hourly_means_average_each_clock_hour(self):
+        series = PriceSeries.from_records(
+            make_records("2024-01-15", [300.0, 320.0, 340.0, 360.0, 100.0, -50.0], "2024-01-15 10:00:00")
+        )
+
+        hours, prices, neg_to_zero = hourly_means(series.starts, series.prices, series.prices_neg_to_zero)
+
+        assert [datetime(1970, 1, 1) + timedelta(seconds=hour) for hour in hours] == [
+            datetime(2024, 1, 15, 10), datetime(2024, 1, 15, 11)
+        ]
+        assert list(prices) == [330.0, 25.0]
+        assert list(neg_to_zero) == [330.0, 50.0]
+
+    def test_day_slots_index_quarters_and_hours(self):
+        records = make_records("2024-01-15", [300.0, 310.0, 320.0, 330.0, 400.0], "2024-01-15 10:00:00")
+        del records[1]
+        series = PriceSeries.from_records(records)
+
+        quarters, hours = series.day_slots("2024-01-15")
+
+        assert len(quarters) == 96 and len(hours) == 24
+        assert quarters[40] == 300.0 and quarters[42] == 320.0 and quarters[44] == 400.0
+        assert math.isnan(quarters[41]) and math.isnan(quarters[0])
+        assert hours[10] == (300.0 + 320.0 + 330.0) / 3
+        assert math.isnan(hours[9])
+        assert series.day_slots("2024-01-15") is series.day_slots("2024-01-15")
+        assert series.day_slots("2024-01-16") is None
+
+class TestPriceCalculatorWithSeries:
+
+    def test_series_day_matches_plain_records(self):
+        prices = [300.0, 280.0, 150.0, 150.0, 160.0, 400.0, 420.0, 410.0, 390.0]
+        records = make_records("2024-01-15", prices, "2024-01-15 10:00:00")
+        day = PriceSeries.from_records(records).day("2024-01-15")
+
+        for is_max in (False, True):
+            assert PriceCalculator.find_extreme_price_records(day, is_max) == \
+                PriceCalculator.find_extreme_price_records(records, is_max)
+            assert PriceCalculator.find_optimal_window(day, 10, 13, 1, is_max) == \
+                PriceCalculator.find_optimal_window(records, 10, 13, 1, is_max)
+        assert PriceCalculator.get_prices_from_data(day) == prices
+
+
+class TestSensorLookupsWithSeries:
+
+    def test_current_and_relative_prices(self, mock_coordinator):
+        records = make_records("2024-01-15", [float(price) for price in range(100, 124)],
+                               "2024-01-15 10:00:00")
+        mock_coordinator.data = {"raw_data": records}
+        sensor = RCEBaseSensor(mock_coordinator, "test_sensor")
+
+        with patch("custom_components.rce_prices.sensors.base.dt_util.now",
+                   return_value=datetime(2024, 1, 15, 11, 20)):
+            assert sensor.get_current_price_data() is records[5]
+            assert sensor.get_price_at_future_hour(1) == 109.0
+            assert sensor.get_price_at_future_hour(5) is None
+            assert sensor.get_price_at_past_hour(1) == 101.0
+            assert sensor.get_price_at_past_hour(3) is None
+
+        with patch.object(sensor, "get_tomorrow_data",
+                          return_value=sensor.get_price_series().day("2024-01-15")):
+            assert sensor.get_tomorrow_price_at_time(datetime(2024, 1, 16, 10, 45)) is records[3]
+            assert sensor.get_tomorrow_price_at_time(datetime(2024, 1, 16, 20, 0)) is None
+
+        with patch("custom_components.rce_prices.sensors.base.dt_util.now",
+                   return_value=datetime(2024, 1, 15, 18, 0)):
+            assert sensor.get_price_at_past_hour(1) == 123.0
+
+    def test_slot_prices_match_plain_records(self, mock_coordinator):
+        records = make_records("2024-01-15", [float(price) for price in range(100, 124)],
+                               "2024-01-15 10:00:00")
+        mock_coordinator.data = {"raw_data": records}
+        sensor = RCEBaseSensor(mock_coordinator, "test_sensor")
+        day = sensor.get_price_series().day("2024-01-15")
+
+        for hour, minute in ((10, 0), (11, 45), (15, 45), (16, 0), (0, 0)):
+            assert sensor.get_slot_price(day, hour, minute) == sensor.get_slot_price(records, hour, minute)
+        for hour in (10, 12, 15, 16):
+            assert sensor.get_slot_price(day, hour) == sensor.get_slot_price(records, hour)
+        assert sensor.get_slot_price(day, 11, 45) == 107.0
+        assert sensor.get_slot_price(day, 12) == 109.5
+        assert sensor.get_slot_price(day, 16) is None
+        assert sensor.get_slot_price([], 10) is None
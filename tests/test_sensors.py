@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from datetime import timedelta
 from unittest.mock import Mock, patch
 
 import pytest
 from homeassistant.util import dt as dt_util
 
+from .test_price_series import make_records
+
+from custom_components.rce_prices.const import (
+    PRICE_ATTRIBUTE_FORMAT_COMPACT,
+    PRICE_ATTRIBUTE_FORMAT_RECORDS,
+    STATE_REFRESH_SLOT,
+)
+from custom_components.rce_prices.price_series import PriceSeries
 from custom_components.rce_prices.sensors.today_main import RCETodayMainSensor, RCETodayKwhPriceSensor
 from custom_components.rce_prices.sensors.tomorrow_main import RCETomorrowMainSensor
 from custom_components.rce_prices.sensors.today_stats import (
@@ -59,6 +66,26 @@ class TestTodayMainSensors:
             state = sensor.native_value
             assert state is None
 
+    @pytest.mark.parametrize("attribute_format", [PRICE_ATTRIBUTE_FORMAT_RECORDS, PRICE_ATTRIBUTE_FORMAT_COMPACT])
+    def test_today_main_price_attributes_cached_per_data_version(self, mock_coordinator, attribute_format):
+        records = make_records("2024-01-15", [100.0, 200.5, 300.25], "2024-01-15 00:00:00")
+        for record in records:
+            record["rce_pln_neg_to_zero"] = record["rce_pln"]
+        mock_coordinator.data = {"raw_data": records, "series": PriceSeries.from_records(records)}
+        mock_coordinator.get_config_value.return_value = attribute_format
+        sensor = RCETodayMainSensor(mock_coordinator)
+
+        with patch("homeassistant.util.dt.now", return_value=dt_util.parse_datetime("2024-01-15T10:00:00+00:00")):
+            prices = sensor.extra_state_attributes["prices"]
+            assert sensor.extra_state_attributes["prices"] is prices
+
+        if attribute_format == PRICE_ATTRIBUTE_FORMAT_COMPACT:
+            assert prices == {"start": ["00:00", "00:15", "00:30"], "price": [100.0, 200.5, 300.25]}
+        else:
+            assert prices[0] == {k: v for k, v in records[0].items() if k != "rce_pln_neg_to_zero"}
+        assert "prices" in sensor._unrecorded_attributes
+        assert "prices" in RCETomorrowMainSensor(mock_coordinator)._unrecorded_attributes
+
     def test_today_kwh_price_sensor_initialization(self, mock_coordinator):
         sensor = RCETodayKwhPriceSensor(mock_coordinator)
         
@@ -633,11 +660,11 @@ class TestTomorrowMainSensor:
                     price = sensor.native_value
                     assert price == 350.46 
 
-    def test_tomorrow_price_sensor_scan_interval(self, mock_coordinator):
+    def test_tomorrow_price_sensor_follows_slot_boundaries(self, mock_coordinator):
         sensor = RCETomorrowMainSensor(mock_coordinator)
         
-        assert sensor.scan_interval == timedelta(minutes=1)
-        assert sensor.should_poll is True
+        assert sensor.state_refresh == STATE_REFRESH_SLOT
+        assert sensor.should_poll is False
 
     def test_tomorrow_price_updates_every_15_minutes(self, mock_coordinator):
         sensor = RCETomorrowMainSensor(mock_coordinator)
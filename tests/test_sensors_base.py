@@ -273,6 +273,48 @@ class TestRCEBaseSensor:
         assert device_info["manufacturer"] == "plebann"
         assert ("rce_prices", "rce_prices") in device_info["identifiers"]
 
+    def test_state_written_only_when_changed(self, mock_coordinator):
+        from unittest.mock import PropertyMock, patch
+
+        sensor = RCEBaseSensor(mock_coordinator, "test_sensor")
+        sensor.async_write_ha_state = Mock()
+
+        with patch.object(RCEBaseSensor, "native_value", new_callable=PropertyMock, return_value=350.0) as value:
+            sensor._handle_coordinator_update()
+            sensor._handle_boundary_update()
+            sensor._handle_coordinator_update()
+            assert sensor.async_write_ha_state.call_count == 1
+
+            value.return_value = 360.0
+            sensor._handle_boundary_update()
+            assert sensor.async_write_ha_state.call_count == 2
+
+    def test_state_properties_evaluated_once_per_write(self, mock_coordinator):
+        evaluations = []
+
+        class CountingSensor(RCEBaseSensor):
+
+            @property
+            def native_value(self):
+                evaluations.append("native_value")
+                return 350.0
+
+            @property
+            def extra_state_attributes(self):
+                evaluations.append("extra_state_attributes")
+                return {"unit": "PLN/MWh"}
+
+        sensor = CountingSensor(mock_coordinator, "test_sensor")
+        written = []
+        sensor.async_write_ha_state = lambda: written.append((sensor.state, sensor.extra_state_attributes))
+
+        sensor._handle_coordinator_update()
+
+        assert written == [(350.0, {"unit": "PLN/MWh"})]
+        assert sorted(evaluations) == ["extra_state_attributes", "native_value"]
+        assert sensor.native_value == 350.0
+        assert len(evaluations) == 3
+
     def test_get_today_data(self, mock_coordinator, coordinator_data):
         from homeassistant.util import dt as dt_util
         
@@ -303,6 +345,34 @@ class TestRCEBaseSensor:
             
             assert len(tomorrow_data) == 0
 
+    def test_price_series_fallback_leaves_coordinator_data_alone(self, mock_coordinator):
+        from .test_price_series import make_records
+
+        sensor = RCEBaseSensor(mock_coordinator, "test_sensor")
+        mock_coordinator.data = {"raw_data": make_records("2024-01-15", [300.0] * 4, "2024-01-15 00:00:00")}
+
+        series = sensor.get_price_series()
+
+        assert "series" not in mock_coordinator.data
+        assert sensor.get_price_series() is series
+        assert len(series) == 4
+
+    def test_tomorrow_available_only_when_complete(self, mock_coordinator):
+        from unittest.mock import patch
+        from .test_price_series import make_records
+
+        sensor = RCEBaseSensor(mock_coordinator, "test_sensor")
+        full_day = make_records("2024-01-16", [300.0] * 96, "2024-01-16 00:00:00")
+
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 14, 30)):
+            mock_coordinator.data = {"raw_data": full_day[:1]}
+            assert not sensor.is_tomorrow_data_available()
+            assert sensor.get_tomorrow_data() == []
+
+            mock_coordinator.data = {"raw_data": full_day}
+            assert sensor.is_tomorrow_data_available()
+            assert len(sensor.get_tomorrow_data()) == 96
+
     def test_get_data_summary(self, mock_coordinator):
         sensor = RCEBaseSensor(mock_coordinator, "test_sensor")
         
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from unittest.mock import Mock, patch
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_prices.const import DOMAIN, SIGNAL_ENTRY_UNLOADED, STATE_REFRESH_SLOT
+from custom_components.rce_prices.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.websocket import _columns, _slots, series_delta, websocket_subscribe
+
+from .test_price_series import make_records
+
+
+def make_data(*days):
+    records = [record for business_date, prices in days
+               for record in make_records(business_date, prices, f"{business_date} 00:00:00")]
+    return {"raw_data": records, "series": PriceSeries.from_records(records)}
+
+
+class TestSeriesDelta:
+
+    def test_reports_added_removed_and_revised_slots(self):
+        previous = {"2024-01-14": {0: 1.0}, "2024-01-15": {900: 100.0, 1800: 200.0}}
+        current = {"2024-01-15": {900: 100.0, 1800: 250.0}, "2024-01-16": {2700: 300.0}}
+
+        delta = series_delta(previous, current)
+
+        assert delta["dates_removed"] == ["2024-01-14"]
+        assert list(delta["dates_added"]) == ["2024-01-16"]
+        assert delta["dates_added"]["2024-01-16"]["price"] == [300.0]
+        assert delta["slots_revised"]["price"] == [250.0]
+        assert series_delta(current, current) is None
+
+
+class TestSlots:
+
+    def test_fall_back_day_keeps_repeated_quarter_hours(self):
+        dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Warsaw"))
+        try:
+            records = (
+                make_records("2024-10-27", [float(index) for index in range(12)], "2024-10-27 00:00:00")
+                + make_records("2024-10-27", [float(index) for index in range(100, 188)], "2024-10-27 02:00:00")
+            )
+
+            slots = _slots(PriceSeries.from_records(records))
+            columns = _columns(slots["2024-10-27"])
+        finally:
+            dt_util.set_default_time_zone(dt_util.UTC)
+
+        assert len(columns["start"]) == 100
+        assert columns["start"][8] == "2024-10-27T02:00:00+02:00"
+        assert columns["start"][12] == "2024-10-27T02:00:00+01:00"
+        assert columns["price"][8:16] == [8.0, 9.0, 10.0, 11.0, 100.0, 101.0, 102.0, 103.0]
+
+
+class TestSubscribe:
+
+    def test_full_series_then_deltas_and_current_slot(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = make_data(("2024-01-15", [100.0, 110.0]))
+        mock_hass.data = {DOMAIN: {"entry": coordinator}}
+        connection = Mock()
+        connection.subscriptions = {}
+        update_listeners = []
+        boundary_listeners = []
+        removers = Mock()
+        coordinator.async_add_listener = Mock(
+            side_effect=lambda cb: update_listeners.append(cb) or removers.update
+        )
+        coordinator.async_add_boundary_listener = Mock(
+            side_effect=lambda cb, refresh: boundary_listeners.append((cb, refresh)) or removers.boundary
+        )
+        now = dt_util.parse_datetime("2024-01-15T00:05:00+00:00")
+
+        with patch("homeassistant.util.dt.now", return_value=now):
+            websocket_subscribe(mock_hass, connection, {"id": 7, "type": "rce_prices/subscribe"})
+
+        connection.send_result.assert_called_once_with(7)
+        full = connection.send_message.call_args[0][0]["event"]
+        assert full["type"] == "full"
+        assert full["dates"]["2024-01-15"]["price"] == [100.0, 110.0]
+        assert full["current"]["price"] == 100.0
+        assert boundary_listeners[0][1] == STATE_REFRESH_SLOT
+
+        with patch("homeassistant.util.dt.now", return_value=now):
+            update_listeners[0]()
+            assert connection.send_message.call_count == 1
+
+            coordinator.data = make_data(("2024-01-15", [100.0, 120.0]), ("2024-01-16", [200.0]))
+            update_listeners[0]()
+        delta = connection.send_message.call_args[0][0]["event"]
+        assert list(delta["dates_added"]) == ["2024-01-16"]
+        assert delta["slots_revised"]["price"] == [120.0]
+
+        with patch("homeassistant.util.dt.now", return_value=now.replace(minute=15)):
+            boundary_listeners[0][0]()
+        assert connection.send_message.call_args[0][0]["event"] == {
+            "type": "current",
+            "current": {"start": "2024-01-15T00:15:00+00:00", "price": 120.0},
+        }
+
+        connection.subscriptions[7]()
+        removers.update.assert_called_once()
+        removers.boundary.assert_called_once()
+
+    def test_unknown_entry_is_rejected(self, mock_hass):
+        mock_hass.data = {DOMAIN: {}}
+        connection = Mock()
+
+        websocket_subscribe(mock_hass, connection, {"id": 1, "type": "rce_prices/subscribe"})
+
+        connection.send_error.assert_called_once()
+        connection.send_result.assert_not_called()
+
+    def test_entry_unload_closes_subscription(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.data = make_data(("2024-01-15", [100.0]))
+        mock_hass.data = {DOMAIN: {"entry": coordinator}}
+        connection = Mock()
+        connection.subscriptions = {}
+        removers = Mock()
+        coordinator.async_add_listener = Mock(return_value=removers.update)
+        coordinator.async_add_boundary_listener = Mock(return_value=removers.boundary)
+        signals = {}
+
+        def connect(hass, signal, target):
+            signals[signal] = target
+            return removers.unloaded
+
+        with patch("custom_components.rce_prices.websocket.async_dispatcher_connect", side_effect=connect):
+            websocket_subscribe(mock_hass, connection, {"id": 7, "type": "rce_prices/subscribe"})
+
+        signals[SIGNAL_ENTRY_UNLOADED.format("entry")]()
+
+        assert connection.subscriptions == {}
+        removers.update.assert_called_once_with()
+        removers.boundary.assert_called_once_with()
+        removers.unloaded.assert_called_once_with()
+        connection.send_error.assert_called_once()
+        assert connection.send_error.call_args[0][0] == 7
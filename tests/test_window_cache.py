@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.rce_prices.binary_sensors.custom_windows import RCETodayCheapestWindowBinarySensor
+from custom_components.rce_prices.circuit_breaker import CircuitBreaker
+from custom_components.rce_prices.const import DOMAIN
+from custom_components.rce_prices.diagnostics import async_get_config_entry_diagnostics
+from custom_components.rce_prices.price_calculator import PriceCalculator
+from custom_components.rce_prices.sensors.custom_windows import (
+    RCETodayCheapestWindowEndSensor,
+    RCETodayCheapestWindowRangeSensor,
+    RCETodayCheapestWindowStartSensor,
+)
+from custom_components.rce_prices.window_cache import WindowCache
+
+from .test_price_series import make_records
+
+
+class TestWindowCache:
+
+    def test_hits_misses_and_eviction(self):
+        cache = WindowCache(maxsize=2)
+        compute = Mock(side_effect=lambda: object())
+
+        first = cache.get_or_compute("a", compute)
+        assert cache.get_or_compute("a", compute) is first
+        cache.get_or_compute("b", compute)
+        cache.get_or_compute("a", compute)
+        cache.get_or_compute("c", compute)
+
+        assert (cache.hits, cache.misses) == (2, 3)
+        assert len(cache) == 2
+        cache.get_or_compute("b", compute)
+        assert cache.misses == 4
+
+
+class TestWindowCacheSharing:
+
+    def test_sensors_share_one_computation(self, mock_coordinator):
+        records = make_records("2024-01-15", [300.0, 200.0, 100.0, 150.0] * 4, "2024-01-15 10:00:00")
+        mock_coordinator.data = {"raw_data": records}
+        mock_coordinator.window_cache = WindowCache(maxsize=8)
+        config_entry = Mock()
+        config_entry.data = {}
+        config_entry.options = {}
+
+        sensors = [
+            RCETodayCheapestWindowStartSensor(mock_coordinator, config_entry),
+            RCETodayCheapestWindowEndSensor(mock_coordinator, config_entry),
+            RCETodayCheapestWindowRangeSensor(mock_coordinator, config_entry),
+        ]
+        binary_sensor = RCETodayCheapestWindowBinarySensor(mock_coordinator, config_entry)
+        day = binary_sensor.get_price_series().day("2024-01-15")
+
+        with patch.object(PriceCalculator, "find_optimal_window",
+                          wraps=PriceCalculator.find_optimal_window) as find_window:
+            for sensor in sensors:
+                with patch.object(sensor, "get_today_data", return_value=day):
+                    assert sensor.native_value is not None
+            with patch.object(binary_sensor, "get_today_data", return_value=day):
+                binary_sensor.is_on
+
+        assert find_window.call_count == 1
+        assert mock_coordinator.window_cache.misses == 1
+        assert mock_coordinator.window_cache.hits == 3
+
+
+class TestWindowCacheDiagnostics:
+
+    @pytest.mark.asyncio
+    async def test_counters_in_config_entry_diagnostics(self):
+        cache = WindowCache(maxsize=4)
+        cache.get_or_compute("a", object)
+        cache.get_or_compute("a", object)
+        coordinator = Mock(window_cache=cache, breaker=CircuitBreaker())
+        entry = Mock(entry_id="entry", options={})
+        hass = Mock(data={DOMAIN: {"entry": coordinator}})
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+        assert diagnostics["window_cache"] == {"size": 1, "maxsize": 4, "hits": 1, "misses": 1}
+        assert diagnostics["api"]["state"] == "closed"
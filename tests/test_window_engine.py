@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from custom_components.rce_prices.const import (
+    WINDOW_OVERLAP_ANY,
+    WINDOW_OVERLAP_DISTINCT_START_HOUR,
+    WINDOW_OVERLAP_MIN_GAP,
+    WINDOW_OVERLAP_NON_OVERLAPPING,
+)
+from custom_components.rce_prices.price_calculator import PriceCalculator
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.window_engine import WindowEngine
+
+from .test_price_series import make_records
+
+
+class TestWindowEngine:
+
+    def test_window_starts_respect_gaps_and_invalid_prices(self):
+        starts = [0, 900, 1800, 3600, 4500, 5400, 6300]
+        prices = [1.0, 2.0, 3.0, 4.0, None, 6.0, 7.0]
+
+        engine = WindowEngine(starts, prices)
+
+        assert list(engine.window_starts(2)) == [0, 1, 5]
+        assert list(engine.window_starts(3)) == [0]
+        assert list(engine.window_starts(0)) == []
+
+    def test_best_keeps_first_of_equal_windows(self):
+        engine = WindowEngine([index * 900 for index in range(6)], [0.1, 0.2, 0.3, 0.1, 0.2, 0.3])
+
+        assert engine.best(2, is_max=False) == 0
+        assert engine.best(2, is_max=True) == 1
+
+    def test_ranked_matches_exact_stable_sort(self):
+        prices = [0.1, 0.2, 0.3, 0.1, 0.2, 0.3, 0.7, 0.1, 0.2]
+        engine = WindowEngine([index * 900 for index in range(len(prices))], prices)
+        positions = list(engine.window_starts(3))
+
+        for is_max in (False, True):
+            expected = sorted(
+                positions,
+                key=lambda position: sum(prices[position:position + 3]) / 3,
+                reverse=is_max,
+            )
+            assert engine.ranked(3, is_max, positions) == expected
+
+    def test_top_overlap_policies(self):
+        prices = [5.0, 1.0, 1.0, 5.0, 5.0, 2.0, 2.0, 5.0, 3.0, 3.0]
+        engine = WindowEngine([index * 900 for index in range(len(prices))], prices)
+        positions = list(engine.window_starts(2))
+
+        assert engine.top(2, False, positions, 3, WINDOW_OVERLAP_ANY) == [1, 5, 0]
+        assert engine.top(2, False, positions, 3, WINDOW_OVERLAP_NON_OVERLAPPING) == [1, 5, 8]
+        assert engine.top(2, False, positions, 3, WINDOW_OVERLAP_MIN_GAP, min_gap_minutes=30) == [1, 5]
+        assert engine.top(2, False, positions, 3, WINDOW_OVERLAP_DISTINCT_START_HOUR) == [1, 5, 8]
+
+    def test_top_matches_full_ranking_without_overlap_rules(self):
+        prices = [0.1, 0.2, 0.3, 0.1, 0.2, 0.3, 0.7, 0.1, 0.2]
+        engine = WindowEngine([index * 900 for index in range(len(prices))], prices)
+        positions = list(engine.window_starts(3))
+
+        for is_max in (False, True):
+            assert engine.top(3, is_max, positions, len(positions), WINDOW_OVERLAP_ANY) == \
+                engine.ranked(3, is_max, positions)
+
+
+class TestPriceCalculatorWindowEngine:
+
+    def test_optimal_window_across_gap(self):
+        records = make_records("2024-01-15", [100.0, 90.0, 95.0, 80.0, 10.0, 500.0, 85.0, 70.0, 75.0, 60.0],
+                               "2024-01-15 10:00:00")
+        del records[4:6]
+
+        window = PriceCalculator.find_optimal_window(records, 10, 13, 1, is_max=False)
+
+        assert [record["period"] for record in window] == [
+            "11:30 - 11:45", "11:45 - 12:00", "12:00 - 12:15", "12:15 - 12:30",
+        ]
+        assert window == PriceCalculator.find_optimal_window(
+            PriceSeries.from_records(records).day("2024-01-15"), 10, 13, 1, is_max=False
+        )
+
+    def test_top_windows_ties_follow_time_order(self):
+        records = make_records("2024-01-15", [200.0] * 16, "2024-01-15 10:00:00")
+
+        windows = PriceCalculator.find_top_windows(records, 10, 14, 1, top_n=3, is_max=True)
+
+        assert [window[0]["period"] for window in windows] == ["10:00 - 10:15", "11:00 - 11:15", "12:00 - 12:15"]
+
+    def test_best_windows_by_duration_spans_both_days(self):
+        records = (
+            make_records("2024-01-15", [300.0, 100.0, 50.0, 400.0], "2024-01-15 23:00:00")
+            + make_records("2024-01-16", [20.0, 500.0], "2024-01-16 00:00:00")
+        )
+        series = PriceSeries.from_records(records)
+
+        windows = PriceCalculator.find_best_windows_by_duration(
+            [series.day("2024-01-15"), series.day("2024-01-16")], 96
+        )
+
+        assert [window["duration_minutes"] for window in windows] == [15, 30, 45, 60, 75, 90]
+        assert windows[0]["cheapest"]["start"] == datetime(2024, 1, 16, 0, 0)
+        assert windows[0]["most_expensive"]["average_price"] == 500.0
+        assert windows[1]["cheapest"]["start"] == datetime(2024, 1, 15, 23, 15)
+        assert windows[1]["cheapest"]["end"] == datetime(2024, 1, 15, 23, 45)
+        assert windows[5]["cheapest"]["average_price"] == 228.33
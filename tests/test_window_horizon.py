@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from custom_components.rce_prices.binary_sensors.custom_windows import RCETodayCheapestWindowBinarySensor
+from custom_components.rce_prices.config_flow import is_valid_time_window
+from custom_components.rce_prices.const import (
+    CONF_CHEAPEST_TIME_WINDOW_END,
+    CONF_CHEAPEST_TIME_WINDOW_START,
+    CONF_CHEAPEST_WINDOW_DURATION_HOURS,
+    CONF_WINDOW_HORIZON_MODE,
+)
+from custom_components.rce_prices.price_calculator import PriceCalculator
+from custom_components.rce_prices.price_series import PriceSeries
+from custom_components.rce_prices.sensors.custom_windows import (
+    RCETodayCheapestWindowEndTimestampSensor,
+    RCETodayCheapestWindowRangeSensor,
+    RCETodayCheapestWindowStartTimestampSensor,
+)
+
+from .test_price_series import make_records
+
+NOW = datetime(2024, 1, 15, 21, 5)
+
+
+def make_two_days() -> list[dict]:
+    today = [300.0] * 88 + [250.0] * 4 + [40.0] * 4
+    tomorrow = [30.0] * 4 + [200.0] * 92
+    return (
+        make_records("2024-01-15", today, "2024-01-15 00:00:00")
+        + make_records("2024-01-16", tomorrow, "2024-01-16 00:00:00")
+    )
+
+
+def make_config_entry(horizon: bool) -> Mock:
+    config_entry = Mock()
+    config_entry.data = {
+        CONF_CHEAPEST_TIME_WINDOW_START: 22,
+        CONF_CHEAPEST_TIME_WINDOW_END: 6,
+        CONF_CHEAPEST_WINDOW_DURATION_HOURS: 2,
+        CONF_WINDOW_HORIZON_MODE: horizon,
+    }
+    config_entry.options = {}
+    return config_entry
+
+
+class TestPriceSeriesHorizon:
+
+    def test_horizon_starts_at_running_slot_and_spans_dates(self):
+        series = PriceSeries.from_records(make_two_days())
+
+        horizon = series.horizon(NOW, 36)
+
+        assert horizon.business_date is None
+        assert horizon[0]["period"] == "21:00 - 21:15"
+        assert horizon[-1]["business_date"] == "2024-01-16"
+        assert len(horizon) == 4 * 27
+        assert series.horizon(NOW, 36) is horizon
+
+    def test_horizon_past_end_of_data_is_empty(self):
+        series = PriceSeries.from_records(make_two_days())
+
+        assert series.horizon(datetime(2024, 1, 17, 3, 0), 36) == []
+
+
+class TestCrossMidnightWindows:
+
+    def test_wrapping_hours_find_window_over_midnight(self):
+        series = PriceSeries.from_records(make_two_days())
+
+        window = PriceCalculator.find_optimal_window(series.horizon(NOW, 36), 22, 6, 2, is_max=False)
+
+        assert window[0]["period"] == "23:00 - 23:15"
+        assert window[0]["business_date"] == "2024-01-15"
+        assert window[-1]["period"] == "00:45 - 01:00"
+        assert window[-1]["business_date"] == "2024-01-16"
+
+    def test_wrapping_hours_within_single_day(self):
+        records = make_records("2024-01-15", [100.0] * 96, "2024-01-15 00:00:00")
+
+        windows = PriceCalculator.find_top_windows(records, 22, 2, 1, top_n=10)
+
+        assert [window[0]["period"] for window in windows] == ["00:00 - 00:15", "01:00 - 01:15",
+                                                               "22:00 - 22:15", "23:00 - 23:15"]
+
+    def test_time_window_validation(self):
+        assert not is_valid_time_window(22, 6, False)
+        assert is_valid_time_window(22, 6, True)
+        assert not is_valid_time_window(6, 6, True)
+
+
+class TestHorizonSensors:
+
+    def test_sensors_report_cross_midnight_window(self, mock_coordinator):
+        mock_coordinator.data = {"raw_data": make_two_days()}
+        config_entry = make_config_entry(horizon=True)
+
+        with patch("homeassistant.util.dt.now", return_value=NOW):
+            assert RCETodayCheapestWindowRangeSensor(mock_coordinator, config_entry).native_value == "23:00 - 01:00"
+            start = RCETodayCheapestWindowStartTimestampSensor(mock_coordinator, config_entry).native_value
+            end = RCETodayCheapestWindowEndTimestampSensor(mock_coordinator, config_entry).native_value
+
+        assert start.replace(tzinfo=None) == datetime(2024, 1, 15, 23, 0)
+        assert end.replace(tzinfo=None) == datetime(2024, 1, 16, 1, 0)
+
+    def test_binary_sensor_active_after_midnight(self, mock_coordinator):
+        mock_coordinator.data = {"raw_data": make_two_days()}
+        binary_sensor = RCETodayCheapestWindowBinarySensor(mock_coordinator, make_config_entry(horizon=True))
+
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 15, 23, 30)):
+            assert binary_sensor.is_on is True
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 16, 0, 30)):
+            assert binary_sensor.is_on is True
+        with patch("homeassistant.util.dt.now", return_value=datetime(2024, 1, 16, 7, 0)):
+            assert binary_sensor.is_on is False
+
+    def test_without_horizon_search_stays_within_today(self, mock_coordinator):
+        mock_coordinator.data = {"raw_data": make_two_days()}
+        config_entry = make_config_entry(horizon=False)
+
+        with patch("homeassistant.util.dt.now", return_value=NOW):
+            assert RCETodayCheapestWindowRangeSensor(mock_coordinator, config_entry).native_value == "22:00 - 00:00"